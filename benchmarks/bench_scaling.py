@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark of the generators on synthetic CV data of increasing size
+"""
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import subprocess
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from escaping import escape_html, escape_latex, escape_latex_url
+from html_cv_generator import HtmlCvGenerator
+from inline_markup import markup_html, markup_latex, parse
+from output_builder import OutputBuilder
+from pdf_cv_generator import PdfCvGenerator
+from synthetic_data import make_cv_data
+
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+GENERATORS = {
+    'html': HtmlCvGenerator,
+    'pdf': PdfCvGenerator,
+}
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+
+def best_time(func, repeat, setup=None):
+    """
+    Time a function, returning the best of several runs.
+
+    Parameters
+    ----------
+    func : callable
+        The function to time.
+    repeat : int
+        Number of runs.
+    setup : callable, optional
+        Called untimed before each run.
+
+    Returns
+    -------
+    float
+        The fastest run in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def peak_memory(func):
+    """
+    Measure the peak Python memory allocated while a function runs.
+
+    Parameters
+    ----------
+    func : callable
+        The function to measure.
+
+    Returns
+    -------
+    int
+        Peak traced memory in bytes.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def clear_escape_caches():
+    """Empty the escaping and markup caches so every run escapes from scratch."""
+    for cached in (escape_latex, escape_latex_url, escape_html, parse, markup_latex, markup_html):
+        cached.cache_clear()
+
+
+def text_inputs(cv_data):
+    """Collect the experience highlights, the bulk of the text in a CV."""
+    return [highlight for job in cv_data['experience'] for highlight in job['highlights']]
+
+
+def bench_format(fmt, cv_data, repeat, compile_pdf):
+    """
+    Benchmark one output format on one CV.
+
+    Parameters
+    ----------
+    fmt : str
+        Output format, a key of GENERATORS.
+    cv_data : dict
+        The CV data to render.
+    repeat : int
+        Number of runs per measurement.
+    compile_pdf : bool
+        Whether the PDF pipeline includes running pdflatex.
+
+    Returns
+    -------
+    dict
+        Timings in seconds, peak memory and output size.
+    """
+    generator_class = GENERATORS[fmt]
+    strings = text_inputs(cv_data)
+    results = {}
+
+    with tempfile.TemporaryDirectory(prefix='cv-bench-') as output_dir, \
+            redirect_stdout(io.StringIO()):
+        generator = generator_class(cv_data=cv_data, output_dir=output_dir)
+
+        def reset_output():
+            generator.output = OutputBuilder()
+            clear_escape_caches()
+
+        results['sections'] = {
+            section: best_time(getattr(generator, f'generate_{section}'), repeat, reset_output)
+            for section in generator.SECTIONS
+        }
+        results['escape_text'] = best_time(
+            lambda: [generator.escape_text(s) for s in strings], repeat, clear_escape_caches
+        )
+        results['format_links'] = best_time(
+            lambda: [generator.format_links(s) for s in strings], repeat, clear_escape_caches
+        )
+        results['render'] = best_time(generator.render, repeat, clear_escape_caches)
+        results['output_bytes'] = len(generator.content.encode('utf-8'))
+
+        # The PDF pipeline without pdflatex stops at the written LaTeX source
+        compiled = fmt != 'pdf' or compile_pdf
+        if compiled:
+            if fmt == 'pdf':
+                generator.force = True
+            pipeline = generator.generate
+        else:
+            def pipeline():
+                generator.render()
+                with open(Path(output_dir) / 'cv.tex', 'w', encoding='utf-8') as f:
+                    generator.output.write_to(f)
+        try:
+            results['pipeline'] = best_time(pipeline, repeat, clear_escape_caches)
+        except SystemExit:
+            results['pipeline'] = None
+        results['compiled'] = compiled
+
+        clear_escape_caches()
+        results['peak_memory_bytes'] = peak_memory(generator.render)
+    return results
+
+
+def git_commit():
+    """Get the current commit hash, or None outside a git checkout."""
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+            cwd=Path(__file__).parent
+        )
+    except FileNotFoundError:
+        return None
+    return result.stdout.strip() or None
+
+
+def compare(results, baseline):
+    """
+    Print the render and pipeline time ratios against an earlier run.
+
+    Parameters
+    ----------
+    results : dict
+        Results of this run.
+    baseline : dict
+        Results of an earlier run, as saved by this script.
+
+    Returns
+    -------
+    None
+    """
+    previous = {
+        (run['entries'], fmt): timings
+        for run in baseline['runs'] for fmt, timings in run['formats'].items()
+    }
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'} ({baseline['timestamp']}):")
+    print(f"{'entries':>8} {'format':<6}{'render':>10}{'pipeline':>10}")
+    for run in results['runs']:
+        for fmt, timings in run['formats'].items():
+            old = previous.get((run['entries'], fmt))
+            if old is None:
+                continue
+            ratios = []
+            for measure in ('render', 'pipeline'):
+                if timings.get(measure) and old.get(measure):
+                    ratios.append(f"{old[measure] / timings[measure]:>9.2f}x")
+                else:
+                    ratios.append(f"{'-':>10}")
+            print(f"{run['entries']:>8} {fmt:<6}{''.join(ratios)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Time every section and full pipeline on synthetic CVs of increasing size'
+    )
+    parser.add_argument(
+        '--sizes',
+        nargs='+',
+        type=int,
+        default=DEFAULT_SIZES,
+        help='Numbers of experience entries to benchmark (default: 10 100 1000 10000 100000)'
+    )
+    parser.add_argument(
+        '--highlights',
+        type=int,
+        default=4,
+        help='Highlights per experience entry (default: 4)'
+    )
+    parser.add_argument(
+        '--formats',
+        nargs='+',
+        choices=sorted(GENERATORS),
+        default=['html', 'pdf'],
+        help='Output formats to benchmark (default: html pdf)'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=5,
+        help='Runs per measurement below 10000 entries; larger sizes run once (default: 5)'
+    )
+    parser.add_argument(
+        '--max-compile-size',
+        type=int,
+        default=1000,
+        help='Largest size whose PDF pipeline runs pdflatex (default: 1000)'
+    )
+    parser.add_argument(
+        '--output',
+        type=Path,
+        default=None,
+        help='Results JSON file (default: benchmarks/results/scaling-<timestamp>.json)'
+    )
+    parser.add_argument(
+        '--compare',
+        type=Path,
+        default=None,
+        help='Earlier results JSON file to print speedups against'
+    )
+    args = parser.parse_args()
+
+    has_pdflatex = shutil.which('pdflatex') is not None
+    if 'pdf' in args.formats and not has_pdflatex:
+        print("pdflatex not found: the PDF pipeline is timed up to the written LaTeX source")
+
+    now = datetime.now()
+    results = {
+        'timestamp': now.isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pdflatex': has_pdflatex,
+        'highlights_per_entry': args.highlights,
+        'runs': [],
+    }
+
+    print(f"{'entries':>8} {'format':<6}{'render':>12}{'pipeline':>12}{'escape':>12}"
+          f"{'links':>12}{'peak mem':>12}")
+    for entries in args.sizes:
+        cv_data = make_cv_data(entries, args.highlights)
+        repeat = args.repeat if entries < 10000 else 1
+        run = {'entries': entries, 'repeat': repeat, 'formats': {}}
+        for fmt in args.formats:
+            timings = bench_format(
+                fmt, cv_data, repeat, has_pdflatex and entries <= args.max_compile_size
+            )
+            run['formats'][fmt] = timings
+            pipeline = (f"{timings['pipeline'] * 1e3:>10.1f}ms"
+                        if timings['pipeline'] is not None else f"{'failed':>12}")
+            print(
+                f"{entries:>8} {fmt:<6}{timings['render'] * 1e3:>10.1f}ms{pipeline}"
+                f"{timings['escape_text'] * 1e3:>10.1f}ms{timings['format_links'] * 1e3:>10.1f}ms"
+                f"{timings['peak_memory_bytes'] / 2**20:>10.1f}MB"
+            )
+        results['runs'].append(run)
+
+    output = args.output or RESULTS_DIR / f"scaling-{now:%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding='utf-8')
+    print(f"\n✓ Results written to {output}")
+
+    if args.compare:
+        compare(results, json.loads(args.compare.read_text(encoding='utf-8')))
+
+
+if __name__ == '__main__':
+    main()
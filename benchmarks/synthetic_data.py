@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Synthetic CV data of arbitrary size for benchmarks
+"""
+import random
+
+from abstract_cv_generator import validate_cv_data
+
+
+WORDS = (
+    'designed architecture distributed monitoring system networks mentored '
+    'students coding practices repository management security testing led '
+    'development full stack mobile solution engagement private contributed '
+    'upgrade production cybersecurity policy pipelines automating compliance '
+    'checks asynchronous socket library microservices modelling algorithm'
+).split()
+
+# Characters every backend has to escape, mixed into some of the text
+SPECIAL = ('R&D', '100%', '$5M', '#1', 'snake_case', '{braces}', '~approx', 'x^2', '<tag>', '"quoted"')
+
+
+def sentence(rng, words=14, special_rate=0.2):
+    """Build a random sentence, sometimes containing characters that need escaping."""
+    parts = [rng.choice(WORDS) for _ in range(words)]
+    if rng.random() < special_rate:
+        parts.insert(rng.randrange(len(parts)), rng.choice(SPECIAL))
+    return ' '.join(parts).capitalize()
+
+
+def linked_sentence(rng, index, words=14, link_rate=0.3):
+    """Build a random sentence, sometimes containing a markdown link."""
+    text = sentence(rng, words)
+    if rng.random() < link_rate:
+        text += f' for [project {index}](https://example.com/projects/{index}?ref=cv#top)'
+    return text
+
+
+def make_cv_data(entries, highlights=4, seed=0):
+    """
+    Build a valid CV data dictionary with the given number of experience entries.
+
+    Every other section grows with the experience section, so the whole
+    document scales: one skill per entry, a publication and an award per
+    ten entries, a degree per hundred. Output is deterministic for a seed.
+
+    Parameters
+    ----------
+    entries : int
+        Number of experience entries.
+    highlights : int, optional
+        Highlights per experience entry. Default is 4.
+    seed : int, optional
+        Random seed. Default is 0.
+
+    Returns
+    -------
+    dict
+        CV data accepted by validate_cv_data.
+    """
+    rng = random.Random(seed)
+    cv_data = {
+        'personal': {
+            'name': 'Alex Example',
+            'title': 'Senior Software Developer',
+            'location': 'Cardiff, UK',
+            'email': 'alex@example.com',
+            'phone': '+44 7000 000000',
+            'summary': ' '.join(linked_sentence(rng, i, 20) for i in range(5)),
+            'social': [
+                {'name': 'GitHub', 'url': 'https://github.com/example', 'icon': 'fab fa-github'},
+                {'name': 'LinkedIn', 'url': 'https://www.linkedin.com/in/example/',
+                 'icon': 'fab fa-linkedin'},
+            ],
+        },
+        'skills': [sentence(rng, 3, special_rate=0.1) for _ in range(entries)],
+        'experience': [
+            {
+                'title': sentence(rng, 3, special_rate=0),
+                'company': f'Company {i} Ltd',
+                'location': rng.choice(('London', 'Cardiff', 'Bristol', 'Remote')),
+                'startDate': f'January {2000 + i % 25}',
+                'endDate': 'present' if i == 0 else f'March {2001 + i % 25}',
+                'icon': 'fas fa-laptop-code',
+                'highlights': [
+                    linked_sentence(rng, i * highlights + j) for j in range(highlights)
+                ],
+                **({'hideOnPdf': True} if i % 7 == 6 else {}),
+            }
+            for i in range(entries)
+        ],
+        'education': [
+            {
+                'degree': f'Degree {i}: {sentence(rng, 5, special_rate=0)}',
+                'institution': f'University {i}',
+                'years': f'{2000 + i % 25} - {2004 + i % 25}',
+            }
+            for i in range(max(1, entries // 100))
+        ],
+        'publications': [
+            {
+                'authors': ', '.join(f'Author{rng.randrange(1000)}, A.' for _ in range(4)),
+                'year': str(2000 + i % 25),
+                'title': sentence(rng, 10),
+                'venue': f'Conference {i}',
+                'pages': f'pp. {i}-{i + 5}',
+                'doi': f'10.1000/example.{i}',
+                'url': f'https://example.com/papers/{i}',
+            }
+            for i in range(max(1, entries // 10))
+        ],
+        'awards': [
+            {
+                'title': f'Award {i} - {sentence(rng, 4, special_rate=0)}',
+                'description': sentence(rng, 8),
+                'url': f'https://example.com/awards/{i}',
+            }
+            for i in range(max(1, entries // 10))
+        ],
+        'hobbies': [
+            {'name': sentence(rng, 2, special_rate=0), 'icon': 'fas fa-hammer'}
+            for _ in range(max(1, entries // 100))
+        ],
+    }
+    validate_cv_data(cv_data)
+    return cv_data
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Build any set of CV formats and variants in one process
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from cv_builder import GENERATORS, VARIANTS, build_file
+from tracing import Tracer, write_trace
+from watch_mode import watch
+
+def positive_int(value):
+    """Parse a command line argument that must be a whole number of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Build CV formats and variants from one load of the JSON data'
+    )
+    parser.add_argument(
+        '--formats',
+        nargs='+',
+        choices=sorted(GENERATORS),
+        default=['pdf', 'html'],
+        help='Output formats to generate (default: pdf html)'
+    )
+    parser.add_argument(
+        '--variants',
+        nargs='+',
+        choices=sorted(VARIANTS),
+        default=['full'],
+        help='Variants to generate: full, anon without personal name, and/or complete '
+             'PDF including entries marked hideOnPdf (default: full)'
+    )
+    parser.add_argument(
+        '--data',
+        default=None,
+        help='Path to the CV data JSON file (default: data/cv-data.json)'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Recompile the PDF even if the build cache has an identical one'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only re-render sections whose data changed since the last build'
+    )
+    parser.add_argument(
+        '--fmt',
+        action='store_true',
+        help='Compile from a cached precompiled format file of the LaTeX preamble'
+    )
+    parser.add_argument(
+        '--fit-pages',
+        type=positive_int,
+        metavar='N',
+        default=None,
+        help='Adjust margins, spacing and font size to fit the PDF on N pages'
+    )
+    parser.add_argument(
+        '--minify',
+        action='store_true',
+        help='Minify the HTML and main stylesheet and write gzip/brotli compressed copies'
+    )
+    parser.add_argument(
+        '--page-size',
+        type=positive_int,
+        metavar='N',
+        default=None,
+        help='Show the first N experience and publication entries inline and load the '
+             'rest on demand, with standalone pages for browsers without JavaScript'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running and rebuild affected outputs when the data, src/ or CSS change'
+    )
+    parser.add_argument(
+        '--trace',
+        metavar='PATH',
+        default=None,
+        help='Record the time and memory of each build step to a Chrome trace JSON file'
+    )
+    args = parser.parse_args()
+    if args.watch and args.trace:
+        parser.error('--trace cannot be combined with --watch')
+
+    if args.watch:
+        try:
+            watch(
+                args.data, args.formats, args.variants,
+                force=args.force, incremental=args.incremental,
+                use_format=args.fmt, minify=args.minify, page_size=args.page_size,
+                fit_pages=args.fit_pages
+            )
+        except KeyboardInterrupt:
+            print("\nStopped watching")
+        return
+
+    tracer = Tracer() if args.trace else None
+    try:
+        build_file(
+            args.data, args.formats, args.variants,
+            force=args.force, incremental=args.incremental,
+            use_format=args.fmt, tracer=tracer, minify=args.minify,
+            page_size=args.page_size, fit_pages=args.fit_pages
+        )
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        if 'pdf' in args.formats:
+            print("\nMake sure you have pdflatex installed:")
+            print("  Windows: Install MiKTeX (https://miktex.org/)")
+            print("  macOS: Install MacTeX (https://www.tug.org/mactex/)")
+            print("  Linux: sudo apt-get install texlive-latex-base texlive-fonts-recommended")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        if tracer is not None:
+            write_trace(tracer, args.trace)
+
+if __name__ == '__main__':
+    main()
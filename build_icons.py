@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Build the self-hosted icon font subset from a local Font Awesome package
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from abstract_cv_generator import load_cv_data
+from icon_font import DEFAULT_FONTAWESOME_DIR, ICON_STYLESHEET, build_icon_font
+from template_engine import template_loader
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Subset Font Awesome to the icons the CV uses, self-hosted in css/'
+    )
+    parser.add_argument(
+        '--fontawesome',
+        type=Path,
+        default=DEFAULT_FONTAWESOME_DIR,
+        help='Unpacked Font Awesome Free web package (default: vendor/fontawesome-free)'
+    )
+    parser.add_argument(
+        '--data',
+        default=None,
+        help='Path to the CV data JSON file (default: data/cv-data.json)'
+    )
+    args = parser.parse_args()
+
+    try:
+        cv_data = load_cv_data(args.data)
+        report = build_icon_font(cv_data, template_loader('html').template_dir, args.fontawesome)
+    except (RuntimeError, FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"✓ Icon font subset written to {ICON_STYLESHEET}")
+    for line in report:
+        print(line)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Generate CVs for a directory or glob of JSON data files, or a JSON-Lines
+stream of records, in parallel
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from batch_runner import GENERATORS, collect_inputs, run_batch, run_stream
+
+def stream_records(stream, name, args):
+    """Render the records of a JSON-Lines stream with the command line options."""
+    return run_stream(
+        stream,
+        args.output_dir,
+        formats=args.formats,
+        anonymous=args.anon,
+        workers=args.workers,
+        queue_size=args.queue_size,
+        name=name
+    )
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate CVs for many JSON data files in parallel'
+    )
+    parser.add_argument(
+        'inputs',
+        help='Directory of CV JSON files, a glob pattern such as "cvs/*.json", '
+             'or a .jsonl file (or - for stdin) with one CV record per line'
+    )
+    parser.add_argument(
+        '--output-dir',
+        default='output/batch',
+        help='Directory to write one output set per input to (default: output/batch)'
+    )
+    parser.add_argument(
+        '--formats',
+        nargs='+',
+        choices=sorted(GENERATORS),
+        default=['pdf', 'html'],
+        help='Output formats to generate (default: pdf html)'
+    )
+    parser.add_argument(
+        '--anon',
+        action='store_true',
+        help='Generate anonymized CVs without personal name'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of worker processes (default: number of CPUs)'
+    )
+    parser.add_argument(
+        '--manifest',
+        default=None,
+        help='Path to the run manifest (default: <output-dir>/manifest.json)'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Skip inputs the manifest records as already generated'
+    )
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=None,
+        help='For JSON-Lines input, most records to read ahead of the workers '
+             '(default: twice the number of workers)'
+    )
+    args = parser.parse_args()
+
+    if args.inputs == '-' or args.inputs.endswith('.jsonl'):
+        if args.resume or args.manifest:
+            print("Error: --resume and --manifest apply to JSON files, not JSON-Lines input")
+            sys.exit(1)
+        if args.inputs == '-':
+            summary = stream_records(sys.stdin.buffer, 'stdin', args)
+        else:
+            try:
+                with open(args.inputs, 'rb') as stream:
+                    summary = stream_records(stream, Path(args.inputs).stem, args)
+            except FileNotFoundError:
+                print(f"Error: {args.inputs} not found")
+                sys.exit(1)
+        if summary['failed']:
+            sys.exit(1)
+        return
+
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        print(f"Error: no CV data files found for {args.inputs}")
+        sys.exit(1)
+
+    try:
+        manifest = run_batch(
+            inputs,
+            args.output_dir,
+            formats=args.formats,
+            anonymous=args.anon,
+            workers=args.workers,
+            manifest_path=args.manifest,
+            resume=args.resume
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if manifest['summary']['failed']:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -3,20 +3,60 @@
 Generate static HTML CV from JSON data
 """
 import sys
+import argparse
 from pathlib import Path
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from html_cv_generator import HtmlCvGenerator
+from tracing import Tracer, write_trace
+
+def positive_int(value):
+    """Parse a command line argument that must be a whole number of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 def main():
+    parser = argparse.ArgumentParser(
+        description='Generate CV as static HTML from JSON data'
+    )
+    parser.add_argument(
+        '--minify',
+        action='store_true',
+        help='Minify the HTML and main stylesheet and write gzip/brotli compressed copies'
+    )
+    parser.add_argument(
+        '--page-size',
+        type=positive_int,
+        metavar='N',
+        default=None,
+        help='Show the first N experience and publication entries inline and load the '
+             'rest on demand, with standalone pages for browsers without JavaScript'
+    )
+    parser.add_argument(
+        '--trace',
+        metavar='PATH',
+        default=None,
+        help='Record the time and memory of each build step to a Chrome trace JSON file'
+    )
+    args = parser.parse_args()
+
+    tracer = Tracer() if args.trace else None
     try:
-        generator = HtmlCvGenerator()
+        generator = HtmlCvGenerator(tracer=tracer, minify=args.minify, page_size=args.page_size)
         generator.generate()
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
+    finally:
+        if tracer is not None:
+            write_trace(tracer, args.trace)
 
 if __name__ == '__main__':
     main()
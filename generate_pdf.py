@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Generate CV as PDF via LaTeX
+Generate CV as PDF via LaTeX, or directly without it
 """
 import sys
 import argparse
@@ -9,7 +9,19 @@ from pathlib import Path
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
+from direct_pdf_cv_generator import DirectPdfCvGenerator
 from pdf_cv_generator import PdfCvGenerator
+from tracing import Tracer, write_trace
+
+def positive_int(value):
+    """Parse a command line argument that must be a whole number of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 def main():
     parser = argparse.ArgumentParser(
@@ -20,10 +32,48 @@ def main():
         action='store_true',
         help='Generate anonymized CV without personal name'
     )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Recompile the PDF even if the build cache has an identical one'
+    )
+    parser.add_argument(
+        '--fmt',
+        action='store_true',
+        help='Compile from a cached precompiled format file of the LaTeX preamble'
+    )
+    parser.add_argument(
+        '--fit-pages',
+        type=positive_int,
+        metavar='N',
+        default=None,
+        help='Adjust margins, spacing and font size to fit the PDF on N pages'
+    )
+    parser.add_argument(
+        '--direct',
+        action='store_true',
+        help='Write the PDF directly, without LaTeX (simpler typesetting, no TeX install needed)'
+    )
+    parser.add_argument(
+        '--trace',
+        metavar='PATH',
+        default=None,
+        help='Record the time and memory of each build step to a Chrome trace JSON file'
+    )
     args = parser.parse_args()
     
+    tracer = Tracer() if args.trace else None
     try:
-        generator = PdfCvGenerator(anonymous=args.anon)
+        if args.direct:
+            DirectPdfCvGenerator(anonymous=args.anon, tracer=tracer).generate()
+            return
+        generator = PdfCvGenerator(
+            anonymous=args.anon,
+            force=args.force,
+            use_format=args.fmt,
+            fit_pages=args.fit_pages,
+            tracer=tracer
+        )
         generator.generate()
     except FileNotFoundError as e:
         print(f"Error: {e}")
@@ -35,6 +85,9 @@ def main():
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
+    finally:
+        if tracer is not None:
+            write_trace(tracer, args.trace)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Serve the CV over HTTP, rendering it on request
+"""
+import sys
+import asyncio
+import argparse
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from cv_server import CvServer
+from latex_compile_service import LatexCompileService
+from latex_format import FormatCache
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Serve the HTML and PDF CV locally, rendering on request'
+    )
+    parser.add_argument(
+        '--data',
+        default=None,
+        help='Path to the CV data JSON file (default: data/cv-data.json)'
+    )
+    parser.add_argument(
+        '--host',
+        default='127.0.0.1',
+        help='Address to listen on (default: 127.0.0.1)'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8000,
+        help='Port to listen on (default: 8000)'
+    )
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=32,
+        help='Number of rendered documents kept in memory (default: 32)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of concurrent PDF compiles (default: number of CPUs)'
+    )
+    parser.add_argument(
+        '--fmt',
+        action='store_true',
+        help='Compile from a cached precompiled format file of the LaTeX preamble'
+    )
+    args = parser.parse_args()
+
+    format_cache = FormatCache(Path('output') / '.format-cache') if args.fmt else None
+    server = CvServer(
+        args.data, args.host, args.port, args.cache_size,
+        compile_service=LatexCompileService(workers=args.workers, format_cache=format_cache)
+    )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\nServer stopped")
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,121 @@ import json
 from abc import ABC, abstractmethod
 from pathlib import Path
 
+from cv_model import CvData, ModelCache
+from output_builder import OutputBuilder
+from template_engine import template_loader
+from tracing import NULL_TRACER
+
+
+# Default CV data file, relative to the project root
+DEFAULT_DATA_PATH = Path(__file__).parent.parent / 'data' / 'cv-data.json'
+
+# Top-level keys every CV data file must provide, with their expected types
+REQUIRED_SECTIONS = {
+    'personal': dict,
+    'skills': list,
+    'experience': list,
+    'education': list,
+    'publications': list,
+    'awards': list,
+    'hobbies': list,
+}
+
+
+def load_cv_data(data_path=None, model_cache=None):
+    """
+    Load and validate CV data from a JSON file into a CvData model.
+    
+    The parsed model is cached under a hash of the file contents, so an
+    unchanged file is loaded from the cache without parsing or validating
+    the JSON again.
+    
+    Parameters
+    ----------
+    data_path : str or Path, optional
+        Path to the CV data JSON file. Default is 'data/cv-data.json'.
+    model_cache : ModelCache, optional
+        Cache of parsed models. Default is a cache in 'output/.model-cache'.
+    
+    Returns
+    -------
+    CvData
+        The parsed CV data.
+    
+    Raises
+    ------
+    FileNotFoundError
+        If the JSON file does not exist.
+    json.JSONDecodeError
+        If the JSON file is malformed.
+    ValueError
+        If the CV data is missing required sections or fields.
+    """
+    raw = Path(data_path or DEFAULT_DATA_PATH).read_bytes()
+    model_cache = model_cache or ModelCache()
+    key = model_cache.key(raw)
+    cv_data = model_cache.get(key)
+    if cv_data is None:
+        cv_data = to_model(json.loads(raw.decode('utf-8')))
+        model_cache.put(key, cv_data)
+    return cv_data
+
+
+def to_model(cv_data):
+    """
+    Convert parsed CV data to a validated CvData model.
+    
+    Parameters
+    ----------
+    cv_data : dict or CvData
+        The parsed CV data. A CvData is returned unchanged.
+    
+    Returns
+    -------
+    CvData
+        The CV data model.
+    
+    Raises
+    ------
+    ValueError
+        If the CV data is missing required sections or fields.
+    """
+    if isinstance(cv_data, CvData):
+        return cv_data
+    validate_cv_data(cv_data)
+    return CvData.from_dict(cv_data)
+
+
+def validate_cv_data(cv_data):
+    """
+    Check that CV data has every section the generators read.
+    
+    Parameters
+    ----------
+    cv_data : dict
+        The parsed CV data.
+    
+    Returns
+    -------
+    None
+    
+    Raises
+    ------
+    ValueError
+        If a required section is missing or has the wrong type.
+    """
+    if not isinstance(cv_data, dict):
+        raise ValueError("CV data must be a JSON object")
+    
+    problems = []
+    for key, expected_type in REQUIRED_SECTIONS.items():
+        if key not in cv_data:
+            problems.append(f"missing '{key}'")
+        elif not isinstance(cv_data[key], expected_type):
+            problems.append(f"'{key}' must be a {expected_type.__name__}")
+    if problems:
+        raise ValueError("Invalid CV data: " + ", ".join(problems))
+
 
 class AbstractCvGenerator(ABC):
     """
@@ -16,7 +131,33 @@ class AbstractCvGenerator(ABC):
     and writing output.
     """
     
-    def __init__(self, anonymous=False):
+    # Sections in the order they are rendered, each by its generate_<name> method
+    SECTIONS = (
+        'header',
+        'summary',
+        'experience',
+        'education',
+        'skills',
+        'publications',
+        'awards',
+        'hobbies',
+        'footer',
+    )
+    
+    # Directory under templates/ holding this format's section templates,
+    # and the tag syntax they use
+    TEMPLATE_SYNTAX = None
+    
+    # Top-level CV data keys each section reads. Only sections listed here
+    # can be served from the fragment cache; the rest are always rendered.
+    SECTION_DATA = {}
+    
+    # Names of the cache_flags() each section's output depends on. Sections
+    # not listed are assumed to depend on every flag.
+    SECTION_FLAGS = {}
+    
+    def __init__(self, anonymous=False, data_path=None, output_dir=None,
+                 cv_data=None, fragment_cache=None, tracer=None, section_store=None):
         """
         Initialize the CV generator.
         
@@ -24,20 +165,106 @@ class AbstractCvGenerator(ABC):
         ----------
         anonymous : bool, optional
             If True, generates an anonymized CV without personal name. Default is False.
+        data_path : str or Path, optional
+            Path to the CV data JSON file. Default is 'data/cv-data.json'.
+        output_dir : str or Path, optional
+            Directory to write output to. Default is format-specific.
+        cv_data : CvData or dict, optional
+            Already loaded CV data. If given, data_path is not read.
+        fragment_cache : FragmentCache, optional
+            Cache of rendered sections. If given, sections whose data has not
+            changed are reused instead of re-rendered. Default is None.
+        tracer : Tracer, optional
+            Records the time and memory each build step takes. Default is
+            None (no tracing).
+        section_store : SectionStore, optional
+            Sections already rendered by other variants of the same CV, to
+            share instead of rendering again. Default is None.
         
         Returns
         -------
         None
         """
-        self.cv_data = None
-        self.content = ""
+        self.cv_data = to_model(cv_data) if cv_data is not None else None
+        self.output = OutputBuilder()
         self.anonymous = anonymous
+        self.data_path = Path(data_path) if data_path else DEFAULT_DATA_PATH
+        self.output_dir = Path(output_dir) if output_dir else self.default_output_dir()
+        self.fragment_cache = fragment_cache
+        self.tracer = tracer or NULL_TRACER
+        self.section_store = section_store
+    
+    @property
+    def content(self):
+        """
+        Get the output generated so far as a single string.
+        
+        Returns
+        -------
+        str
+            The joined output chunks.
+        """
+        return self.output.getvalue()
+    
+    def cache_flags(self):
+        """
+        Get the generator options that change how sections are rendered.
+        
+        Subclasses with further rendering options should extend this.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        dict
+            Option names and values, included in fragment cache keys.
+        """
+        return {'anonymous': self.anonymous}
+    
+    def section_flags(self, section):
+        """
+        Get the generator options one section's output depends on.
+        
+        Parameters
+        ----------
+        section : str
+            The section name, e.g. 'experience'.
+        
+        Returns
+        -------
+        dict
+            The cache_flags() listed for the section in SECTION_FLAGS, or
+            all of them if it is not listed.
+        """
+        flags = self.cache_flags()
+        names = self.SECTION_FLAGS.get(section)
+        if names is None:
+            return flags
+        return {name: flags[name] for name in names}
+    
+    def default_output_dir(self):
+        """
+        Get the default output directory for this format.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        Path
+            The directory output is written to when none is given.
+        """
+        return Path('.')
     
     def load_cv_data(self):
         """
         Load CV data from JSON file.
         
-        Reads the CV data from 'data/cv-data.json' and stores it in self.cv_data.
+        Reads and validates the CV data from self.data_path (by default
+        'data/cv-data.json') and stores it in self.cv_data.
         
         Parameters
         ----------
@@ -53,11 +280,43 @@ class AbstractCvGenerator(ABC):
             If the JSON file does not exist.
         json.JSONDecodeError
             If the JSON file is malformed.
+        ValueError
+            If the CV data is missing required sections.
+        """
+        self.cv_data = load_cv_data(self.data_path)
+    
+    @property
+    def templates(self):
+        """
+        Get the loader of this format's section templates.
+        
+        Returns
+        -------
+        TemplateLoader
+            The shared loader for TEMPLATE_SYNTAX.
+        """
+        return template_loader(self.TEMPLATE_SYNTAX)
+    
+    def render_template(self, name):
         """
-        # Construct path relative to project root
-        json_path = Path(__file__).parent.parent / 'data' / 'cv-data.json'
-        with open(json_path, 'r', encoding='utf-8') as f:
-            self.cv_data = json.load(f)
+        Render a section template with this generator's data.
+        
+        Templates are compiled to Python functions once and receive the
+        generator as self, the CV data as cv, and the generator's
+        escape_text and format_links methods as e and links.
+        
+        Parameters
+        ----------
+        name : str
+            The template name, e.g. 'experience'.
+        
+        Returns
+        -------
+        str
+            The rendered text.
+        """
+        render = self.templates.get(name)
+        return render(self, self.cv_data, self.escape_text, self.format_links)
     
     @abstractmethod
     def escape_text(self, text):
@@ -244,6 +503,24 @@ class AbstractCvGenerator(ABC):
         """
         pass
     
+    @abstractmethod
+    def generate_footer(self):
+        """
+        Generate footer and close the document.
+        
+        Generates anything that follows the last section and closes the
+        document. Implementation is format-specific.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        pass
+    
     @abstractmethod
     def write_output(self):
         """
@@ -267,32 +544,102 @@ class AbstractCvGenerator(ABC):
         Generate CV by orchestrating all sections in order.
         
         This is the main entry point that loads data and generates all sections
-        in the correct order. The section order can be changed by reordering
-        the method calls.
+        in the correct order, then writes the output. Data passed to the
+        constructor is used as is. Each step is recorded by the tracer.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        with self.tracer.span(f'generate:{self.__class__.__name__}', anonymous=self.anonymous):
+            if self.cv_data is None:
+                print("Loading CV data...")
+                with self.tracer.span('load_cv_data'):
+                    self.load_cv_data()
+            
+            print(f"Generating {self.__class__.__name__} content...")
+            with self.tracer.span('render'):
+                self.render()
+            
+            print("Writing output...")
+            with self.tracer.span('write_output'):
+                self.write_output()
+    
+    def render(self):
+        """
+        Render all sections in order into a fresh output builder.
+        
+        The section order can be changed by reordering SECTIONS. CV data
+        must already be loaded.
         
         Parameters
         ----------
         None
         
+        Returns
+        -------
+        OutputBuilder
+            The builder the document was rendered into.
+        """
+        self.output = OutputBuilder()
+        for section in self.SECTIONS:
+            self.render_section(section)
+        if self.fragment_cache is not None:
+            print(self.fragment_cache.stats_line())
+        return self.output
+    
+    def render_section(self, section):
+        """
+        Render one section, reusing a shared or cached fragment if possible.
+        
+        A section is first looked up in the section store, where another
+        variant of the same CV may have rendered it, then in the fragment
+        cache, and only rendered if neither has it.
+        
+        Parameters
+        ----------
+        section : str
+            The section name, e.g. 'experience'.
+        
         Returns
         -------
         None
         """
-        print("Loading CV data...")
-        self.load_cv_data()
-        
-        print(f"Generating {self.__class__.__name__} content...")
-        self.generate_header()
-        self.generate_summary()
-        self.generate_experience()
-        self.generate_education()
-        self.generate_skills()
-        self.generate_publications()
-        self.generate_awards()
-        self.generate_hobbies()
-        
-        print("Writing output...")
-        self.write_output()
+        generate_section = getattr(self, f'generate_{section}')
+        with self.tracer.span(f'section:{section}') as span:
+            if section not in self.SECTION_DATA or (
+                    self.fragment_cache is None and self.section_store is None):
+                generate_section()
+                return
+            
+            fragment = None
+            if self.section_store is not None:
+                shared_key = self.section_store.key(self, section)
+                fragment = self.section_store.get(shared_key)
+                span['shared'] = fragment is not None
+            if fragment is None:
+                if self.fragment_cache is not None:
+                    key = self.fragment_cache.key(self, section, self.SECTION_DATA[section])
+                    fragment = self.fragment_cache.get(key)
+                    span['cached'] = fragment is not None
+                if fragment is None:
+                    # Render into a separate builder to capture just this section
+                    document_output = self.output
+                    self.output = OutputBuilder()
+                    try:
+                        generate_section()
+                        fragment = self.output.getvalue()
+                    finally:
+                        self.output = document_output
+                    if self.fragment_cache is not None:
+                        self.fragment_cache.put(key, fragment)
+                if self.section_store is not None:
+                    self.section_store.put(shared_key, fragment)
+            self.output.write(fragment)
     
     def _get_section_title(self, title):
         """
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Atomic file output and private build directories.
+"""
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+
+# RAM-backed directory for scratch files, if the system has one
+TMPFS_DIR = Path('/dev/shm')
+
+# Permissions for written files: temporary files are created private, so
+# they are widened to what a plain open() would give before being renamed
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+
+def scratch_root():
+    """
+    Get the directory private build directories are created in.
+
+    Returns
+    -------
+    str or None
+        The tmpfs directory if it is usable, otherwise None for the system
+        default temporary directory.
+    """
+    if TMPFS_DIR.is_dir() and os.access(TMPFS_DIR, os.W_OK):
+        return str(TMPFS_DIR)
+    return None
+
+
+def build_directory(prefix='cv-build-'):
+    """
+    Create a private temporary build directory, on tmpfs where available.
+
+    Parameters
+    ----------
+    prefix : str, optional
+        Prefix for the directory name. Default is 'cv-build-'.
+
+    Returns
+    -------
+    tempfile.TemporaryDirectory
+        Context manager yielding the directory path; the directory and
+        everything in it is removed on exit.
+    """
+    return tempfile.TemporaryDirectory(prefix=prefix, dir=scratch_root())
+
+
+def _temporary_sibling(path):
+    """Open a uniquely named temporary file next to path, for renaming onto it."""
+    f = tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp', delete=False
+    )
+    os.chmod(f.name, FILE_MODE)
+    return f
+
+
+def _sync(f):
+    """Flush a file to disk, so it is complete before it is renamed into place."""
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def atomic_write_bytes(path, data):
+    """
+    Write bytes to a file atomically.
+
+    The data is written to a temporary file in the same directory, flushed
+    to disk and renamed over path, so readers see either the old or the
+    new file, never a partial or missing one, even after a crash.
+
+    Parameters
+    ----------
+    path : str or Path
+        The file to write.
+    data : bytes
+        The file contents.
+
+    Returns
+    -------
+    None
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _temporary_sibling(path) as f:
+        f.write(data)
+        _sync(f)
+    os.replace(f.name, path)
+
+
+def atomic_write_text(path, text):
+    """
+    Write UTF-8 text to a file atomically.
+
+    Parameters
+    ----------
+    path : str or Path
+        The file to write.
+    text : str
+        The file contents.
+
+    Returns
+    -------
+    None
+    """
+    atomic_write_bytes(path, text.encode('utf-8'))
+
+
+def atomic_copy(source, target):
+    """
+    Copy a file into place atomically, across filesystems if necessary.
+
+    Parameters
+    ----------
+    source : str or Path
+        The file to copy.
+    target : str or Path
+        Where to put the copy.
+
+    Returns
+    -------
+    None
+    """
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with _temporary_sibling(target) as f, open(source, 'rb') as src:
+        shutil.copyfileobj(src, f)
+        _sync(f)
+    os.replace(f.name, target)
@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+Batch CV rendering - renders many CV data files, or a stream of JSON-Lines
+records, across a process pool.
+"""
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+
+from abstract_cv_generator import load_cv_data, to_model
+from cv_builder import FORMAT_FLAGS, GENERATORS, build
+
+
+def collect_inputs(source):
+    """
+    Collect CV data files from a directory or glob pattern.
+
+    Parameters
+    ----------
+    source : str or Path
+        A directory (all '*.json' files in it are used) or a glob pattern.
+
+    Returns
+    -------
+    list of Path
+        The matching files, sorted by path.
+    """
+    source_path = Path(source)
+    if source_path.is_dir():
+        return sorted(source_path.glob('*.json'))
+    return sorted(Path(p) for p in glob.glob(str(source)) if Path(p).is_file())
+
+
+def output_names(inputs):
+    """
+    Name the output directory of each input file.
+
+    Each directory is named after the input's path relative to the
+    deepest directory containing every input, without its suffix, so
+    inputs in one directory get their file stem (e.g. 'alice') and inputs
+    sharing a file name in different directories stay apart (e.g.
+    'alice/cv' and 'bob/cv').
+
+    Parameters
+    ----------
+    inputs : list of Path
+        CV data files.
+
+    Returns
+    -------
+    dict
+        Each input mapped to its output directory name.
+
+    Raises
+    ------
+    ValueError
+        If two inputs would get the same name, e.g. 'cv.json' and 'cv.JSON'.
+    """
+    if not inputs:
+        return {}
+    root = Path(os.path.commonpath([path.resolve().parent for path in inputs]))
+    names = {}
+    owners = {}
+    for path in inputs:
+        name = path.resolve().relative_to(root).with_suffix('').as_posix()
+        if name in owners:
+            raise ValueError(f"{owners[name]} and {path} would both be written to '{name}'")
+        owners[name] = path
+        names[path] = name
+    return names
+
+
+def file_sha256(path):
+    """
+    Compute the SHA-256 hex digest of a file.
+
+    Parameters
+    ----------
+    path : str or Path
+        The file to hash.
+
+    Returns
+    -------
+    str
+        The hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def render_one(data_path, output_dir, formats, anonymous=False):
+    """
+    Render one CV data file to every requested format.
+
+    Runs in a worker process. The data file is loaded once and shared by
+    every format. Generator output is captured rather than printed so that
+    workers do not interleave their progress messages.
+
+    The HTML output is not standalone: index.html links the stylesheet,
+    images and PDF by the paths of the site build (css/, assets/ and
+    output/), which are not copied into output_dir. It is meant to be
+    served from, or moved into, the project root.
+
+    Parameters
+    ----------
+    data_path : str
+        Path to the CV data JSON file.
+    output_dir : str
+        Directory the output set for this input is written to.
+    formats : list of str
+        Output formats to render, keys of GENERATORS.
+    anonymous : bool, optional
+        If True, generates anonymized CVs. Default is False.
+
+    Returns
+    -------
+    dict
+        Result record with 'status', 'seconds', 'formats' and, on failure,
+        'error' and 'log'.
+    """
+    return _render(lambda: load_cv_data(data_path), output_dir, formats, anonymous)
+
+
+def render_record(record, output_dir, formats, anonymous=False):
+    """
+    Render one JSON-Lines record to every requested format.
+
+    Runs in a worker process, like render_one. The record is decoded,
+    parsed and validated here rather than by the reader, so the reader
+    only moves bytes and a malformed record fails on its own.
+
+    Parameters
+    ----------
+    record : bytes
+        One line of the input, holding a CV data JSON object.
+    output_dir : str
+        Directory the output set for this record is written to.
+    formats : list of str
+        Output formats to render, keys of GENERATORS.
+    anonymous : bool, optional
+        If True, generates anonymized CVs. Default is False.
+
+    Returns
+    -------
+    dict
+        Result record with 'status', 'seconds', 'formats' and, on failure,
+        'error' and 'log'.
+    """
+    return _render(
+        lambda: to_model(json.loads(record.decode('utf-8'))),
+        output_dir, formats, anonymous
+    )
+
+
+def _render(load, output_dir, formats, anonymous):
+    """Load CV data with a callable and render it, capturing output and errors."""
+    start = time.perf_counter()
+    log = io.StringIO()
+    timings = {}
+    try:
+        with contextlib.redirect_stdout(log):
+            cv_data = load()
+            for fmt in formats:
+                # Formats with no anonymous variant (HTML) render the full one
+                variant = 'anon' if anonymous and 'anonymous' in FORMAT_FLAGS[fmt] else 'full'
+                fmt_start = time.perf_counter()
+                build(cv_data, [fmt], [variant], output_dir)
+                timings[fmt] = round(time.perf_counter() - fmt_start, 4)
+    except (Exception, SystemExit) as e:
+        return {
+            'status': 'failed',
+            'seconds': round(time.perf_counter() - start, 4),
+            'formats': timings,
+            'error': f"{e.__class__.__name__}: {e}",
+            'log': log.getvalue(),
+        }
+    return {
+        'status': 'ok',
+        'seconds': round(time.perf_counter() - start, 4),
+        'formats': timings,
+    }
+
+
+def _failure(error):
+    """Make the result record of a job that raised instead of returning one."""
+    return {
+        'status': 'failed',
+        'seconds': 0.0,
+        'formats': {},
+        'error': f"{error.__class__.__name__}: {error}",
+        'log': '',
+    }
+
+
+def _result(future):
+    """Get the result record of a finished job, or a failed one if its worker died."""
+    try:
+        return future.result()
+    except Exception as e:
+        return _failure(e)
+
+
+def load_manifest(manifest_path):
+    """
+    Load a batch manifest, returning an empty one if it does not exist.
+
+    Parameters
+    ----------
+    manifest_path : Path
+        Path to the manifest JSON file.
+
+    Returns
+    -------
+    dict
+        The manifest contents.
+    """
+    if not manifest_path.exists():
+        return {'inputs': {}}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_manifest(manifest, manifest_path):
+    """
+    Write a batch manifest atomically.
+
+    The manifest is written to a temporary file and renamed into place, so
+    an interrupted run always leaves a readable manifest to resume from.
+
+    Parameters
+    ----------
+    manifest : dict
+        The manifest contents.
+    manifest_path : Path
+        Path to the manifest JSON file.
+
+    Returns
+    -------
+    None
+    """
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = manifest_path.with_name(manifest_path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def run_batch(inputs, output_root, formats=('pdf', 'html'), anonymous=False,
+              workers=None, manifest_path=None, resume=False):
+    """
+    Render a set of CV data files across a process pool.
+
+    Each input is rendered into its own directory under output_root, named
+    by output_names. A manifest recording the outcome and timing of
+    every input is updated as jobs finish. With resume, inputs that already
+    succeeded with the same options and whose contents are unchanged since
+    are skipped. A job whose worker dies (e.g. a crash that breaks the
+    pool) is recorded as failed, and the other inputs are still recorded.
+
+    Parameters
+    ----------
+    inputs : list of Path
+        CV data files to render.
+    output_root : str or Path
+        Directory that per-input output directories are created in.
+    formats : sequence of str, optional
+        Output formats to render. Default is ('pdf', 'html').
+    anonymous : bool, optional
+        If True, generates anonymized CVs. Default is False.
+    workers : int, optional
+        Number of worker processes. Default is the number of CPUs.
+    manifest_path : str or Path, optional
+        Path to the manifest. Default is 'manifest.json' in output_root.
+    resume : bool, optional
+        If True, skip inputs the manifest records as done. Default is False.
+
+    Returns
+    -------
+    dict
+        The final manifest.
+
+    Raises
+    ------
+    ValueError
+        If two inputs would be written to the same output directory.
+    """
+    output_root = Path(output_root)
+    names = output_names(inputs)
+    if manifest_path is None:
+        manifest_path = output_root / 'manifest.json'
+    manifest_path = Path(manifest_path)
+
+    manifest = load_manifest(manifest_path) if resume else {'inputs': {}}
+    manifest['started'] = datetime.now().isoformat(timespec='seconds')
+    manifest['formats'] = list(formats)
+    manifest['anonymous'] = anonymous
+
+    pending = []
+    skipped = 0
+    for data_path in inputs:
+        key = str(data_path)
+        digest = file_sha256(data_path)
+        output_dir = output_root / names[data_path]
+        previous = manifest['inputs'].get(key)
+        if (resume and previous and previous['status'] == 'ok'
+                and previous.get('sha256') == digest
+                and previous.get('output_dir') == str(output_dir)
+                and previous.get('anonymous') == anonymous
+                and set(formats) <= set(previous.get('formats', {}))):
+            skipped += 1
+            continue
+        pending.append((data_path, digest, output_dir))
+
+    print(f"Rendering {len(pending)} CV(s) ({skipped} already done)...")
+    batch_start = time.perf_counter()
+    # Outcomes of this run only; skipped inputs keep their earlier entries
+    statuses = []
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for data_path, digest, output_dir in pending:
+            future = executor.submit(
+                render_one, str(data_path), str(output_dir),
+                list(formats), anonymous
+            )
+            futures[future] = (data_path, digest, output_dir)
+
+        for future in as_completed(futures):
+            data_path, digest, output_dir = futures[future]
+            result = _result(future)
+            result['sha256'] = digest
+            result['output_dir'] = str(output_dir)
+            result['anonymous'] = anonymous
+            manifest['inputs'][str(data_path)] = result
+            statuses.append(result['status'])
+            write_manifest(manifest, manifest_path)
+
+            if result['status'] == 'ok':
+                print(f"✓ {data_path} ({result['seconds']:.2f}s)")
+            else:
+                print(f"✗ {data_path}: {result['error']}")
+
+    manifest['finished'] = datetime.now().isoformat(timespec='seconds')
+    manifest['summary'] = {
+        'succeeded': statuses.count('ok'),
+        'failed': statuses.count('failed'),
+        'skipped': skipped,
+        'seconds': round(time.perf_counter() - batch_start, 4),
+    }
+    write_manifest(manifest, manifest_path)
+
+    summary = manifest['summary']
+    print(
+        f"Batch complete: {summary['succeeded']} succeeded, "
+        f"{summary['failed']} failed, {summary['skipped']} skipped "
+        f"in {summary['seconds']:.2f}s"
+    )
+    print(f"Manifest written to {manifest_path}")
+    return manifest
+
+
+def read_records(stream):
+    """
+    Read the records of a JSON-Lines stream one at a time.
+
+    Parameters
+    ----------
+    stream : binary file
+        The input, e.g. an open .jsonl file or sys.stdin.buffer.
+
+    Yields
+    ------
+    tuple
+        (line number, record bytes) for each non-blank line, numbered
+        from 1. Records are not parsed here.
+    """
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if line:
+            yield line_number, line
+
+
+def run_stream(stream, output_root, formats=('pdf', 'html'), anonymous=False,
+               workers=None, queue_size=None, results_path=None, name='stream'):
+    """
+    Render the records of a JSON-Lines stream across a process pool.
+
+    Records are rendered as they are read, and at most queue_size are
+    read ahead of the workers: the reader waits for one to finish before
+    reading more. Results are appended to a JSON-Lines log as they finish
+    rather than kept for a manifest, so memory stays flat however long the
+    input is. A record that is not valid JSON or not valid CV data, or
+    whose worker dies, is reported with its line number and the run
+    carries on.
+
+    Parameters
+    ----------
+    stream : binary file
+        The input, e.g. an open .jsonl file or sys.stdin.buffer.
+    output_root : str or Path
+        Directory that per-record output directories are created in.
+    formats : sequence of str, optional
+        Output formats to render. Default is ('pdf', 'html').
+    anonymous : bool, optional
+        If True, generates anonymized CVs. Default is False.
+    workers : int, optional
+        Number of worker processes. Default is the number of CPUs.
+    queue_size : int, optional
+        Most records read but not yet rendered. Default is twice the
+        number of workers.
+    results_path : str or Path, optional
+        Path to the results log. Default is 'results.jsonl' in output_root.
+    name : str, optional
+        Name of the input, used for the output directories, which are
+        named '<name>-<line number>'. Default is 'stream'.
+
+    Returns
+    -------
+    dict
+        Summary with 'succeeded', 'failed' and 'seconds' keys.
+    """
+    output_root = Path(output_root)
+    workers = workers or os.cpu_count() or 1
+    queue_size = queue_size or 2 * workers
+    if results_path is None:
+        results_path = output_root / 'results.jsonl'
+    results_path = Path(results_path)
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+
+    summary = {'succeeded': 0, 'failed': 0}
+    print(f"Rendering records from {name} ({workers} workers, up to {queue_size} queued)...")
+    batch_start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor, \
+            open(results_path, 'w', encoding='utf-8') as results:
+        in_flight = {}
+
+        def report(line_number, output_dir, outcome):
+            result = {'line': line_number, **outcome, 'output_dir': str(output_dir)}
+            results.write(json.dumps(result) + '\n')
+            results.flush()
+            if result['status'] == 'ok':
+                summary['succeeded'] += 1
+                print(f"✓ {name} line {line_number} ({result['seconds']:.2f}s)")
+            else:
+                summary['failed'] += 1
+                print(f"✗ {name} line {line_number}: {result['error']}")
+
+        def finish(done):
+            for future in done:
+                line_number, output_dir = in_flight.pop(future)
+                report(line_number, output_dir, _result(future))
+
+        for line_number, record in read_records(stream):
+            if len(in_flight) >= queue_size:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                finish(done)
+            output_dir = output_root / f'{name}-{line_number}'
+            try:
+                future = executor.submit(
+                    render_record, record, str(output_dir), list(formats), anonymous
+                )
+            except BrokenProcessPool as e:
+                # A crashed worker takes the pool down; the rest of the
+                # stream is still read and recorded
+                report(line_number, output_dir, _failure(e))
+                continue
+            in_flight[future] = (line_number, output_dir)
+        finish(as_completed(list(in_flight)))
+
+    summary['seconds'] = round(time.perf_counter() - batch_start, 4)
+    print(
+        f"Stream complete: {summary['succeeded']} succeeded, "
+        f"{summary['failed']} failed in {summary['seconds']:.2f}s"
+    )
+    print(f"Results written to {results_path}")
+    return summary
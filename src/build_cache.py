@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Build Cache - reuses compiled PDFs when the LaTeX source has not changed.
+"""
+import hashlib
+import os
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+
+from atomic_io import atomic_copy
+from output_store import output_store
+
+
+@lru_cache(maxsize=None)
+def latex_engine_version(engine='pdflatex'):
+    """
+    Get the version banner of a LaTeX engine.
+
+    Parameters
+    ----------
+    engine : str, optional
+        The LaTeX engine executable. Default is 'pdflatex'.
+
+    Returns
+    -------
+    str
+        The first line of the engine's --version output.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the engine is not installed on the system.
+    """
+    result = subprocess.run(
+        [engine, '--version'],
+        capture_output=True,
+        text=True
+    )
+    return result.stdout.splitlines()[0] if result.stdout else ''
+
+
+class BuildCache:
+    """
+    Content-addressed cache of compiled PDFs.
+
+    PDFs are stored under a hash of the rendered LaTeX source plus the
+    engine name and version, so a byte-for-byte identical document compiled
+    by the same engine is never compiled twice. Hits and misses are counted
+    for the lifetime of the cache object.
+    """
+
+    # Number of cached PDFs kept before the least recently used are removed
+    MAX_ENTRIES = 64
+
+    def __init__(self, cache_dir):
+        """
+        Initialize the build cache.
+
+        Parameters
+        ----------
+        cache_dir : str or Path
+            Directory cached PDFs are stored in.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, chunks, engine='pdflatex'):
+        """
+        Compute the cache key for a LaTeX document.
+
+        Parameters
+        ----------
+        chunks : iterable of str
+            The LaTeX source, in one or more chunks.
+        engine : str, optional
+            The LaTeX engine the document is compiled with. Default is 'pdflatex'.
+
+        Returns
+        -------
+        str
+            Hex digest identifying the source, engine and engine version.
+        """
+        digest = hashlib.sha256()
+        digest.update(engine.encode('utf-8') + b'\0')
+        digest.update(latex_engine_version(engine).encode('utf-8') + b'\0')
+        for chunk in chunks:
+            digest.update(chunk.encode('utf-8'))
+        return digest.hexdigest()
+
+    def fetch(self, key, target):
+        """
+        Publish a cached PDF to target if one exists for key.
+
+        The PDF is published through the output store, so it is moved into
+        place atomically and left untouched if target already has it.
+        Counts a hit or a miss.
+
+        Parameters
+        ----------
+        key : str
+            The cache key from key().
+        target : str or Path
+            Where to copy the cached PDF to.
+
+        Returns
+        -------
+        bool
+            True if the PDF was found in the cache and copied.
+        """
+        cached = self.cache_dir / f'{key}.pdf'
+        try:
+            pdf = cached.read_bytes()
+        except FileNotFoundError:
+            # Not cached, or pruned by another process since
+            self.misses += 1
+            return False
+        output_store(Path(target).parent).publish(target, pdf)
+        try:
+            # Mark as recently used; touch() would recreate a pruned entry empty
+            os.utime(cached)
+        except FileNotFoundError:
+            pass
+        self.hits += 1
+        return True
+
+    def store(self, key, pdf_path):
+        """
+        Add a compiled PDF to the cache.
+
+        Parameters
+        ----------
+        key : str
+            The cache key from key().
+        pdf_path : str or Path
+            The compiled PDF to cache.
+
+        Returns
+        -------
+        None
+        """
+        atomic_copy(pdf_path, self.cache_dir / f'{key}.pdf')
+        self.prune()
+
+    def prune(self):
+        """
+        Remove the least recently used PDFs beyond MAX_ENTRIES.
+
+        Entries removed meanwhile by another process, such as a batch
+        worker pruning the same cache, are skipped.
+
+        Returns
+        -------
+        None
+        """
+        entries = []
+        for path in self.cache_dir.glob('*.pdf'):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        entries.sort(reverse=True)
+        for _, path in entries[self.MAX_ENTRIES:]:
+            path.unlink(missing_ok=True)
+
+    def stats_line(self):
+        """
+        Describe the cache hits and misses so far.
+
+        Returns
+        -------
+        str
+            A one-line summary of hits and misses.
+        """
+        hits = f"{self.hits} hit" + ("" if self.hits == 1 else "s")
+        misses = f"{self.misses} miss" + ("" if self.misses == 1 else "es")
+        return f"Build cache: {hits}, {misses}"
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+CV Builder - renders several formats and variants from one data load.
+"""
+from abstract_cv_generator import load_cv_data
+from direct_pdf_cv_generator import DirectPdfCvGenerator
+from fragment_cache import FragmentCache, SectionStore
+from html_cv_generator import HtmlCvGenerator
+from pdf_cv_generator import PdfCvGenerator
+from tracing import NULL_TRACER
+
+
+# Generator class for each supported output format
+GENERATORS = {
+    'pdf': PdfCvGenerator,
+    'pdf-direct': DirectPdfCvGenerator,
+    'html': HtmlCvGenerator,
+}
+
+# Generator flags of each supported variant
+VARIANTS = {
+    'full': {},
+    'anon': {'anonymous': True},
+    'complete': {'include_hidden': True},
+}
+
+# Variant flags each format renders differently; a variant setting any
+# other flag is the same as the full variant for that format, so skipped
+FORMAT_FLAGS = {
+    'pdf': {'anonymous', 'include_hidden'},
+    'pdf-direct': {'anonymous', 'include_hidden'},
+    'html': set(),
+}
+
+
+def variant_matrix(formats, variants):
+    """
+    List the distinct outputs for some formats and variants.
+
+    Parameters
+    ----------
+    formats : sequence of str
+        Output formats, keys of GENERATORS.
+    variants : sequence of str
+        Variants, keys of VARIANTS.
+
+    Returns
+    -------
+    list of tuple
+        (format, variant, flags) for each output to render, in order.
+        Variants a format does not distinguish are reported and left out.
+    """
+    matrix = []
+    for fmt in formats:
+        for variant in variants:
+            flags = VARIANTS[variant]
+            if not set(flags) <= FORMAT_FLAGS[fmt]:
+                print(f"Skipping {variant} {fmt}: format has no {variant} variant")
+                continue
+            matrix.append((fmt, variant, flags))
+    return matrix
+
+
+def build(cv_data, formats=('pdf', 'html'), variants=('full',), output_dir=None,
+          force=False, incremental=False, use_format=False, tracer=None,
+          minify=False, page_size=None, fit_pages=None):
+    """
+    Render CV data to every requested format and variant.
+
+    The same parsed data object is handed to every generator, so the data
+    file is read and validated once however many outputs are produced.
+    Variants a format does not distinguish (e.g. anonymous HTML) are skipped.
+    Variants share their rendered sections: a section is rendered once for
+    every variant whose flags it does not read (e.g. the anonymous PDF only
+    renders its header again). PDF variants share one build cache, so
+    unchanged PDFs are not recompiled. When incremental, only sections
+    whose data changed are re-rendered.
+
+    Parameters
+    ----------
+    cv_data : CvData
+        Parsed and validated CV data.
+    formats : sequence of str, optional
+        Output formats to render, keys of GENERATORS. Default is ('pdf', 'html').
+    variants : sequence of str, optional
+        Variants to render, keys of VARIANTS. Default is ('full',).
+    output_dir : str or Path, optional
+        Directory for all output. Default is each format's own default.
+    force : bool, optional
+        If True, recompile PDFs even if the build cache has them. Default is False.
+    incremental : bool, optional
+        If True, reuse cached section fragments. Default is False.
+    use_format : bool, optional
+        If True, compile PDFs from a precompiled preamble format. Default is False.
+    tracer : Tracer, optional
+        Records the time and memory each build step takes. Default is None.
+    minify : bool, optional
+        If True, minify the HTML and write precompressed copies. Default is False.
+    page_size : int, optional
+        If given, split long HTML sections into pages of this many entries.
+        Default is None.
+    fit_pages : int, optional
+        If given, adjust each PDF's layout to fit this many pages. Default is None.
+
+    Returns
+    -------
+    list of tuple
+        The (format, variant) pairs that were rendered.
+    """
+    built = []
+    build_cache = None
+    fragment_cache = FragmentCache() if incremental else None
+    section_store = SectionStore()
+    for fmt, variant, flags in variant_matrix(formats, variants):
+        options = dict(flags)
+        if fmt == 'pdf':
+            options.update(force=force, build_cache=build_cache, use_format=use_format,
+                           fit_pages=fit_pages)
+        elif fmt == 'html':
+            options.update(minify=minify, page_size=page_size)
+        generator = GENERATORS[fmt](
+            output_dir=output_dir,
+            cv_data=cv_data,
+            fragment_cache=fragment_cache,
+            tracer=tracer,
+            section_store=section_store,
+            **options
+        )
+        if fmt == 'pdf':
+            build_cache = generator.build_cache
+        generator.generate()
+        built.append((fmt, variant))
+    if len(built) > 1:
+        print(section_store.stats_line())
+    return built
+
+
+def build_file(data_path=None, formats=('pdf', 'html'), variants=('full',),
+               output_dir=None, force=False, incremental=False,
+               use_format=False, tracer=None, minify=False, page_size=None,
+               fit_pages=None):
+    """
+    Load a CV data file once and render every requested format and variant.
+
+    Parameters
+    ----------
+    data_path : str or Path, optional
+        Path to the CV data JSON file. Default is 'data/cv-data.json'.
+    formats : sequence of str, optional
+        Output formats to render. Default is ('pdf', 'html').
+    variants : sequence of str, optional
+        Variants to render. Default is ('full',).
+    output_dir : str or Path, optional
+        Directory for all output. Default is each format's own default.
+    force : bool, optional
+        If True, recompile PDFs even if the build cache has them. Default is False.
+    incremental : bool, optional
+        If True, reuse cached section fragments. Default is False.
+    use_format : bool, optional
+        If True, compile PDFs from a precompiled preamble format. Default is False.
+    tracer : Tracer, optional
+        Records the time and memory each build step takes. Default is None.
+    minify : bool, optional
+        If True, minify the HTML and write precompressed copies. Default is False.
+    page_size : int, optional
+        If given, split long HTML sections into pages of this many entries.
+        Default is None.
+    fit_pages : int, optional
+        If given, adjust each PDF's layout to fit this many pages. Default is None.
+
+    Returns
+    -------
+    list of tuple
+        The (format, variant) pairs that were rendered.
+    """
+    print("Loading CV data...")
+    with (tracer or NULL_TRACER).span('load_cv_data'):
+        cv_data = load_cv_data(data_path)
+    return build(cv_data, formats, variants, output_dir, force, incremental,
+                 use_format, tracer, minify, page_size, fit_pages)
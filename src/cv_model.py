@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+CV Model - immutable typed CV data, with a cache of parsed data files.
+"""
+import hashlib
+import os
+import pickle
+from pathlib import Path
+
+from atomic_io import atomic_write_bytes
+
+
+# Project root, which the cache directory is in
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Default directory for parsed data files
+DEFAULT_CACHE_DIR = PROJECT_ROOT / 'output' / '.model-cache'
+
+# Marks a field that has no default and must be present in the data
+REQUIRED = object()
+
+
+class Record:
+    """
+    Base class for immutable records read from one JSON object.
+
+    Subclasses list their attributes in __slots__ and describe them in
+    FIELDS as (attribute, JSON key, default) tuples; fields whose default is
+    REQUIRED must be present. OBJECTS maps attributes holding one nested
+    record to its class, NESTED maps attributes holding a list of records to
+    the record class, and LISTS names attributes holding a list of strings.
+    Lists are stored as tuples, so a record and everything in it is
+    immutable and hashable.
+    """
+
+    __slots__ = ()
+    FIELDS = ()
+    OBJECTS = {}
+    NESTED = {}
+    LISTS = ()
+
+    def __init__(self, *values):
+        for (name, _, _), value in zip(self.FIELDS, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        # Slotted immutable objects cannot be restored by setting attributes
+        return self.__class__, self._values()
+
+    def _values(self):
+        return tuple(getattr(self, name) for name, _, _ in self.FIELDS)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._values() == other._values()
+
+    def __hash__(self):
+        return hash(self._values())
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name, _, _ in self.FIELDS)
+        return f'{type(self).__name__}({fields})'
+
+    @classmethod
+    def from_dict(cls, data, where=None):
+        """
+        Build a record from a parsed JSON object, validating it.
+
+        Parameters
+        ----------
+        data : dict
+            The JSON object.
+        where : str, optional
+            Location of the object in the data file, for error messages.
+            Default is None, for the top-level object.
+
+        Returns
+        -------
+        Record
+            The record.
+
+        Raises
+        ------
+        ValueError
+            If the object is not a dict, lacks a required field or has a
+            list field of the wrong type.
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"Invalid CV data: {where or 'CV data'} must be an object")
+        values = []
+        for name, key, default in cls.FIELDS:
+            value = data.get(key, default)
+            if value is REQUIRED:
+                raise ValueError(f"Invalid CV data: {where or 'CV data'} is missing '{key}'")
+            path = f'{where}.{key}' if where else key
+            if name in cls.OBJECTS:
+                value = cls.OBJECTS[name].from_dict(value, path)
+            elif name in cls.NESTED:
+                value = _record_list(cls.NESTED[name], value or (), path)
+            elif name in cls.LISTS:
+                if not isinstance(value or (), (list, tuple)):
+                    raise ValueError(f"Invalid CV data: {path} must be a list")
+                value = tuple(value or ())
+            values.append(value)
+        return cls(*values)
+
+    def as_dict(self):
+        """
+        Convert the record back to its JSON form.
+
+        Returns
+        -------
+        dict
+            The record's fields under their JSON keys, with nested records
+            converted too.
+        """
+        result = {}
+        for name, key, _ in self.FIELDS:
+            value = getattr(self, name)
+            if name in self.OBJECTS:
+                value = value.as_dict()
+            elif name in self.NESTED:
+                value = [item.as_dict() for item in value]
+            elif name in self.LISTS:
+                value = list(value)
+            result[key] = value
+        return result
+
+
+def _record_list(record_class, items, where):
+    """Build a tuple of records from a JSON list."""
+    if not isinstance(items, (list, tuple)):
+        raise ValueError(f"Invalid CV data: {where} must be a list")
+    return tuple(record_class.from_dict(item, f'{where}[{i}]') for i, item in enumerate(items))
+
+
+class SocialLink(Record):
+    """A link to a social or professional profile."""
+
+    __slots__ = ('name', 'url', 'icon')
+    FIELDS = (
+        ('name', 'name', REQUIRED),
+        ('url', 'url', REQUIRED),
+        ('icon', 'icon', REQUIRED),
+    )
+
+
+class Personal(Record):
+    """Personal details shown in the CV header."""
+
+    __slots__ = ('name', 'title', 'location', 'email', 'phone', 'summary', 'social')
+    FIELDS = (
+        ('name', 'name', REQUIRED),
+        ('title', 'title', None),
+        ('location', 'location', REQUIRED),
+        ('email', 'email', REQUIRED),
+        ('phone', 'phone', REQUIRED),
+        ('summary', 'summary', REQUIRED),
+        ('social', 'social', ()),
+    )
+    NESTED = {'social': SocialLink}
+
+
+class Job(Record):
+    """One position in the experience section."""
+
+    __slots__ = ('title', 'company', 'location', 'start_date', 'end_date', 'icon',
+                 'highlights', 'hide_on_pdf')
+    FIELDS = (
+        ('title', 'title', REQUIRED),
+        ('company', 'company', REQUIRED),
+        ('location', 'location', REQUIRED),
+        ('start_date', 'startDate', REQUIRED),
+        ('end_date', 'endDate', REQUIRED),
+        ('icon', 'icon', REQUIRED),
+        ('highlights', 'highlights', ()),
+        ('hide_on_pdf', 'hideOnPdf', False),
+    )
+    LISTS = ('highlights',)
+
+
+class Grade(Record):
+    """A subject and grade within a qualification."""
+
+    __slots__ = ('subject', 'grade')
+    FIELDS = (
+        ('subject', 'subject', REQUIRED),
+        ('grade', 'grade', REQUIRED),
+    )
+
+
+class Education(Record):
+    """One qualification in the education section."""
+
+    __slots__ = ('degree', 'institution', 'years', 'details')
+    FIELDS = (
+        ('degree', 'degree', REQUIRED),
+        ('institution', 'institution', REQUIRED),
+        ('years', 'years', REQUIRED),
+        ('details', 'details', ()),
+    )
+    NESTED = {'details': Grade}
+
+
+class Publication(Record):
+    """One entry in the publications section."""
+
+    __slots__ = ('authors', 'year', 'title', 'venue', 'volume', 'issue', 'pages', 'doi', 'url')
+    FIELDS = (
+        ('authors', 'authors', REQUIRED),
+        ('year', 'year', REQUIRED),
+        ('title', 'title', REQUIRED),
+        ('venue', 'venue', REQUIRED),
+        ('volume', 'volume', None),
+        ('issue', 'issue', None),
+        ('pages', 'pages', None),
+        ('doi', 'doi', None),
+        ('url', 'url', None),
+    )
+
+
+class Award(Record):
+    """One entry in the awards section."""
+
+    __slots__ = ('title', 'description', 'url')
+    FIELDS = (
+        ('title', 'title', REQUIRED),
+        ('description', 'description', REQUIRED),
+        ('url', 'url', None),
+    )
+
+
+class Hobby(Record):
+    """One entry in the hobbies section."""
+
+    __slots__ = ('name', 'icon')
+    FIELDS = (
+        ('name', 'name', REQUIRED),
+        ('icon', 'icon', REQUIRED),
+    )
+
+
+class CvData(Record):
+    """
+    A complete CV.
+
+    Built once from the parsed JSON by from_dict, which validates every
+    entry, and read by the generators through attributes.
+    """
+
+    __slots__ = ('personal', 'skills', 'experience', 'education', 'publications',
+                 'awards', 'hobbies')
+    FIELDS = (
+        ('personal', 'personal', REQUIRED),
+        ('skills', 'skills', REQUIRED),
+        ('experience', 'experience', REQUIRED),
+        ('education', 'education', REQUIRED),
+        ('publications', 'publications', REQUIRED),
+        ('awards', 'awards', REQUIRED),
+        ('hobbies', 'hobbies', REQUIRED),
+    )
+    OBJECTS = {'personal': Personal}
+    NESTED = {
+        'experience': Job,
+        'education': Education,
+        'publications': Publication,
+        'awards': Award,
+        'hobbies': Hobby,
+    }
+    LISTS = ('skills',)
+
+
+def _model_source_hash():
+    """Hash this module's source, so cached models are invalidated when it changes."""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+class ModelCache:
+    """
+    On-disk cache of parsed CV models.
+
+    Models are pickled under a hash of the raw data file and of this
+    module's source, so an unchanged data file is loaded without JSON
+    parsing or validation, and a changed file or model misses. Only the
+    most recently used models are kept, so watch mode and batches over
+    many data files do not grow the cache without bound.
+    """
+
+    # Number of cached models kept before the least recently used are removed
+    MAX_ENTRIES = 32
+
+    def __init__(self, cache_dir=None):
+        """
+        Initialize the model cache.
+
+        Parameters
+        ----------
+        cache_dir : str or Path, optional
+            Directory models are stored in. Default is 'output/.model-cache'
+            in the project root.
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.model_hash = _model_source_hash()
+
+    def key(self, raw):
+        """
+        Compute the cache key for the bytes of a data file.
+
+        Parameters
+        ----------
+        raw : bytes
+            The data file contents.
+
+        Returns
+        -------
+        str
+            Hex digest identifying the data and the model version.
+        """
+        digest = hashlib.sha256()
+        digest.update(self.model_hash.encode('utf-8') + b'\0')
+        digest.update(raw)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Look up a cached model.
+
+        Parameters
+        ----------
+        key : str
+            The cache key from key().
+
+        Returns
+        -------
+        CvData or None
+            The cached model, or None if it is not cached or unreadable.
+        """
+        path = self.cache_dir / f'{key}.pickle'
+        try:
+            with open(path, 'rb') as f:
+                model = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, TypeError):
+            # A damaged entry, or one from an older model, is rebuilt
+            return None
+        try:
+            # Mark the entry as recently used, so prune() keeps it; touch()
+            # would recreate an entry pruned meanwhile as an empty file
+            os.utime(path)
+        except OSError:
+            pass
+        return model
+
+    def put(self, key, model):
+        """
+        Store a parsed model.
+
+        Parameters
+        ----------
+        key : str
+            The cache key from key().
+        model : CvData
+            The parsed model.
+
+        Returns
+        -------
+        None
+        """
+        atomic_write_bytes(
+            self.cache_dir / f'{key}.pickle',
+            pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+        )
+        self.prune()
+
+    def prune(self):
+        """
+        Remove the least recently used models beyond MAX_ENTRIES.
+
+        Entries removed meanwhile by another process are skipped.
+
+        Returns
+        -------
+        None
+        """
+        entries = []
+        for path in self.cache_dir.glob('*.pickle'):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        entries.sort(reverse=True)
+        for _, path in entries[self.MAX_ENTRIES:]:
+            path.unlink(missing_ok=True)
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+CV Server - renders CVs on request over HTTP.
+"""
+import asyncio
+import hashlib
+import mimetypes
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from abstract_cv_generator import DEFAULT_DATA_PATH, load_cv_data
+from fragment_cache import generator_source_hash
+from html_cv_generator import HtmlCvGenerator
+from icon_font import ICON_STYLESHEET
+from image_pipeline import image_pipeline
+from latex_compile_service import LatexCompileService
+from pdf_cv_generator import PdfCvGenerator
+from template_engine import template_loader
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Directories served as static files, relative to the project root
+STATIC_DIRS = ('css', 'assets')
+
+# Largest request head accepted, in bytes
+MAX_HEADER_BYTES = 16384
+
+# Files the HTML page depends on besides the data and templates, relative to
+# the project root: the icon subset whose coverage picks the icon stylesheet,
+# and the stylesheets it links
+HTML_INPUTS = (ICON_STYLESHEET, HtmlCvGenerator.STYLESHEET, HtmlCvGenerator.MINIFIED_STYLESHEET)
+
+
+class CvServer:
+    """
+    Small asyncio HTTP server that renders the CV on demand.
+
+    Serves the HTML CV at '/', the PDF at '/cv.pdf' (and the path the HTML
+    links to), the anonymous PDF at '/cv-anonymous.pdf', and the stylesheet
+    and assets. Rendered documents carry a strong ETag computed from the CV
+    data, the source and templates they are rendered with and, for the
+    HTML, the profile photo and stylesheets, so conditional requests are
+    answered with 304 without rendering. Rendered bodies are kept in an in-memory
+    LRU, concurrent requests for the same document share one render.
+    Documents are rendered on a background thread, one at a time, and PDFs
+    are compiled on a worker pool, so the event loop keeps serving while
+    they are built.
+    """
+
+    def __init__(self, data_path=None, host='127.0.0.1', port=8000, cache_size=32,
+                 compile_service=None):
+        """
+        Initialize the CV server.
+
+        Parameters
+        ----------
+        data_path : str or Path, optional
+            Path to the CV data JSON file. Default is 'data/cv-data.json'.
+        host : str, optional
+            Address to listen on. Default is '127.0.0.1'.
+        port : int, optional
+            Port to listen on. Default is 8000.
+        cache_size : int, optional
+            Number of rendered documents kept in memory. Default is 32.
+        compile_service : LatexCompileService, optional
+            Worker pool PDFs are compiled on. Default is a new pool.
+        """
+        self.data_path = Path(data_path) if data_path else DEFAULT_DATA_PATH
+        self.host = host
+        self.port = port
+        self.cache_size = cache_size
+        self.compile_service = compile_service or LatexCompileService()
+        # Generators share module-level caches, so renders run one at a time
+        self.render_executor = ThreadPoolExecutor(max_workers=1)
+        self.rendered = OrderedDict()
+        self.in_flight = {}
+        self._data_stat = None
+        self._data_digest = None
+        self._cv_data = None
+
+    def current_data(self):
+        """
+        Get the CV data and its digest, re-reading the file only if it changed.
+
+        Returns
+        -------
+        tuple
+            (digest, cv_data) for the current contents of the data file.
+        """
+        stat = self.data_path.stat()
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        if stat_key != self._data_stat:
+            raw = self.data_path.read_bytes()
+            self._data_digest = hashlib.sha256(raw).hexdigest()
+            self._cv_data = load_cv_data(self.data_path)
+            self._data_stat = stat_key
+        return self._data_digest, self._cv_data
+
+    def route(self, path):
+        """
+        Map a request path to a document or static file.
+
+        Parameters
+        ----------
+        path : str
+            The decoded request path.
+
+        Returns
+        -------
+        tuple or Path or None
+            (generator class, anonymous) for a rendered document, the file
+            for a static path, or None if nothing is served there.
+        """
+        if path in ('/', '/index.html'):
+            return HtmlCvGenerator, False
+        if path == '/cv.pdf':
+            return PdfCvGenerator, False
+        if path in ('/cv-anonymous.pdf', '/output/CV - Anonymous.pdf'):
+            return PdfCvGenerator, True
+        if path.startswith('/output/CV - ') and path.endswith('.pdf'):
+            return PdfCvGenerator, False
+
+        relative = Path(path.lstrip('/'))
+        if relative.parts and relative.parts[0] in STATIC_DIRS and '..' not in relative.parts:
+            static_path = PROJECT_ROOT / relative
+            if static_path.is_file():
+                return static_path
+        return None
+
+    def etag(self, generator_class, anonymous, data_digest):
+        """
+        Compute the strong ETag of a rendered document without rendering it.
+
+        Parameters
+        ----------
+        generator_class : type
+            The generator that renders the document.
+        anonymous : bool
+            Whether the document is anonymized.
+        data_digest : str
+            Digest of the CV data file.
+
+        Returns
+        -------
+        str
+            The quoted ETag.
+        """
+        digest = hashlib.sha256()
+        digest.update(generator_class.__name__.encode('utf-8'))
+        digest.update(generator_source_hash(generator_class).encode('utf-8'))
+        digest.update(template_loader(generator_class.TEMPLATE_SYNTAX).version().encode('utf-8'))
+        digest.update(data_digest.encode('utf-8'))
+        digest.update(b'anonymous' if anonymous else b'full')
+        if generator_class is HtmlCvGenerator:
+            # The HTML footer shows the generation date
+            digest.update(date.today().isoformat().encode('utf-8'))
+            # The header embeds the photo's variants, made from its source
+            digest.update(image_pipeline().source_hash(HtmlCvGenerator.PROFILE_IMAGE).encode('utf-8'))
+            for name in HTML_INPUTS:
+                digest.update(file_state(PROJECT_ROOT / name).encode('utf-8'))
+        return f'"{digest.hexdigest()[:32]}"'
+
+    async def render(self, etag, generator_class, anonymous, cv_data):
+        """
+        Get a rendered document body, rendering it at most once per ETag.
+
+        Parameters
+        ----------
+        etag : str
+            The document's ETag, used as its cache key.
+        generator_class : type
+            The generator that renders the document.
+        anonymous : bool
+            Whether the document is anonymized.
+        cv_data : CvData
+            The CV data to render.
+
+        Returns
+        -------
+        bytes
+            The rendered document.
+        """
+        if etag in self.rendered:
+            self.rendered.move_to_end(etag)
+            return self.rendered[etag]
+
+        # Merge concurrent requests for the same missing document
+        if etag not in self.in_flight:
+            self.in_flight[etag] = asyncio.ensure_future(
+                self._render(generator_class, anonymous, cv_data)
+            )
+        task = self.in_flight[etag]
+        try:
+            body = await asyncio.shield(task)
+        finally:
+            if task.done():
+                self.in_flight.pop(etag, None)
+
+        self.rendered[etag] = body
+        self.rendered.move_to_end(etag)
+        while len(self.rendered) > self.cache_size:
+            self.rendered.popitem(last=False)
+        return body
+
+    async def _render(self, generator_class, anonymous, cv_data):
+        generator = generator_class(anonymous=anonymous, cv_data=cv_data)
+        # Rendering can take seconds, e.g. the first encoding of the photo's
+        # variants, so it runs off the event loop
+        output = await asyncio.get_running_loop().run_in_executor(
+            self.render_executor, generator.render
+        )
+        content = output.getvalue()
+        if generator_class is not PdfCvGenerator:
+            return content.encode('utf-8')
+        # Compile on the worker pool so the event loop keeps serving
+        future = self.compile_service.submit(content, preamble=generator.preamble())
+        return await asyncio.wrap_future(future)
+
+    async def respond(self, method, path, headers):
+        """
+        Build the response to one request.
+
+        Parameters
+        ----------
+        method : str
+            The request method.
+        path : str
+            The decoded request path.
+        headers : dict
+            Request headers, with lower-case names.
+
+        Returns
+        -------
+        tuple
+            (status, response headers, body).
+        """
+        if method not in ('GET', 'HEAD'):
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'Allow': 'GET, HEAD'}, b''
+
+        target = self.route(path)
+        if target is None:
+            return HTTPStatus.NOT_FOUND, {'Content-Type': 'text/plain'}, b'Not found\n'
+
+        if isinstance(target, Path):
+            body = target.read_bytes()
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            content_type = mimetypes.guess_type(target.name)[0] or 'application/octet-stream'
+        else:
+            generator_class, anonymous = target
+            data_digest, cv_data = self.current_data()
+            etag = self.etag(generator_class, anonymous, data_digest)
+            content_type = ('application/pdf' if generator_class is PdfCvGenerator
+                            else 'text/html; charset=utf-8')
+            if not etag_matches(headers.get('if-none-match'), etag):
+                body = await self.render(etag, generator_class, anonymous, cv_data)
+
+        response_headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if etag_matches(headers.get('if-none-match'), etag):
+            return HTTPStatus.NOT_MODIFIED, response_headers, b''
+        response_headers['Content-Type'] = content_type
+        return HTTPStatus.OK, response_headers, body
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serve requests on one connection until the client closes it.
+
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+            The connection's read side.
+        writer : asyncio.StreamWriter
+            The connection's write side.
+
+        Returns
+        -------
+        None
+        """
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                        ConnectionError):
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    await self.send(writer, 'HEAD', HTTPStatus.BAD_REQUEST, {}, b'', False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ':' in line:
+                        name, value = line.split(':', 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version == 'HTTP/1.1')
+                try:
+                    status, response_headers, body = await self.respond(
+                        method, unquote(urlsplit(target).path), headers
+                    )
+                except (Exception, SystemExit) as e:
+                    print(f"Render failed for {target}: {e}")
+                    status, response_headers, body = (
+                        HTTPStatus.INTERNAL_SERVER_ERROR,
+                        {'Content-Type': 'text/plain'},
+                        b'Render failed\n'
+                    )
+                print(f"{method} {target} {status.value}")
+                await self.send(writer, method, status, response_headers, body, keep_alive)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def send(self, writer, method, status, headers, body, keep_alive):
+        """
+        Write one response.
+
+        Parameters
+        ----------
+        writer : asyncio.StreamWriter
+            The connection's write side.
+        method : str
+            The request method; HEAD responses have no body.
+        status : HTTPStatus
+            The response status.
+        headers : dict
+            Response headers.
+        body : bytes
+            The response body.
+        keep_alive : bool
+            Whether the connection stays open.
+
+        Returns
+        -------
+        None
+        """
+        lines = [f'HTTP/1.1 {status.value} {status.phrase}']
+        headers = dict(headers)
+        headers['Content-Length'] = str(len(body))
+        headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+        lines.extend(f'{name}: {value}' for name, value in headers.items())
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        if method != 'HEAD':
+            writer.write(body)
+        await writer.drain()
+
+    async def serve_forever(self):
+        """
+        Listen for connections until cancelled.
+
+        Returns
+        -------
+        None
+        """
+        server = await asyncio.start_server(
+            self.handle_connection, self.host, self.port, limit=MAX_HEADER_BYTES
+        )
+        print(f"Serving CV at http://{self.host}:{self.port}/ (Ctrl+C to stop)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.render_executor.shutdown()
+            self.compile_service.close()
+
+
+def file_state(path):
+    """
+    Describe a file by its modification time and size, without reading it.
+
+    Parameters
+    ----------
+    path : Path
+        The file.
+
+    Returns
+    -------
+    str
+        The path with its mtime and size, or marked missing.
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return f'{path}:missing'
+    return f'{path}:{stat.st_mtime_ns}:{stat.st_size}'
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Check an If-None-Match header against an ETag.
+
+    Parameters
+    ----------
+    if_none_match : str or None
+        The header value, a comma-separated list of ETags or '*'.
+    etag : str
+        The current quoted ETag.
+
+    Returns
+    -------
+    bool
+        True if the client's copy is current.
+    """
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Direct PDF CV Generator - generates CV as PDF without LaTeX.
+"""
+from pathlib import Path
+from abstract_cv_generator import AbstractCvGenerator
+from escaping import escape_layout
+from inline_markup import markup_layout
+from output_store import output_store
+from pdf_writer import BOLD, ITALIC, PdfDocument, TextFlow, parse_markup
+
+
+# Separators of the rows and cells of a table command's argument
+ROW_SEPARATOR = '\x1e'
+CELL_SEPARATOR = '\x1f'
+
+
+class DirectPdfCvGenerator(AbstractCvGenerator):
+    """
+    Generate CV as PDF by writing the PDF directly, without LaTeX.
+    
+    Sections are rendered from templates into simple layout commands, one
+    per line, which are then flowed onto A4 pages in the Helvetica core
+    fonts. The layout follows the LaTeX CV, with simpler typesetting (no
+    hyphenation or justification), and a document takes milliseconds
+    rather than a pdflatex run, for previews and large batches.
+    
+    Layout commands are a name and an optional argument:
+    
+    - title, centre: a large bold or small centred line
+    - heading: a section heading with a rule below it
+    - entry: a bold line, with aside text right-aligned beside it
+    - small, bullet: a wrapped paragraph or bullet point in small type
+    - table: rows of centred cells
+    - rule, space: a horizontal line, or vertical space in points
+    """
+    
+    TEMPLATE_SYNTAX = 'direct'
+    
+    # Page margin in points (0.5in, as in the LaTeX CV)
+    MARGIN = 36.0
+    
+    # Font sizes in points, matching the LaTeX CV's 11pt document
+    TITLE_SIZE = 14.4
+    HEADING_SIZE = 14.4
+    ENTRY_SIZE = 10.95
+    SMALL_SIZE = 10.0
+    
+    SECTION_DATA = {
+        'header': ('personal',),
+        'summary': ('personal',),
+        'experience': ('experience',),
+        'education': ('education',),
+        'skills': ('skills',),
+        'publications': ('publications',),
+        'awards': ('awards',),
+        'hobbies': ('hobbies',),
+        'footer': (),
+    }
+    
+    # Only the name in the header and the hidden jobs vary between variants
+    SECTION_FLAGS = {
+        'header': ('anonymous',),
+        'summary': (),
+        'experience': ('include_hidden',),
+        'education': (),
+        'skills': (),
+        'publications': (),
+        'awards': (),
+        'hobbies': (),
+        'footer': (),
+    }
+    
+    def __init__(self, anonymous=False, data_path=None, output_dir=None,
+                 cv_data=None, fragment_cache=None, tracer=None,
+                 include_hidden=False, section_store=None):
+        """
+        Initialize the direct PDF CV generator.
+        
+        Parameters
+        ----------
+        anonymous : bool, optional
+            If True, generates an anonymized CV without personal name. Default is False.
+        data_path : str or Path, optional
+            Path to the CV data JSON file. Default is 'data/cv-data.json'.
+        output_dir : str or Path, optional
+            Directory for the PDF. Default is 'output'.
+        cv_data : CvData or dict, optional
+            Already loaded CV data. If given, data_path is not read.
+        fragment_cache : FragmentCache, optional
+            Cache of rendered sections. Default is None (no caching).
+        tracer : Tracer, optional
+            Records the time and memory each build step takes. Default is None.
+        include_hidden : bool, optional
+            If True, include jobs marked hideOnPdf, and add ' (complete)' to
+            the file name. Default is False.
+        section_store : SectionStore, optional
+            Sections already rendered by other variants of the same CV.
+            Default is None.
+        """
+        super().__init__(anonymous, data_path, output_dir, cv_data, fragment_cache, tracer,
+                         section_store)
+        self.include_hidden = include_hidden
+    
+    def default_output_dir(self):
+        """
+        Get the default output directory for PDF output.
+        
+        Returns
+        -------
+        Path
+            The 'output' directory.
+        """
+        return Path('output')
+    
+    def cache_flags(self):
+        """
+        Get the generator options that change how sections are rendered.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        dict
+            Option names and values, included in fragment cache keys.
+        """
+        return {**super().cache_flags(), 'include_hidden': self.include_hidden}
+    
+    def escape_text(self, text):
+        """
+        Make text safe to use in a layout command.
+        
+        Control characters, which separate commands and mark inline
+        styles, are replaced with spaces. Nothing else needs escaping.
+        
+        Parameters
+        ----------
+        text : str or other
+            The text to escape. If not a string, will be converted to string.
+        
+        Returns
+        -------
+        str
+            The escaped text.
+        """
+        if not isinstance(text, str):
+            text = str(text)
+        return escape_layout(text)
+    
+    def format_links(self, text):
+        """
+        Format markdown-style inline markup for the PDF writer.
+        
+        Converts [link text](url) to a link annotation around link text, and
+        **bold** and *italic* to the matching fonts. The text must not be
+        escaped already.
+        
+        Parameters
+        ----------
+        text : str
+            The unescaped text, which may contain markup such as [text](url).
+        
+        Returns
+        -------
+        str
+            The escaped text with markup converted for the PDF writer.
+        """
+        if not isinstance(text, str):
+            text = str(text)
+        return markup_layout(text)
+    
+    def bold(self, text):
+        """Mark escaped text as bold."""
+        return f'{BOLD}{text}{BOLD}'
+    
+    def italic(self, text):
+        """Mark escaped text as italic."""
+        return f'{ITALIC}{text}{ITALIC}'
+    
+    def table(self, rows):
+        """
+        Join the cells of a table into one command argument.
+        
+        Parameters
+        ----------
+        rows : list of list of str
+            Escaped cell texts, row by row.
+        
+        Returns
+        -------
+        str
+            The rows joined with ROW_SEPARATOR, cells with CELL_SEPARATOR.
+        """
+        return ROW_SEPARATOR.join(CELL_SEPARATOR.join(row) for row in rows)
+    
+    def generate_header(self):
+        """
+        Generate the title and contact details.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        self.output.write(self.render_template('header'))
+    
+    def generate_summary(self):
+        """
+        Generate professional summary section.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        self.output.write(self.render_template('summary'))
+    
+    def generate_experience(self):
+        """
+        Generate work experience section.
+        
+        Lists each position with its dates and bulleted highlights. Jobs
+        marked hideOnPdf are left out unless include_hidden is set.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        self.output.write(self.render_template('experience'))
+    
+    def generate_education(self):
+        """
+        Generate education section, with a table of grades per qualification.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        self.output.write(self.render_template('education'))
+    
+    def generate_skills(self):
+        """
+        Generate skills section as a comma-separated list.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        self.output.write(self.render_template('skills'))
+    
+    def generate_publications(self):
+        """
+        Generate publications section. Skipped if there are no publications.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        self.output.write(self.render_template('publications'))
+    
+    def generate_awards(self):
+        """
+        Generate awards section. Skipped if there are no awards.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        self.output.write(self.render_template('awards'))
+    
+    def generate_hobbies(self):
+        """
+        Generate interests section as bullet points. Skipped if there are none.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        self.output.write(self.render_template('hobbies'))
+    
+    def generate_footer(self):
+        """
+        Generate footer - nothing for a direct PDF.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        pass
+    
+    def layout(self):
+        """
+        Flow the rendered layout commands onto pages.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        PdfDocument
+            The laid out document.
+        
+        Raises
+        ------
+        ValueError
+            If a command is unknown.
+        """
+        title = 'Curriculum Vitae'
+        if not self.anonymous:
+            title += f' - {self.cv_data.personal.name}'
+        document = PdfDocument(title)
+        flow = TextFlow(document, self.MARGIN)
+        for line in self.content.split('\n'):
+            command, _, argument = line.partition(' ')
+            if not command:
+                continue
+            if command == 'title':
+                flow.paragraph(parse_markup(self.bold(argument)), self.TITLE_SIZE, align='centre')
+            elif command == 'centre':
+                flow.paragraph(parse_markup(argument), self.SMALL_SIZE, align='centre')
+            elif command == 'heading':
+                # Keep the heading with at least two lines of what follows
+                flow.space(12)
+                flow.ensure(self.HEADING_SIZE * 1.2 + self.SMALL_SIZE * 3.6)
+                flow.paragraph(parse_markup(self.bold(argument)), self.HEADING_SIZE)
+                flow.space(1)
+                flow.rule()
+                flow.space(5.7)
+            elif command == 'entry':
+                flow.ensure(self.ENTRY_SIZE * 1.2 + self.SMALL_SIZE * 2.4)
+                flow.paragraph(parse_markup(self.bold(argument)), self.ENTRY_SIZE)
+            elif command == 'aside':
+                flow.aside(parse_markup(argument), self.SMALL_SIZE)
+            elif command == 'small':
+                flow.paragraph(parse_markup(argument), self.SMALL_SIZE)
+            elif command == 'bullet':
+                flow.paragraph(parse_markup(argument), self.SMALL_SIZE, indent=18, bullet='•')
+            elif command == 'table':
+                rows = [row.split(CELL_SEPARATOR) for row in argument.split(ROW_SEPARATOR)]
+                flow.table(rows, self.SMALL_SIZE)
+            elif command == 'rule':
+                flow.space(2)
+                flow.rule()
+            elif command == 'space':
+                flow.space(float(argument))
+            else:
+                raise ValueError(f"Unknown layout command '{command}'")
+        return document
+    
+    def write_output(self):
+        """
+        Lay out the CV and write the PDF.
+        
+        The output PDF is named like the LaTeX one with ' (direct)' added,
+        e.g. "CV - Tom Bower (direct).pdf", so both can be built together.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        if self.anonymous:
+            stem = 'CV - Anonymous'
+        else:
+            stem = f'CV - {self.cv_data.personal.name}'
+        if self.include_hidden:
+            stem += ' (complete)'
+        target_pdf = self.output_dir / f'{stem} (direct).pdf'
+        
+        with self.tracer.span('layout'):
+            document = self.layout()
+        output_store(self.output_dir).publish(target_pdf, document.to_bytes())
+        print(f"✓ PDF generated successfully: {target_pdf} ({len(document.pages)} page(s))")
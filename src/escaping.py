@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Text escaping for LaTeX, HTML and direct PDF layout output.
+
+Each format is escaped with str.translate or a short chain of str.replace
+calls, which run in C however many special characters a string has, and
+results are memoized so values repeated across sections, variants and
+batch jobs are only escaped once per process.
+"""
+import re
+from functools import lru_cache
+
+
+# Maximum number of escaped strings remembered per format
+ESCAPE_CACHE_SIZE = 8192
+
+# Escape tables are applied in order (see _compile_escaper), so no
+# replacement may contain a character listed after it, other than '\\'.
+
+# Characters with special meaning in LaTeX and their escaped forms
+LATEX_ESCAPES = {
+    '\\': r'\textbackslash{}',
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '^': r'\textasciicircum{}',
+}
+
+# Characters to escape in a \href URL: hyperref takes the rest literally,
+# and characters that cannot appear in TeX even there are percent-encoded
+LATEX_URL_ESCAPES = {
+    '%': r'\%',
+    '#': r'\#',
+    '\\': r'\%5C',
+    '{': r'\%7B',
+    '}': r'\%7D',
+}
+
+# Characters with special meaning in HTML and their entities
+HTML_ESCAPES = {
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#39;',
+}
+
+# Control characters, which delimit layout commands and mark inline styles
+# in direct PDF layout, and become spaces in text
+LAYOUT_ESCAPES = {chr(code): ' ' for code in range(32)}
+
+
+def _compile_escaper(escapes):
+    """
+    Build an escaping function from a character table.
+
+    A table whose replacements are all single characters is applied with
+    str.translate, after a search for any of them. Otherwise each special
+    character is replaced with str.replace, in table order, so no
+    replacement may contain a character listed after it. Backslashes,
+    which most escaped forms contain, are handled by splitting the text on
+    them instead, so the backslashes inserted by other replacements are
+    never escaped again. A per-match callback would run Python code for
+    every special character, which is several times slower on text dense
+    in them.
+
+    Parameters
+    ----------
+    escapes : dict
+        Mapping of special characters to their escaped forms.
+
+    Returns
+    -------
+    callable
+        Function taking a string and returning it escaped. Strings without
+        any special characters are returned unchanged without copying.
+
+    Raises
+    ------
+    ValueError
+        If a replacement contains a character replaced after it.
+    """
+    search = re.compile('[' + re.escape(''.join(escapes)) + ']').search
+
+    if all(len(replacement) == 1 for replacement in escapes.values()):
+        table = str.maketrans(escapes)
+
+        def escape(text):
+            if search(text) is None:
+                return text
+            return text.translate(table)
+
+        return escape
+
+    backslash = escapes.get('\\')
+    replacements = [(char, escaped) for char, escaped in escapes.items() if char != '\\']
+    for i, (char, escaped) in enumerate(replacements):
+        for later, _ in replacements[i + 1:]:
+            if later in escaped:
+                raise ValueError(f"Escape of {char!r} contains {later!r}, which is replaced later")
+
+    def replace_all(text):
+        for char, escaped in replacements:
+            text = text.replace(char, escaped)
+        return text
+
+    def escape(text):
+        if backslash is not None and '\\' in text:
+            return backslash.join(map(replace_all, text.split('\\')))
+        # As replace_all, without another call on the common path
+        for char, escaped in replacements:
+            text = text.replace(char, escaped)
+        return text
+
+    return escape
+
+
+_escape_latex = _compile_escaper(LATEX_ESCAPES)
+_escape_latex_url = _compile_escaper(LATEX_URL_ESCAPES)
+_escape_html = _compile_escaper(HTML_ESCAPES)
+_escape_layout = _compile_escaper(LAYOUT_ESCAPES)
+
+
+@lru_cache(maxsize=ESCAPE_CACHE_SIZE)
+def escape_latex(text):
+    """
+    Escape special LaTeX characters in one pass.
+
+    Parameters
+    ----------
+    text : str
+        The text to escape.
+
+    Returns
+    -------
+    str
+        The escaped text safe for LaTeX.
+    """
+    return _escape_latex(text)
+
+
+@lru_cache(maxsize=ESCAPE_CACHE_SIZE)
+def escape_latex_url(text):
+    """
+    Escape a URL for the first argument of LaTeX's \\href.
+
+    Parameters
+    ----------
+    text : str
+        The URL.
+
+    Returns
+    -------
+    str
+        The URL with '%' and '#' escaped, and backslashes and braces
+        percent-encoded. Other characters, e.g. '_' and '&', are kept.
+    """
+    return _escape_latex_url(text)
+
+
+@lru_cache(maxsize=ESCAPE_CACHE_SIZE)
+def escape_html(text):
+    """
+    Escape HTML special characters in one pass.
+
+    Parameters
+    ----------
+    text : str
+        The text to escape.
+
+    Returns
+    -------
+    str
+        The escaped text safe for HTML.
+    """
+    return _escape_html(text)
+
+
+@lru_cache(maxsize=ESCAPE_CACHE_SIZE)
+def escape_layout(text):
+    """
+    Replace control characters with spaces for direct PDF layout.
+
+    Parameters
+    ----------
+    text : str
+        The text to escape.
+
+    Returns
+    -------
+    str
+        The text, safe to use as a layout command argument.
+    """
+    return _escape_layout(text)
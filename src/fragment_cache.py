@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Fragment Cache - reuses rendered sections whose data has not changed.
+"""
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from cv_model import Record
+
+
+# Directory of the source modules rendering depends on
+SRC_DIR = Path(__file__).resolve().parent
+
+# Default directory for cached fragments
+DEFAULT_CACHE_DIR = SRC_DIR.parent / 'output' / '.fragment-cache'
+
+
+@lru_cache(maxsize=None)
+def generator_source_hash(generator_class):
+    """
+    Hash the source a generator class renders with.
+
+    Rendering depends on more than the generator's own modules (escaping,
+    inline markup, the template engine and the data model, among others),
+    so every module in src/ is hashed. Cached fragments are keyed on this,
+    so editing any of them invalidates the fragments rendered before.
+    The hash is kept per class: watch mode reloads the generators after
+    any module they depend on, which gives a new class to hash again.
+
+    Parameters
+    ----------
+    generator_class : type
+        The generator class.
+
+    Returns
+    -------
+    str
+        Hex digest of the class name and the source files in src/.
+    """
+    digest = hashlib.sha256()
+    digest.update(f'{generator_class.__module__}.{generator_class.__qualname__}\0'.encode('utf-8'))
+    for path in sorted(SRC_DIR.glob('*.py')):
+        digest.update(path.name.encode('utf-8') + b'\0')
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _json_default(value):
+    """Encode CV model records by their JSON form, and anything else as a string."""
+    if isinstance(value, Record):
+        return value.as_dict()
+    return str(value)
+
+
+class FragmentCache:
+    """
+    On-disk cache of rendered section fragments.
+
+    Each fragment is keyed by a hash of the generator class and the source
+    in src/, the templates, the section name, the generator flags the section depends on, and the parts
+    of the CV data the section reads. A section is only re-rendered when one
+    of those changes.
+    """
+
+    def __init__(self, cache_dir=None):
+        """
+        Initialize the fragment cache.
+
+        Parameters
+        ----------
+        cache_dir : str or Path, optional
+            Directory fragments are stored in. Default is 'output/.fragment-cache'
+            in the project root.
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, generator, section, data_keys):
+        """
+        Compute the cache key for one section of a generator.
+
+        Parameters
+        ----------
+        generator : AbstractCvGenerator
+            The generator rendering the section, with CV data loaded.
+        section : str
+            The section name, e.g. 'experience'.
+        data_keys : tuple of str
+            Top-level CV data keys the section reads.
+
+        Returns
+        -------
+        str
+            Hex digest identifying the section's inputs.
+        """
+        generator_class = generator.__class__
+        inputs = {
+            'generator': f'{generator_class.__module__}.{generator_class.__qualname__}',
+            'source': generator_source_hash(generator_class),
+            'section': section,
+            'flags': generator.section_flags(section),
+            'templates': generator.templates.version(),
+            'data': {key: getattr(generator.cv_data, key) for key in data_keys},
+        }
+        encoded = json.dumps(inputs, sort_keys=True, default=_json_default)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Look up a cached fragment.
+
+        Counts a hit or a miss.
+
+        Parameters
+        ----------
+        key : str
+            The cache key from key().
+
+        Returns
+        -------
+        str or None
+            The cached fragment, or None if it is not cached.
+        """
+        path = self.cache_dir / f'{key}.frag'
+        try:
+            fragment = path.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return fragment
+
+    def put(self, key, fragment):
+        """
+        Store a rendered fragment.
+
+        Parameters
+        ----------
+        key : str
+            The cache key from key().
+        fragment : str
+            The rendered section.
+
+        Returns
+        -------
+        None
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_dir / f'{key}.{os.getpid()}.tmp'
+        tmp_path.write_text(fragment, encoding='utf-8')
+        tmp_path.replace(self.cache_dir / f'{key}.frag')
+
+    def stats_line(self):
+        """
+        Describe the cache hits and misses so far.
+
+        Returns
+        -------
+        str
+            A one-line summary of hits and misses.
+        """
+        hits = f"{self.hits} hit" + ("" if self.hits == 1 else "s")
+        misses = f"{self.misses} miss" + ("" if self.misses == 1 else "es")
+        return f"Fragment cache: {hits}, {misses}"
+
+
+class SectionStore:
+    """
+    In-memory store of sections rendered for one build, shared by variants.
+
+    Variants of a CV differ in a few generator flags, which most sections do
+    not read. Sections are stored under the generator class, the section,
+    the CV data object and the flags the section depends on, so a section
+    is rendered once for every variant that agrees on those flags. Unlike
+    FragmentCache, keys are not hashes of the data, so lookups cost nothing
+    however large the CV is; the store lives only as long as one build.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty section store.
+        """
+        self.fragments = {}
+        self.hits = 0
+        self.misses = 0
+        # Keys hold the identity of the CV data, which must stay alive
+        self._models = {}
+
+    def key(self, generator, section):
+        """
+        Compute the store key for one section of a generator.
+
+        Parameters
+        ----------
+        generator : AbstractCvGenerator
+            The generator rendering the section, with CV data loaded.
+        section : str
+            The section name, e.g. 'experience'.
+
+        Returns
+        -------
+        tuple
+            Key identifying the section's inputs.
+        """
+        self._models[id(generator.cv_data)] = generator.cv_data
+        flags = generator.section_flags(section)
+        return (
+            generator.__class__,
+            section,
+            id(generator.cv_data),
+            tuple(sorted(flags.items())),
+        )
+
+    def get(self, key):
+        """
+        Look up a shared section.
+
+        Counts a hit or a miss.
+
+        Parameters
+        ----------
+        key : tuple
+            The store key from key().
+
+        Returns
+        -------
+        str or None
+            The rendered section, or None if no variant has rendered it yet.
+        """
+        fragment = self.fragments.get(key)
+        if fragment is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return fragment
+
+    def put(self, key, fragment):
+        """
+        Store a rendered section.
+
+        Parameters
+        ----------
+        key : tuple
+            The store key from key().
+        fragment : str
+            The rendered section.
+
+        Returns
+        -------
+        None
+        """
+        self.fragments[key] = fragment
+
+    def stats_line(self):
+        """
+        Describe how many sections were shared between variants.
+
+        Returns
+        -------
+        str
+            A one-line summary of shared and rendered sections.
+        """
+        return f"Shared sections: {self.hits} reused, {self.misses} rendered once"
@@ -2,9 +2,21 @@
 """
 HTML CV Generator - generates CV as static HTML.
 """
+import hashlib
 import re
 from datetime import date
+from pathlib import Path
 from abstract_cv_generator import AbstractCvGenerator
+from escaping import escape_html
+from inline_markup import markup_html
+from icon_font import CDN_STYLESHEET, ICON_STYLESHEET, collect_icons, covered_icons
+from image_pipeline import image_pipeline, picture_html
+from minify import minify_css, minify_html, publish, unpublish
+from output_store import output_store
+
+
+# Project root, which the stylesheet path is relative to
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
 
 class HtmlCvGenerator(AbstractCvGenerator):
@@ -16,7 +28,52 @@ class HtmlCvGenerator(AbstractCvGenerator):
     design with a sidebar for contact and skills.
     """
     
-    def __init__(self, anonymous=False):
+    TEMPLATE_SYNTAX = 'html'
+    
+    # Stylesheet linked from the page, and its minified copy
+    STYLESHEET = 'css/static-style.css'
+    MINIFIED_STYLESHEET = 'css/static-style.min.css'
+    
+    # Profile photo and the width in CSS pixels it is shown at
+    PROFILE_IMAGE = 'assets/images/profile.png'
+    PROFILE_WIDTH = 150
+    
+    # Long sections that can be split into pages, and their headings
+    PAGED_SECTIONS = {
+        'experience': 'Experience',
+        'publications': 'Publications',
+    }
+    
+    # Directory for the entries loaded by 'show more', relative to the output
+    FRAGMENT_DIR = 'fragments'
+    
+    # The footer is not listed as it includes the generation date
+    SECTION_DATA = {
+        'header': ('personal', 'skills'),
+        'summary': (),
+        'experience': ('experience',),
+        'education': ('education',),
+        'skills': (),
+        'publications': ('publications',),
+        'awards': ('awards',),
+        'hobbies': ('hobbies',),
+    }
+    
+    # Only the header and the paged sections read the generator's options
+    SECTION_FLAGS = {
+        'header': ('minify', 'profile_picture', 'icon_stylesheet'),
+        'summary': (),
+        'experience': ('page_size',),
+        'education': (),
+        'skills': (),
+        'publications': ('page_size',),
+        'awards': (),
+        'hobbies': (),
+    }
+    
+    def __init__(self, anonymous=False, data_path=None, output_dir=None,
+                 cv_data=None, fragment_cache=None, tracer=None, minify=False,
+                 section_store=None, page_size=None):
         """
         Initialize the HTML CV generator.
         
@@ -24,15 +81,151 @@ class HtmlCvGenerator(AbstractCvGenerator):
         ----------
         anonymous : bool, optional
             If True, generates an anonymized CV without personal name. Default is False.
+        data_path : str or Path, optional
+            Path to the CV data JSON file. Default is 'data/cv-data.json'.
+        output_dir : str or Path, optional
+            Directory to write index.html to. Default is the current directory.
+        cv_data : CvData or dict, optional
+            Already loaded CV data. If given, data_path is not read.
+        fragment_cache : FragmentCache, optional
+            Cache of rendered sections. Default is None (no caching).
+        tracer : Tracer, optional
+            Records the time and memory each build step takes. Default is None.
+        minify : bool, optional
+            If True, minify the HTML and stylesheet and write gzip and
+            brotli compressed copies of each. Default is False.
+        section_store : SectionStore, optional
+            Sections already rendered by other variants of the same CV.
+            Default is None.
+        page_size : int, optional
+            If given, only the first page_size entries of each section in
+            PAGED_SECTIONS are in index.html; the rest are written to
+            fragment files loaded on scroll or 'show more', and to
+            standalone pages for browsers without JavaScript. Default is
+            None (every entry inline).
+        
+        Raises
+        ------
+        ValueError
+            If page_size is less than 1.
+        """
+        if page_size is not None and page_size < 1:
+            raise ValueError(f"page_size must be at least 1, got {page_size}")
+        super().__init__(anonymous, data_path, output_dir, cv_data, fragment_cache, tracer,
+                         section_store)
+        self.minify = minify
+        self.page_size = page_size
+        # The section and page being rendered while rendering a later page
+        self.paging = None
+        self._icon_stylesheet = None
+        self._profile_picture = None
+        self._fragments = {}
+    
+    def cache_flags(self):
+        """
+        Get the generator options that change how sections are rendered.
+        
+        Minifying links the header to the minified stylesheet, and the
+        header embeds the profile picture variants, which change with the
+        image file, and the icon stylesheet, which depends on whether the
+        built icon subset covers the icons used. The page size decides
+        which entries of the paged sections are inline.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        dict
+            Option names and values, included in fragment cache keys.
+        """
+        return {
+            **super().cache_flags(),
+            'minify': self.minify,
+            'page_size': self.page_size,
+            'profile_picture': self.profile_picture(),
+            'icon_stylesheet': self.icon_stylesheet_href(),
+        }
+    
+    def stylesheet_href(self):
+        """
+        Get the stylesheet the page links to.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        str
+            The minified stylesheet when minifying, otherwise the original.
+        """
+        return self.MINIFIED_STYLESHEET if self.minify else self.STYLESHEET
+    
+    def profile_picture(self):
+        """
+        Get the markup of the profile photo.
+        
+        The photo is offered in every size and format the image pipeline
+        produced, with its width and height so the layout does not shift
+        while it loads. It is at the top of the sidebar, so it is not
+        loaded lazily.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        str
+            A picture element, or an img element if the photo has no variants.
         """
-        super().__init__(anonymous)
+        if self._profile_picture is None:
+            variants = image_pipeline().variants(self.PROFILE_IMAGE, self.PROFILE_WIDTH)
+            self._profile_picture = picture_html(
+                variants, 'Profile Photo', 'profile-image', self.PROFILE_WIDTH
+            )
+        return self._profile_picture
+    
+    def icon_stylesheet_href(self):
+        """
+        Get the icon stylesheet the page links to.
+        
+        The self-hosted subset built by build_icons.py is used if it covers
+        every icon in the data and templates. Otherwise the full Font
+        Awesome stylesheet is loaded from the CDN, with a warning if the
+        subset is out of date.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        str
+            The stylesheet URL.
+        """
+        if self._icon_stylesheet is None:
+            self._icon_stylesheet = CDN_STYLESHEET
+            covered = covered_icons(PROJECT_ROOT / ICON_STYLESHEET)
+            if covered is not None:
+                missing = set(collect_icons(self.cv_data, self.templates.template_dir)) - covered
+                if missing:
+                    print(f"Warning: {ICON_STYLESHEET} lacks "
+                          f"{', '.join(sorted('fa-' + name for name in missing))}; "
+                          "run build_icons.py to rebuild it. Using the CDN stylesheet.")
+                else:
+                    self._icon_stylesheet = ICON_STYLESHEET
+        return self._icon_stylesheet
     
     def escape_text(self, text):
         """
         Escape HTML special characters.
         
         Escapes characters that have special meaning in HTML to ensure they
-        are rendered correctly and safely.
+        are rendered correctly and safely. Escaping is done in a single pass
+        and is memoized.
         
         Parameters
         ----------
@@ -46,48 +239,191 @@ class HtmlCvGenerator(AbstractCvGenerator):
         """
         if not isinstance(text, str):
             text = str(text)
-        
-        replacements = {
-            '&': '&amp;',
-            '<': '&lt;',
-            '>': '&gt;',
-            '"': '&quot;',
-            "'": '&#39;',
-        }
-        result = text
-        for char, replacement in replacements.items():
-            result = result.replace(char, replacement)
-        return result
+        return escape_html(text)
     
     def format_links(self, text):
         """
-        Format markdown-style links for HTML.
+        Format markdown-style inline markup for HTML.
         
-        Converts [link text](url) to <a href="url" target="_blank">link text</a>.
+        Converts [link text](url) to <a href="url" target="_blank">link text</a>,
+        **bold** to <strong>, *italic* to <em> and `code` to <code>, and
+        escapes the rest. The text must not be escaped already.
         
         Parameters
         ----------
         text : str
-            The text containing markdown-style links [text](url).
+            The unescaped text, which may contain markup such as [text](url).
         
         Returns
         -------
         str
-            The text with links converted to HTML <a> tags.
+            The escaped text with markup converted to HTML elements.
         """
         if not isinstance(text, str):
             text = str(text)
+        return markup_html(text)
+    
+    def generation_date(self):
+        """
+        Get the date shown in the footer.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        str
+            Today's date in ISO format.
+        """
+        return date.today().strftime('%Y-%m-%d')
+    
+    def page_count(self, section):
+        """
+        Count the pages a section's entries are split into.
+        
+        Parameters
+        ----------
+        section : str
+            A section in PAGED_SECTIONS.
+        
+        Returns
+        -------
+        int
+            The number of pages, 1 when not paginating.
+        """
+        entries = getattr(self.cv_data, section)
+        if not self.page_size or not entries:
+            return 1
+        return -(-len(entries) // self.page_size)
+    
+    def current_page(self, section):
+        """
+        Get the page of a section being rendered.
+        
+        Parameters
+        ----------
+        section : str
+            A section in PAGED_SECTIONS.
+        
+        Returns
+        -------
+        int
+            The page number, counting from 1 for the page in index.html.
+        """
+        if self.paging is not None and self.paging['section'] == section:
+            return self.paging['page']
+        return 1
+    
+    def entries(self, section):
+        """
+        Get the entries of a section on the page being rendered.
+        
+        Parameters
+        ----------
+        section : str
+            A section in PAGED_SECTIONS.
+        
+        Returns
+        -------
+        tuple
+            Every entry when not paginating, otherwise the current page's.
+        """
+        entries = getattr(self.cv_data, section)
+        if not self.page_size:
+            return entries
+        start = (self.current_page(section) - 1) * self.page_size
+        return entries[start:start + self.page_size]
+    
+    def page_href(self, section, page):
+        """
+        Get the link to a standalone page of a section.
+        
+        Parameters
+        ----------
+        section : str
+            A section in PAGED_SECTIONS.
+        page : int
+            The page number; page 1 is index.html.
+        
+        Returns
+        -------
+        str
+            The page's file name, relative to index.html.
+        """
+        return 'index.html' if page <= 1 else f'{section}-{page}.html'
+    
+    def more_link(self, section):
+        """
+        Get the 'show more' link after the entries of the current page.
+        
+        The link leads to the next standalone page, so it works without
+        JavaScript; the footer script instead loads the fragment it names
+        in place of the link.
+        
+        Parameters
+        ----------
+        section : str
+            A section in PAGED_SECTIONS.
+        
+        Returns
+        -------
+        str
+            The link, or '' on the last page.
+        """
+        page = self.current_page(section)
+        pages = self.page_count(section)
+        if page >= pages:
+            return ''
+        remaining = len(getattr(self.cv_data, section)) - page * self.page_size
+        title = self.PAGED_SECTIONS[section].lower()
+        return (
+            f'<p class="show-more"><a href="{self.page_href(section, page + 1)}" '
+            f'data-fragment="{self.fragment(section, page + 1)[0]}">'
+            f'Show more {title} ({remaining} more)</a></p>'
+        )
+    
+    def fragment(self, section, page):
+        """
+        Render the entries of a later page of a section as a fragment.
+        
+        Fragment files are named by a hash of their contents, so they can
+        be cached indefinitely. A fragment ends with the link to the next
+        one, so fragments are rendered from the last page back.
         
-        # Pattern: [text](url)
-        # Group 1: link text, Group 2: URL
-        def replace_link(match):
-            link_text = match.group(1)
-            url = match.group(2)
-            escaped_text = self.escape_text(link_text)
-            escaped_url = self.escape_text(url)
-            return f'<a href="{escaped_url}" target="_blank" rel="noopener">{escaped_text}</a>'
+        Parameters
+        ----------
+        section : str
+            A section in PAGED_SECTIONS.
+        page : int
+            The page number, from 2.
         
-        return re.sub(r'\[([^\]]+)\]\(([^\)]+)\)', replace_link, text)
+        Returns
+        -------
+        tuple of str
+            (fragment path relative to index.html, fragment HTML).
+        """
+        key = (section, page)
+        if key not in self._fragments:
+            html = self._render_page(section, page, f'{section}-entries')
+            digest = hashlib.sha256(html.encode('utf-8')).hexdigest()[:10]
+            path = f'{self.FRAGMENT_DIR}/{section}-{page}-{digest}.html'
+            self._fragments[key] = (path, html)
+        return self._fragments[key]
+    
+    def _render_page(self, section, page, name):
+        """Render a template while a later page of a section is current."""
+        paging = self.paging
+        self.paging = {
+            'section': section,
+            'page': page,
+            'pages': self.page_count(section),
+            'title': self.PAGED_SECTIONS[section],
+        }
+        try:
+            return self.render_template(name)
+        finally:
+            self.paging = paging
     
     def generate_header(self):
         """
@@ -105,95 +441,7 @@ class HtmlCvGenerator(AbstractCvGenerator):
         -------
         None
         """
-        personal = self.cv_data['personal']
-        
-        # Social links HTML
-        social_links = ''.join([
-            f'<a href="{link["url"]}" target="_blank" rel="noopener" '
-            f'class="social-link" title="{self.escape_text(link["name"])}">'
-            f'<i class="{link["icon"]}"></i></a>'
-            for link in personal['social']
-        ])
-        
-        # Skills HTML
-        skills_html = ''.join([
-            f'<li>{self.escape_text(skill)}</li>'
-            for skill in self.cv_data['skills']
-        ])
-        
-        self.content = (
-            "<!DOCTYPE html>" + "\n"
-            '<html lang="en">' + "\n"
-            '<head>' + "\n"
-            '  <!-- Google tag (gtag.js) -->' + '\n'
-            '  <script async src="https://www.googletagmanager.com/gtag/js?id=G-PK6FZXSTHT"></script>' + "\n"
-            '  <script>' + "\n"
-            '    window.dataLayer = window.dataLayer || [];' + "\n"
-            '    function gtag(){dataLayer.push(arguments);}' + "\n"
-            '    gtag(\'js\', new Date());' + "\n"
-            '    gtag(\'config\', \'G-PK6FZXSTHT\');'  + "\n"
-            '  </script>' + "\n"
-            '  <meta charset="UTF-8">' + "\n"
-            '<meta name="viewport" '
-            'content="width=device-width, initial-scale=1.0">' + "\n"
-            f"  <title>{self.escape_text(personal['name'])} - CV</title>" + "\n"
-            '<link rel="stylesheet" '
-            'href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.0/'
-            'css/all.min.css">' + "\n"
-            '  <link rel="stylesheet" href="css/static-style.css">' + "\n"
-            "</head>" + "\n"
-            "<body>" + "\n"
-            '  <header class="header">' + "\n"
-            f"    <h1>{self.escape_text(personal['name'])}</h1>" + "\n"
-            '    <div class="header-controls">' + "\n"
-            '      <a href="output/CV%20-%20Thomas%20Bower.pdf" '
-            'class="pdf-download" download="CV - Thomas Bower.pdf">'
-            '<i class="fas fa-file-pdf"></i> Download PDF</a>' + "\n"
-            '      <button id="darkModeBtn" class="dark-mode-button" '
-            'title="Toggle dark mode"><i class="fas fa-moon"></i></button>' + "\n"
-            "    </div>" + "\n"
-            "  </header>" + "\n"
-            "\n"
-            '  <main class="cv-container">' + "\n"
-            '    <aside class="sidebar">' + "\n"
-            '      <div class="profile-image-section">' + "\n"
-            '        <img src="assets/images/profile.png" '
-            'alt="Profile Photo" class="profile-image">' + "\n"
-            "      </div>" + "\n"
-            "      " + "\n"
-            '      <section class="profile-section">' + "\n"
-            "        <h2>Profile</h2>" + "\n"
-            f'        <p class="summary">'
-            f'{self.escape_text(personal["summary"])}</p>' + "\n"
-            "      </section>" + "\n"
-            "\n"
-            '      <section class="contact-section">' + "\n"
-            "        <h2>Contact</h2>" + "\n"
-            '        <ul class="contact-list">' + "\n"
-            f'          <li><i class="fas fa-envelope"></i> '
-            f'<a href="mailto:{personal["email"]}">'
-            f'{self.escape_text(personal["email"])}</a></li>' + "\n"
-            f'          <li><i class="fas fa-phone"></i> '
-            f'<a href="tel:{personal["phone"]}">'
-            f'{self.escape_text(personal["phone"])}</a></li>' + "\n"
-            f'          <li><i class="fas fa-map-marker-alt"></i> '
-            f'{self.escape_text(personal["location"])}</li>' + "\n"
-            "        </ul>" + "\n"
-            '        <div class="social-links">' + "\n"
-            f"          {social_links}" + "\n"
-            "        </div>" + "\n"
-            "      </section>" + "\n"
-            "\n"
-            '      <section class="skills-section">' + "\n"
-            "        <h2>Skills</h2>" + "\n"
-            '        <ul class="skills-list">' + "\n"
-            f"          {skills_html}" + "\n"
-            "        </ul>" + "\n"
-            "      </section>" + "\n"
-            "    </aside>" + "\n"
-            "\n"
-            '    <article class="main-content">' + "\n"
-        )
+        self.output.write(self.render_template('header'))
     
     def generate_summary(self):
         """
@@ -227,45 +475,7 @@ class HtmlCvGenerator(AbstractCvGenerator):
         -------
         None
         """
-        self.content += (
-            '      <section class="experience-section">' + "\n"
-            "        <h2>Experience</h2>" + "\n"
-            '        <div class="experience-list">' + "\n"
-            "          " + "\n"
-        )
-        
-        for job in self.cv_data['experience']:
-            highlights = ''.join([
-                f'<li>{self.format_links(self.escape_text(h))}</li>'
-                for h in job['highlights']
-            ])
-            
-            self.content += (
-                '        <div class="job-card">' + "\n"
-                '          <div class="job-header">' + "\n"
-                f'            <div class="job-title"><i class="{job["icon"]}">'
-                f'</i> {self.escape_text(job["title"])}</div>' + "\n"
-                "          </div>" + "\n"
-                '          <div class="job-meta">' + "\n"
-                f'            <p class="job-company">'
-                f'{self.escape_text(job["company"])}, '
-                f'{self.escape_text(job["location"])}</p>' + "\n"
-                f'            <span class="job-dates">'
-                f'{self.escape_text(job["startDate"])} - '
-                f'{self.escape_text(job["endDate"])}</span>' + "\n"
-                "          </div>" + "\n"
-                f'          <ul class="job-highlights">' + "\n"
-                f"            {highlights}" + "\n"
-                "          </ul>" + "\n"
-                "        </div>" + "\n"
-                "        " + "\n"
-            )
-        
-        self.content += (
-            "        </div>" + "\n"
-            "      </section>" + "\n"
-            "\n"
-        )
+        self.output.write(self.render_template('experience'))
     
     def generate_education(self):
         """
@@ -282,41 +492,7 @@ class HtmlCvGenerator(AbstractCvGenerator):
         -------
         None
         """
-        self.content += (
-            '      <section class="education-section">' + "\n"
-            "        <h2>Education</h2>" + "\n"
-            '        <div class="education-list">' + "\n"
-            "          " + "\n"
-        )
-        
-        for edu in self.cv_data['education']:
-            details_html = ""
-            if 'details' in edu and edu['details']:
-                details_html = ''.join([
-                    f"<li><strong>{self.escape_text(d['subject'])}</strong>: "
-                    f"{self.escape_text(d['grade'])}</li>"
-                    for d in edu['details']
-                ])
-                details_html = f"<ul class='education-details'>{details_html}</ul>"
-            
-            self.content += (
-                '        <div class="education-item">' + "\n"
-                f'          <div class="edu-degree">'
-                f'{self.escape_text(edu["degree"])}</div>' + "\n"
-                f'          <div class="edu-institution">'
-                f'{self.escape_text(edu["institution"])}</div>' + "\n"
-                f'          <div class="edu-years">'
-                f'{self.escape_text(edu["years"])}</div>' + "\n"
-                f"          {details_html}" + "\n"
-                "        </div>" + "\n"
-                "        " + "\n"
-            )
-        
-        self.content += (
-            "        </div>" + "\n"
-            "      </section>" + "\n"
-            "\n"
-        )
+        self.output.write(self.render_template('education'))
     
     def generate_skills(self):
         """
@@ -350,36 +526,7 @@ class HtmlCvGenerator(AbstractCvGenerator):
         -------
         None
         """
-        if not self.cv_data['publications']:
-            return
-        
-        self.content += (
-            '      <section class="publications-section">' + "\n"
-            "        <h2>Publications</h2>" + "\n"
-            '        <div class="publications-list">' + "\n"
-        )
-        
-        for pub in self.cv_data['publications']:
-            doi_link = ""
-            if 'doi' in pub:
-                doi_link = (
-                    f"DOI: <a href='https://doi.org/{pub['doi']}' "
-                    f"class='pub-link' target='_blank'>"
-                    f"{self.escape_text(pub['doi'])}</a>"
-                )
-            
-            self.content += (
-                f"          <p><strong>"
-                f"{self.escape_text(pub['authors'])}</strong> ({pub['year']}). "
-                f"{self.escape_text(pub['title'])}. <em>"
-                f"{self.escape_text(pub['venue'])}</em>. {doi_link}</p>" + "\n"
-            )
-        
-        self.content += (
-            "        </div>" + "\n"
-            "      </section>" + "\n"
-            "\n"
-        )
+        self.output.write(self.render_template('publications'))
     
     def generate_awards(self):
         """
@@ -396,27 +543,7 @@ class HtmlCvGenerator(AbstractCvGenerator):
         -------
         None
         """
-        if not self.cv_data['awards']:
-            return
-        
-        self.content += (
-            '      <section class="awards-section">' + "\n"
-            "        <h2>Awards and Accreditations</h2>" + "\n"
-            '        <div class="awards-list">' + "\n"
-        )
-        
-        for award in self.cv_data['awards']:
-            self.content += (
-                f"          <p><strong>"
-                f"{self.escape_text(award['title'])}</strong> - "
-                f"{self.escape_text(award['description'])}</p>" + "\n"
-            )
-        
-        self.content += (
-            "        </div>" + "\n"
-            "      </section>" + "\n"
-            "\n"
-        )
+        self.output.write(self.render_template('awards'))
     
     def generate_hobbies(self):
         """
@@ -433,30 +560,35 @@ class HtmlCvGenerator(AbstractCvGenerator):
         -------
         None
         """
-        if not self.cv_data['hobbies']:
-            return
-        
-        hobbies_html = ''.join([
-            f'<li><i class="{hobby["icon"]}"></i>'
-            f'<span>{self.escape_text(hobby["name"])}</span></li>'
-            for hobby in self.cv_data['hobbies']
-        ])
-        
-        self.content += (
-            '      <section class="hobbies-section">' + "\n"
-            "        <h2>Interests</h2>" + "\n"
-            '        <ul class="hobbies-list">' + "\n"
-            f"          {hobbies_html}" + "\n"
-            "        </ul>" + "\n"
-            "      </section>" + "\n"
-        )
+        self.output.write(self.render_template('hobbies'))
+    
+    def generate_footer(self):
+        """
+        Generate HTML footer and close the document.
+        
+        Closes the main content, adds the footer with the generation date and
+        the dark mode script, and closes the HTML document.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        self.output.write(self.render_template('footer'))
     
     def write_output(self):
         """
         Write HTML to file.
         
-        Completes and closes the HTML document, then writes the entire
-        content to index.html.
+        Publishes the generated HTML as index.html in the output directory,
+        through the output store, so it is replaced atomically and left
+        untouched if unchanged. The chunks are encoded and written one at
+        a time, without joining the document. Without minify, the minified stylesheet and
+        the compressed copies left by an earlier minified build are
+        removed, so a host cannot serve them in place of the new page.
         
         Parameters
         ----------
@@ -466,43 +598,91 @@ class HtmlCvGenerator(AbstractCvGenerator):
         -------
         None
         """
-        self.content += (
-            "    </article>" + "\n"
-            "  </main>" + "\n"
-            "\n"
-            '  <footer class="footer">' + "\n"
-            f"    <p>Generated on {date.today().strftime('%Y-%m-%d')} • "
-            '<a href="https://github.com/tom-bower/cv">View on GitHub</a></p>' + "\n"
-            "  </footer>" + "\n"
-            "\n"
-            "  <script>" + "\n"
-            "    // Dark mode toggle" + "\n"
-            "    const darkModeBtn = document.getElementById('darkModeBtn');" + "\n"
-            "    const darkModeIcon = darkModeBtn.querySelector('i');" + "\n"
-            "    " + "\n"
-            "    // Check for saved dark mode preference or default to dark" + "\n"
-            "    const isDarkMode = localStorage.getItem('darkMode') === null" + "\n"
-            "      ? true" + "\n"
-            "      : localStorage.getItem('darkMode') === \"true\";" + "\n"
-            "    " + "\n"
-            "    if (isDarkMode) {" + "\n"
-            "      document.body.classList.add('dark-mode');" + "\n"
-            "      darkModeIcon.classList.remove('fa-moon');" + "\n"
-            "      darkModeIcon.classList.add('fa-sun');" + "\n"
-            "    }" + "\n"
-            "    " + "\n"
-            "    darkModeBtn.addEventListener('click', () => {" + "\n"
-            "      document.body.classList.toggle('dark-mode');" + "\n"
-            "      const isDark = document.body.classList.contains('dark-mode');" + "\n"
-            "      localStorage.setItem('darkMode', isDark);" + "\n"
-            "      darkModeIcon.classList.toggle('fa-moon');" + "\n"
-            "      darkModeIcon.classList.toggle('fa-sun');" + "\n"
-            "    });" + "\n"
-            "  </script>" + "\n"
-            "</body>" + "\n"
-            "</html>" + "\n"
-        )
+        output_path = self.output_dir / 'index.html'
+        if self.minify:
+            self.write_minified(output_path)
+        else:
+            output_store(self.output_dir).publish(
+                output_path, (chunk.encode('utf-8') for chunk in self.output.chunks)
+            )
+            unpublish(output_path, keep_file=True)
+            unpublish(PROJECT_ROOT / self.MINIFIED_STYLESHEET)
+            print(f"✓ HTML file generated successfully: {output_path}")
+        self.write_pages()
+    
+    def write_pages(self):
+        """
+        Write the fragments and standalone pages of paginated sections.
+        
+        For every page after the first, writes the fragment 'show more'
+        loads and a standalone page with the header, sidebar and footer of
+        index.html around that page's entries. Fragments and pages left by
+        earlier builds are removed.
+        
+        Parameters
+        ----------
+        None
         
-        with open('index.html', 'w', encoding='utf-8') as f:
-            f.write(self.content)
-        print("✓ HTML file generated successfully: index.html")
+        Returns
+        -------
+        None
+        """
+        finish = minify_html if self.minify else (lambda html: html)
+        fragment_dir = self.output_dir / self.FRAGMENT_DIR
+        stale = set(fragment_dir.glob('*.html'))
+        written = 0
+        for section in self.PAGED_SECTIONS:
+            stale.update(
+                path for path in self.output_dir.glob(f'{section}-*.html')
+                if re.fullmatch(rf'{section}-\d+\.html', path.name)
+            )
+            for page in range(2, self.page_count(section) + 1):
+                path, html = self.fragment(section, page)
+                fragment_path = self.output_dir / path
+                output_store(self.output_dir).publish(fragment_path, finish(html).encode('utf-8'))
+                stale.discard(fragment_path)
+                
+                page_path = self.output_dir / self.page_href(section, page)
+                document = ''.join((
+                    self.render_template('header'),
+                    self._render_page(section, page, 'pager'),
+                    self._render_page(section, page, section),
+                    self.render_template('footer'),
+                ))
+                output_store(self.output_dir).publish(page_path, finish(document).encode('utf-8'))
+                stale.discard(page_path)
+                written += 1
+        for path in stale:
+            output_store(self.output_dir).remove(path)
+        if fragment_dir.is_dir() and not any(fragment_dir.iterdir()):
+            fragment_dir.rmdir()
+        if written:
+            print(f"✓ {written} further page(s) written with fragments in {fragment_dir}")
+    
+    def write_minified(self, output_path):
+        """
+        Write minified HTML and stylesheet with precompressed copies.
+        
+        Writes index.html and the minified stylesheet, each with .gz and
+        (if the brotli package is installed) .br siblings, and reports the
+        bytes saved on each.
+        
+        Parameters
+        ----------
+        output_path : Path
+            The HTML file to write.
+        
+        Returns
+        -------
+        None
+        """
+        report = [publish(output_path, self.content, minify_html)]
+        stylesheet = PROJECT_ROOT / self.STYLESHEET
+        report.append(publish(
+            PROJECT_ROOT / self.MINIFIED_STYLESHEET,
+            stylesheet.read_text(encoding='utf-8'),
+            minify_css
+        ))
+        print(f"✓ Minified HTML file generated successfully: {output_path}")
+        for line in report:
+            print(line)
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Icon Font - self-hosted Font Awesome subset of the icons the CV uses.
+"""
+import hashlib
+import io
+import json
+import re
+from pathlib import Path
+
+from atomic_io import atomic_write_bytes
+
+try:
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+except ImportError:
+    subset = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Project root and the stylesheet directory the subset is written to
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CSS_DIR = PROJECT_ROOT / 'css'
+
+# Generated stylesheet, relative to the project root
+ICON_STYLESHEET = 'css/icons.css'
+
+# Font Awesome from the CDN, used when no up to date subset has been built
+CDN_STYLESHEET = 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.0/css/all.min.css'
+
+# Default location of an unpacked Font Awesome Free web package
+DEFAULT_FONTAWESOME_DIR = PROJECT_ROOT / 'vendor' / 'fontawesome-free'
+
+# Classes selecting a style, and each style's font file and weight
+STYLE_CLASSES = {
+    'fas': 'solid',
+    'fa-solid': 'solid',
+    'far': 'regular',
+    'fa-regular': 'regular',
+    'fab': 'brands',
+    'fa-brands': 'brands',
+}
+STYLE_FONTS = {
+    'solid': ('fa-solid-900', 900),
+    'regular': ('fa-regular-400', 400),
+    'brands': ('fa-brands-400', 400),
+}
+
+# The stylesheet's first line lists the icons it covers
+_COVERS_PREFIX = '/* icons: '
+
+_CLASS_ATTRIBUTE = re.compile(r'class="([^"]*)"')
+_QUOTED_CLASS = re.compile(r'''['"](fa-[a-z0-9-]+)['"]''')
+
+
+def _add_classes(icons, classes):
+    """Record the fa-* names in a class list, under the style it selects."""
+    names = classes.split()
+    styles = {STYLE_CLASSES[name] for name in names if name in STYLE_CLASSES}
+    for name in names:
+        if name.startswith('fa-') and name not in STYLE_CLASSES:
+            icons.setdefault(name[3:], set()).update(styles)
+
+
+def collect_icons(cv_data, template_dir):
+    """
+    Collect the icons used by the CV data and the HTML templates.
+
+    Icons come from the 'icon' fields of the social links, jobs and hobbies,
+    from class attributes in the templates, and from quoted class names in
+    their scripts (e.g. the dark mode toggle's 'fa-sun'). Modifier classes
+    such as 'fa-fw' are collected too and dropped later, as they are not
+    icons.
+
+    Parameters
+    ----------
+    cv_data : CvData
+        The CV data.
+    template_dir : str or Path
+        Directory of HTML templates.
+
+    Returns
+    -------
+    dict
+        Icon names without the 'fa-' prefix, mapped to the set of styles
+        they are used in; empty if only ever used without a style class.
+    """
+    icons = {}
+    for record in (*cv_data.personal.social, *cv_data.experience, *cv_data.hobbies):
+        _add_classes(icons, record.icon)
+    for path in sorted(Path(template_dir).glob('*.html')):
+        text = path.read_text(encoding='utf-8')
+        for classes in _CLASS_ATTRIBUTE.findall(text):
+            _add_classes(icons, classes)
+        for name in _QUOTED_CLASS.findall(text):
+            _add_classes(icons, name)
+    return icons
+
+
+def load_metadata(fontawesome_dir):
+    """
+    Read the icon catalogue of a Font Awesome Free package.
+
+    Parameters
+    ----------
+    fontawesome_dir : str or Path
+        The unpacked package, containing metadata/ and webfonts/.
+
+    Returns
+    -------
+    dict
+        Every icon name and alias, mapped to (unicode code point, tuple of
+        free styles).
+    """
+    icons = json.loads((Path(fontawesome_dir) / 'metadata' / 'icons.json').read_text(encoding='utf-8'))
+    catalogue = {}
+    for name, icon in icons.items():
+        entry = (int(icon['unicode'], 16), tuple(icon.get('free', ())))
+        catalogue[name] = entry
+        for alias in icon.get('aliases', {}).get('names', ()):
+            catalogue[alias] = entry
+    return catalogue
+
+
+def package_version(fontawesome_dir):
+    """Read the package version from the banner of its stylesheet, if present."""
+    try:
+        banner = (Path(fontawesome_dir) / 'css' / 'fontawesome.css').read_text(encoding='utf-8')[:200]
+    except FileNotFoundError:
+        return 'Font Awesome Free'
+    match = re.search(r'Font Awesome Free [\d.]+', banner)
+    return match.group(0) if match else 'Font Awesome Free'
+
+
+def resolve_icons(icons, catalogue):
+    """
+    Work out the style and code point of each collected icon.
+
+    Icons used without a style class take their solid form if they have
+    one, otherwise their first free style.
+
+    Parameters
+    ----------
+    icons : dict
+        Icon names mapped to styles, from collect_icons.
+    catalogue : dict
+        The package catalogue, from load_metadata.
+
+    Returns
+    -------
+    tuple
+        (dict mapping each style to {icon name: code point}, sorted list
+        of names that are not free icons in the requested style).
+    """
+    by_style = {}
+    unknown = []
+    for name, styles in sorted(icons.items()):
+        if name not in catalogue:
+            unknown.append(name)
+            continue
+        codepoint, free_styles = catalogue[name]
+        if not styles:
+            styles = {'solid' if 'solid' in free_styles else free_styles[0]}
+        for style in sorted(styles):
+            if style not in free_styles:
+                unknown.append(f'{name} ({style})')
+                continue
+            by_style.setdefault(style, {})[name] = codepoint
+    return by_style, unknown
+
+
+def subset_font(source, codepoints):
+    """
+    Subset a font to the given code points.
+
+    Parameters
+    ----------
+    source : Path
+        The full TrueType font.
+    codepoints : iterable of int
+        The code points to keep.
+
+    Returns
+    -------
+    tuple
+        (font bytes, format): WOFF2 if brotli is installed, otherwise WOFF.
+    """
+    options = subset.Options()
+    options.flavor = 'woff2' if brotli is not None else 'woff'
+    options.layout_features = []
+    options.name_IDs = []
+    options.notdef_outline = True
+    font = TTFont(source)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    font.flavor = options.flavor
+    buffer = io.BytesIO()
+    font.save(buffer)
+    return buffer.getvalue(), options.flavor
+
+
+def stylesheet_css(icons, fonts, version, covered):
+    """
+    Build the stylesheet for a subset.
+
+    Defines one font face per style and the classes Font Awesome markup
+    uses ('fas', 'fa-solid', 'fab', ...), with a rule per icon.
+
+    Parameters
+    ----------
+    icons : dict
+        Each style mapped to {icon name: code point}.
+    fonts : dict
+        Each style mapped to (font URL relative to the stylesheet, format).
+    version : str
+        Font Awesome version, for the attribution.
+    covered : iterable of str
+        Every collected name, listed in the first line so generators can
+        tell whether the stylesheet is up to date.
+
+    Returns
+    -------
+    str
+        The stylesheet.
+    """
+    names = sorted({name for style_icons in icons.values() for name in style_icons})
+    lines = [
+        _COVERS_PREFIX + ' '.join(f'fa-{name}' for name in sorted(covered)) + ' */',
+        f'/* Subset of {version} - https://fontawesome.com, '
+        'License - https://fontawesome.com/license/free (Icons: CC BY 4.0, '
+        'Fonts: SIL OFL 1.1, Code: MIT License). Generated by build_icons.py. */',
+        '.fa,.fas,.far,.fab,.fa-solid,.fa-regular,.fa-brands{'
+        '-moz-osx-font-smoothing:grayscale;-webkit-font-smoothing:antialiased;'
+        'display:var(--fa-display,inline-block);font-style:normal;font-variant:normal;'
+        'line-height:1;text-rendering:auto}',
+    ]
+    for style in sorted(icons):
+        url, font_format = fonts[style]
+        weight = STYLE_FONTS[style][1]
+        family = f'cv-icons-{style}'
+        classes = ','.join(f'.{name}' for name, value in STYLE_CLASSES.items() if value == style)
+        lines.append(
+            f'@font-face{{font-family:"{family}";font-style:normal;font-weight:{weight};'
+            f'font-display:block;src:url({url}) format("{font_format}")}}'
+        )
+        lines.append(f'{classes}{{font-family:"{family}";font-weight:{weight}}}')
+    for name in names:
+        codepoint = next(style_icons[name] for style_icons in icons.values() if name in style_icons)
+        lines.append(f'.fa-{name}::before{{content:"\\{codepoint:x}"}}')
+    return '\n'.join(lines) + '\n'
+
+
+def build_icon_font(cv_data, template_dir, fontawesome_dir=None, css_dir=None):
+    """
+    Build the subset fonts and stylesheet for the icons the CV uses.
+
+    Fonts are written to 'webfonts/' in the stylesheet directory, named by
+    a hash of their contents so browsers never use a stale cached copy;
+    fonts from earlier builds are removed.
+
+    Parameters
+    ----------
+    cv_data : CvData
+        The CV data.
+    template_dir : str or Path
+        Directory of HTML templates.
+    fontawesome_dir : str or Path, optional
+        The unpacked Font Awesome Free package. Default is 'vendor/fontawesome-free'.
+    css_dir : str or Path, optional
+        Directory to write icons.css to. Default is 'css'.
+
+    Returns
+    -------
+    list of str
+        Report lines: the size of each subset font against the full font,
+        and any icon names that could not be found.
+
+    Raises
+    ------
+    RuntimeError
+        If fontTools is not installed.
+    FileNotFoundError
+        If the Font Awesome package is not found.
+    """
+    if subset is None:
+        raise RuntimeError("fontTools is required to build the icon font (pip install fonttools brotli)")
+    fontawesome_dir = Path(fontawesome_dir) if fontawesome_dir else DEFAULT_FONTAWESOME_DIR
+    css_dir = Path(css_dir) if css_dir else CSS_DIR
+    if not (fontawesome_dir / 'metadata' / 'icons.json').exists():
+        raise FileNotFoundError(
+            f"Font Awesome Free package not found in {fontawesome_dir}: unpack the web "
+            "package (https://fontawesome.com/download) there, or pass its directory"
+        )
+
+    collected = collect_icons(cv_data, template_dir)
+    icons, unknown = resolve_icons(collected, load_metadata(fontawesome_dir))
+    font_dir = css_dir / 'webfonts'
+    stale = set(font_dir.glob('cv-icons-*'))
+    fonts = {}
+    report = []
+    for style, style_icons in sorted(icons.items()):
+        font_name = STYLE_FONTS[style][0]
+        data, font_format = subset_font(
+            fontawesome_dir / 'webfonts' / f'{font_name}.ttf', style_icons.values()
+        )
+        digest = hashlib.sha256(data).hexdigest()[:10]
+        path = font_dir / f'cv-icons-{style}-{digest}.{font_format}'
+        atomic_write_bytes(path, data)
+        stale.discard(path)
+        fonts[style] = (f'webfonts/{path.name}', font_format)
+
+        full = fontawesome_dir / 'webfonts' / f'{font_name}.woff2'
+        full_size = full.stat().st_size if full.exists() else None
+        line = f"  {style}: {len(style_icons)} icons, {len(data):,} B {font_format}"
+        if full_size:
+            line += f" (full {font_name}.woff2: {full_size:,} B, -{100 * (1 - len(data) / full_size):.0f}%)"
+        report.append(line)
+    for path in stale:
+        path.unlink()
+
+    css = stylesheet_css(icons, fonts, package_version(fontawesome_dir), collected)
+    atomic_write_bytes(css_dir / 'icons.css', css.encode('utf-8'))
+    report.append(f"  icons.css: {len(css.encode('utf-8')):,} B")
+    if unknown:
+        # Includes modifier classes such as fa-fw, which need no glyph
+        report.append(f"  Not free Font Awesome icons, skipped: {', '.join(unknown)}")
+    return report
+
+
+def covered_icons(css_path):
+    """
+    Read which icons a built stylesheet covers.
+
+    Parameters
+    ----------
+    css_path : str or Path
+        The stylesheet built by build_icon_font.
+
+    Returns
+    -------
+    set of str or None
+        Icon names without the 'fa-' prefix, or None if there is no
+        built stylesheet.
+    """
+    try:
+        with open(css_path, encoding='utf-8') as f:
+            first_line = f.readline()
+    except FileNotFoundError:
+        return None
+    if not first_line.startswith(_COVERS_PREFIX):
+        return None
+    return {name[3:] for name in first_line[len(_COVERS_PREFIX):].split() if name.startswith('fa-')}
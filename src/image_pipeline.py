@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Image Pipeline - resized, re-encoded variants of the images the HTML CV uses.
+"""
+import hashlib
+import io
+import json
+import struct
+from functools import lru_cache
+from pathlib import Path
+
+from atomic_io import atomic_write_bytes
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+# Project root, which image paths are relative to
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Directory for generated variants, relative to the project root
+GENERATED_DIR = Path('assets') / 'generated'
+
+# Pixel density multiples of the displayed size to generate
+DENSITIES = (1, 2, 3)
+
+# Formats to offer, best first: (Pillow format, MIME type, file suffix, save options)
+FORMATS = (
+    ('AVIF', 'image/avif', '.avif', {'quality': 60}),
+    ('WEBP', 'image/webp', '.webp', {'quality': 80, 'method': 6}),
+    ('PNG', 'image/png', '.png', {'optimize': True}),
+)
+
+
+def png_size(path):
+    """
+    Read the pixel size of a PNG file from its header.
+
+    Parameters
+    ----------
+    path : str or Path
+        The image file.
+
+    Returns
+    -------
+    tuple of int or None
+        (width, height), or None if the file is not a PNG.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    if header[:8] != b'\x89PNG\r\n\x1a\n' or header[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', header[16:24])
+
+
+def _saveable_formats():
+    """Get the entries of FORMATS the installed Pillow can encode."""
+    Image.init()
+    return [entry for entry in FORMATS if entry[0] in Image.SAVE]
+
+
+class ImagePipeline:
+    """
+    Produces responsive variants of source images, cached by source hash.
+
+    Each source image is resized to every density multiple of the size it
+    is displayed at (never larger than the source) and encoded in every
+    format the installed Pillow supports. Variant file names include a
+    hash of the source, and a manifest records which variants exist for
+    which source hash, so images are only re-encoded when the source
+    changes. Without Pillow the sources are used unprocessed.
+    """
+
+    def __init__(self, root=None, generated_dir=None):
+        """
+        Initialize the image pipeline.
+
+        Parameters
+        ----------
+        root : str or Path, optional
+            Directory image paths are relative to. Default is the project root.
+        generated_dir : str or Path, optional
+            Directory for variants, relative to root. Default is 'assets/generated'.
+        """
+        self.root = Path(root) if root else PROJECT_ROOT
+        self.generated_dir = Path(generated_dir) if generated_dir else GENERATED_DIR
+        self.manifest_path = self.root / self.generated_dir / 'manifest.json'
+        self._manifest = None
+        self._hashes = {}
+
+    @property
+    def manifest(self):
+        """Variants recorded for each source, read from disk on first use."""
+        if self._manifest is None:
+            try:
+                self._manifest = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+            except (FileNotFoundError, ValueError):
+                self._manifest = {}
+        return self._manifest
+
+    def source_hash(self, source):
+        """
+        Hash a source image, reusing the hash while the file is unchanged.
+
+        Parameters
+        ----------
+        source : str
+            Image path relative to the root.
+
+        Returns
+        -------
+        str
+            Hex digest of the file contents.
+        """
+        path = self.root / source
+        stat = path.stat()
+        cached = self._hashes.get(source)
+        if cached is not None and cached[0] == (stat.st_mtime_ns, stat.st_size):
+            return cached[1]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        self._hashes[source] = ((stat.st_mtime_ns, stat.st_size), digest)
+        return digest
+
+    def variants(self, source, display_width):
+        """
+        Get the variants of an image for a display width, encoding them if needed.
+
+        Parameters
+        ----------
+        source : str
+            Image path relative to the root, e.g. 'assets/images/profile.png'.
+        display_width : int
+            Width in CSS pixels the image is shown at.
+
+        Returns
+        -------
+        list of dict
+            Variants with 'src', 'type', 'width' and 'height' keys, best
+            format first and narrowest first within a format. Without
+            Pillow, only the source image itself.
+        """
+        digest = self.source_hash(source)
+        key = f'{source}@{display_width}'
+        entry = self.manifest.get(key)
+        if (entry is not None and entry['hash'] == digest
+                and all((self.root / variant['src']).exists() for variant in entry['variants'])):
+            return entry['variants']
+
+        if Image is None:
+            size = png_size(self.root / source)
+            return [{
+                'src': source,
+                'type': 'image/png' if size else None,
+                'width': size[0] if size else None,
+                'height': size[1] if size else None,
+            }]
+
+        variants = self._encode(source, digest, display_width)
+        if entry is not None:
+            self._remove_stale(entry['variants'], variants)
+        self.manifest[key] = {'hash': digest, 'variants': variants}
+        atomic_write_bytes(
+            self.manifest_path,
+            json.dumps(self.manifest, indent=2, sort_keys=True).encode('utf-8')
+        )
+        return variants
+
+    def _encode(self, source, digest, display_width):
+        """Resize and encode an image in every density and format."""
+        output_dir = self.root / self.generated_dir
+        stem = Path(source).stem
+        variants = []
+        with Image.open(self.root / source) as image:
+            image.load()
+            if image.mode not in ('RGB', 'RGBA'):
+                # Palette and greyscale images would be resized without filtering
+                image = image.convert('RGBA')
+            widths = sorted({min(display_width * density, image.width) for density in DENSITIES})
+            for pillow_format, mime_type, suffix, options in _saveable_formats():
+                for width in widths:
+                    height = round(image.height * width / image.width)
+                    resized = image.resize((width, height), Image.LANCZOS)
+                    buffer = io.BytesIO()
+                    resized.save(buffer, pillow_format, **options)
+                    relative = self.generated_dir / f'{stem}-{digest[:12]}-{width}w{suffix}'
+                    atomic_write_bytes(self.root / relative, buffer.getvalue())
+                    variants.append({
+                        'src': relative.as_posix(),
+                        'type': mime_type,
+                        'width': width,
+                        'height': height,
+                    })
+        print(f"Encoded {len(variants)} variants of {source} into {output_dir}")
+        return variants
+
+    def _remove_stale(self, old_variants, new_variants):
+        """Delete variants of an earlier version of a source."""
+        keep = {variant['src'] for variant in new_variants}
+        for variant in old_variants:
+            if variant['src'] not in keep:
+                (self.root / variant['src']).unlink(missing_ok=True)
+
+
+def picture_html(variants, alt, css_class, display_width, lazy=False):
+    """
+    Build a picture element offering every variant of an image.
+
+    Parameters
+    ----------
+    variants : list of dict
+        Variants from ImagePipeline.variants.
+    alt : str
+        Alternative text, already escaped.
+    css_class : str
+        Class of the img element.
+    display_width : int
+        Width in CSS pixels the image is shown at, used as its sizes.
+    lazy : bool, optional
+        If True, the image is below the fold and loaded lazily. Default is False.
+
+    Returns
+    -------
+    str
+        A picture element with a source per format and an img fallback,
+        or a plain img element when there is only one variant.
+    """
+    by_type = {}
+    for variant in variants:
+        by_type.setdefault(variant['type'], []).append(variant)
+    fallback_type = 'image/png' if 'image/png' in by_type else variants[-1]['type']
+    fallback = by_type[fallback_type]
+    # The 1x variant gives the width and height, which fix the aspect ratio
+    base = fallback[0]
+
+    def srcset(group):
+        return ', '.join(f"{variant['src']} {variant['width']}w" for variant in group)
+
+    attributes = [f'src="{base["src"]}"']
+    if len(fallback) > 1:
+        attributes.append(f'srcset="{srcset(fallback)}" sizes="{display_width}px"')
+    if base['width'] and base['height']:
+        attributes.append(f'width="{base["width"]}" height="{base["height"]}"')
+    attributes.append(f'alt="{alt}" class="{css_class}"')
+    if lazy:
+        attributes.append('loading="lazy" decoding="async"')
+    img = f'<img {" ".join(attributes)}>'
+
+    sources = [
+        f'<source type="{mime_type}" srcset="{srcset(group)}" sizes="{display_width}px">'
+        for mime_type, group in by_type.items() if mime_type != fallback_type
+    ]
+    if not sources:
+        return img
+    return f'<picture>{"".join(sources)}{img}</picture>'
+
+
+@lru_cache(maxsize=None)
+def image_pipeline():
+    """
+    Get the image pipeline shared by every generator in this process.
+
+    Returns
+    -------
+    ImagePipeline
+        The pipeline for the project's images.
+    """
+    return ImagePipeline()
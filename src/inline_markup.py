@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Inline Markup - markdown-style inline markup in CV text, for every output format.
+
+Text such as job highlights may contain [link text](url), **bold**,
+*italic* and `code`. Each string is parsed into tokens once per process,
+and each format writes its own output from the tokens, escaping the
+plain text and URLs exactly once. Parsed and rendered strings are both
+memoized, so a highlight is parsed once however many formats and
+variants render it.
+"""
+import re
+from functools import lru_cache
+
+from escaping import escape_html, escape_latex, escape_latex_url, escape_layout
+from pdf_writer import BOLD, ITALIC, LINK_END, LINK_START, LINK_TEXT
+
+
+# Maximum number of parsed or rendered strings remembered
+MARKUP_CACHE_SIZE = 8192
+
+# One alternative per kind of token; text between matches is plain text.
+# Italic text may not start or end with a space, so a lone '*' stays as is,
+# and '*' and '**' delimiters may not touch a letter, digit or another '*'
+# outside them, so arithmetic and identifiers such as '5*3*2', '2**3**4' or
+# 'a*b*c' are plain text.
+_TOKEN = re.compile(
+    r'\[(?P<link>[^\]]+)\]\((?P<url>[^\)]+)\)'
+    r'|(?<![\w*])\*\*(?P<bold>.+?)\*\*(?![\w*])'
+    r'|(?<![\w*])\*(?P<italic>[^*\s](?:[^*]*[^*\s])?)\*(?![\w*])'
+    r'|`(?P<code>[^`]+)`'
+)
+_KINDS = ('link', 'bold', 'italic', 'code')
+
+# How each format writes each kind of token, from its escaped text and,
+# for links, escaped URL
+LATEX_MARKUP = {
+    'text': '{text}',
+    'link': r'\href{{{url}}}{{{text}}}',
+    'bold': r'\textbf{{{text}}}',
+    'italic': r'\textit{{{text}}}',
+    'code': r'\texttt{{{text}}}',
+}
+HTML_MARKUP = {
+    'text': '{text}',
+    'link': '<a href="{url}" target="_blank" rel="noopener">{text}</a>',
+    'bold': '<strong>{text}</strong>',
+    'italic': '<em>{text}</em>',
+    'code': '<code>{text}</code>',
+}
+# The direct PDF writer has no monospaced font, so code is plain text
+LAYOUT_MARKUP = {
+    'text': '{text}',
+    'link': LINK_START + '{url}' + LINK_TEXT + '{text}' + LINK_END,
+    'bold': BOLD + '{text}' + BOLD,
+    'italic': ITALIC + '{text}' + ITALIC,
+    'code': '{text}',
+}
+
+
+@lru_cache(maxsize=MARKUP_CACHE_SIZE)
+def parse(text):
+    """
+    Split text into inline markup tokens.
+
+    Markup does not nest: the text of a link, bold, italic or code token
+    is taken literally.
+
+    Parameters
+    ----------
+    text : str
+        The text, unescaped.
+
+    Returns
+    -------
+    tuple of tuple
+        (kind, text, url) for each run of text, where kind is 'text',
+        'link', 'bold', 'italic' or 'code', and url is None except for links.
+    """
+    tokens = []
+    position = 0
+    for match in _TOKEN.finditer(text):
+        if match.start() > position:
+            tokens.append(('text', text[position:match.start()], None))
+        kind = next(kind for kind in _KINDS if match.group(kind) is not None)
+        tokens.append((kind, match.group(kind), match.group('url')))
+        position = match.end()
+    if position < len(text):
+        tokens.append(('text', text[position:], None))
+    return tuple(tokens)
+
+
+def _compile_renderer(markup, escape, escape_url):
+    """
+    Build a function writing parsed markup in one output format.
+
+    Parameters
+    ----------
+    markup : dict
+        Format string for each kind of token, taking 'text' and 'url'.
+    escape : callable
+        Escapes plain text for the format.
+    escape_url : callable
+        Escapes link URLs for the format.
+
+    Returns
+    -------
+    callable
+        Function taking a string and returning it in the output format.
+    """
+    def render(text):
+        return ''.join(
+            markup[kind].format(text=escape(value), url=escape_url(url) if url else '')
+            for kind, value, url in parse(text)
+        )
+
+    return render
+
+
+_render_latex = _compile_renderer(LATEX_MARKUP, escape_latex, escape_latex_url)
+_render_html = _compile_renderer(HTML_MARKUP, escape_html, escape_html)
+_render_layout = _compile_renderer(LAYOUT_MARKUP, escape_layout, escape_layout)
+
+
+@lru_cache(maxsize=MARKUP_CACHE_SIZE)
+def markup_latex(text):
+    """
+    Write text with inline markup as LaTeX.
+
+    Parameters
+    ----------
+    text : str
+        The text, unescaped.
+
+    Returns
+    -------
+    str
+        Escaped LaTeX, with \\href, \\textbf, \\textit and \\texttt commands.
+    """
+    return _render_latex(text)
+
+
+@lru_cache(maxsize=MARKUP_CACHE_SIZE)
+def markup_html(text):
+    """
+    Write text with inline markup as HTML.
+
+    Parameters
+    ----------
+    text : str
+        The text, unescaped.
+
+    Returns
+    -------
+    str
+        Escaped HTML, with a, strong, em and code elements.
+    """
+    return _render_html(text)
+
+
+@lru_cache(maxsize=MARKUP_CACHE_SIZE)
+def markup_layout(text):
+    """
+    Write text with inline markup as direct PDF layout text.
+
+    Parameters
+    ----------
+    text : str
+        The text, unescaped.
+
+    Returns
+    -------
+    str
+        Layout text, with the PDF writer's link and style markers.
+    """
+    return _render_layout(text)
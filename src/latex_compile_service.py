@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+LaTeX Compile Service - a pool of warm pdflatex workers.
+"""
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+
+from atomic_io import scratch_root
+
+
+class CompileError(Exception):
+    """Raised when LaTeX compilation of a job fails."""
+
+    def __init__(self, message, log=''):
+        """
+        Initialize the compile error.
+
+        Parameters
+        ----------
+        message : str
+            Description of the failure.
+        log : str, optional
+            The engine's output for the failed job. Default is ''.
+        """
+        super().__init__(message)
+        self.log = log
+
+
+class CompileTimeout(CompileError):
+    """Raised when a job does not finish within its timeout."""
+
+
+class _Job:
+    """A queued compile request and the future its result is delivered to."""
+
+    __slots__ = ('tex', 'preamble', 'timeout', 'future')
+
+    def __init__(self, tex, preamble, timeout):
+        self.tex = tex
+        self.preamble = preamble
+        self.timeout = timeout
+        self.future = Future()
+
+
+class _Worker(threading.Thread):
+    """
+    Worker thread owning one scratch directory and one warm engine process.
+
+    After each job the worker starts the engine for the next job straight
+    away, with the format already loaded, and leaves it waiting for the
+    name of its input file. A job then only pays for typesetting.
+    """
+
+    JOB_NAME = 'job'
+
+    def __init__(self, service, index):
+        super().__init__(name=f'latex-worker-{index}', daemon=True)
+        self.service = service
+        self.scratch_dir = None
+        self.process = None
+        self.process_format = None
+        self.restarts = 0
+        self._make_scratch_dir()
+
+    def _make_scratch_dir(self):
+        self.scratch_dir = Path(tempfile.mkdtemp(
+            prefix=f'{self.name}-', dir=self.service.scratch_root
+        ))
+
+    def _start_process(self, format_name):
+        command = [self.service.engine, '-interaction=nonstopmode']
+        env = None
+        if format_name:
+            command.append(f'-fmt={format_name}')
+            env = self.service.format_cache.environment()
+        self.process = subprocess.Popen(
+            command,
+            cwd=self.scratch_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            env=env
+        )
+        self.process_format = format_name
+
+    def _stop_process(self):
+        if self.process is not None:
+            if self.process.poll() is None:
+                self.process.kill()
+            self.process.communicate()
+            self.process = None
+
+    def restart(self):
+        """Kill the engine process and start again with a fresh scratch directory."""
+        self._stop_process()
+        shutil.rmtree(self.scratch_dir, ignore_errors=True)
+        self._make_scratch_dir()
+        self.restarts += 1
+
+    def run(self):
+        while True:
+            job = self.service.jobs.get()
+            if job is None:
+                break
+            if job.future.set_running_or_notify_cancel():
+                try:
+                    job.future.set_result(self.compile(job))
+                except Exception as e:
+                    job.future.set_exception(e)
+            self.service.jobs.task_done()
+        self._stop_process()
+        shutil.rmtree(self.scratch_dir, ignore_errors=True)
+
+    def compile(self, job):
+        """
+        Compile one job in this worker's scratch directory.
+
+        Parameters
+        ----------
+        job : _Job
+            The job to compile.
+
+        Returns
+        -------
+        bytes
+            The compiled PDF.
+        """
+        format_name = self.service.format_for(job.preamble)
+        for stale in self.scratch_dir.glob(f'{self.JOB_NAME}.*'):
+            stale.unlink()
+        (self.scratch_dir / f'{self.JOB_NAME}.tex').write_text(job.tex, encoding='utf-8')
+
+        # Use the warm process if it has the right format loaded
+        if (self.process is None or self.process.poll() is not None
+                or self.process_format != format_name):
+            self._stop_process()
+            self._start_process(format_name)
+
+        try:
+            output, _ = self.process.communicate(
+                f'{self.JOB_NAME}.tex\n', timeout=job.timeout
+            )
+        except subprocess.TimeoutExpired:
+            self.restart()
+            self._start_process(format_name)
+            raise CompileTimeout(f"LaTeX compilation timed out after {job.timeout}s")
+
+        returncode = self.process.returncode
+        self.process = None
+        pdf_path = self.scratch_dir / f'{self.JOB_NAME}.pdf'
+        try:
+            if returncode != 0 or not pdf_path.exists():
+                raise CompileError("LaTeX compilation failed", output)
+            return pdf_path.read_bytes()
+        finally:
+            self._start_process(format_name)
+
+
+class LatexCompileService:
+    """
+    Compile LaTeX documents to PDF on a pool of warm worker processes.
+
+    Documents are queued and picked up by a fixed number of workers, which
+    bounds how many compiles run at once. Each worker has its own scratch
+    directory and keeps an engine process started ahead of time. Jobs that
+    exceed their timeout are killed and their worker is restarted. If a
+    FormatCache is given, jobs submitted with their preamble are compiled
+    from a precompiled format.
+    """
+
+    def __init__(self, workers=None, timeout=60, engine='pdflatex',
+                 format_cache=None, max_pending=None):
+        """
+        Initialize the compile service and start its workers.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Number of concurrent compiles. Default is the number of CPUs.
+        timeout : float, optional
+            Default per-job timeout in seconds. Default is 60.
+        engine : str, optional
+            The LaTeX engine executable. Default is 'pdflatex'.
+        format_cache : FormatCache, optional
+            Cache of precompiled preamble formats. Default is None.
+        max_pending : int, optional
+            Maximum number of queued jobs before submit blocks. Default is unbounded.
+        """
+        self.engine = engine
+        self.timeout = timeout
+        self.format_cache = format_cache
+        self.scratch_root = scratch_root()
+        self.jobs = queue.Queue(maxsize=max_pending or 0)
+        self._format_lock = threading.Lock()
+        self.workers = [_Worker(self, i) for i in range(workers or os.cpu_count() or 1)]
+        for worker in self.workers:
+            worker.start()
+
+    def format_for(self, preamble):
+        """
+        Get the precompiled format for a preamble, dumping it if needed.
+
+        Parameters
+        ----------
+        preamble : str or None
+            The document preamble, or None to compile without a format.
+
+        Returns
+        -------
+        str or None
+            The format name, or None if no format is used.
+        """
+        if preamble is None or self.format_cache is None:
+            return None
+        with self._format_lock:
+            return self.format_cache.ensure(preamble, self.engine)
+
+    def submit(self, tex, preamble=None, timeout=None):
+        """
+        Queue a LaTeX document for compilation.
+
+        Parameters
+        ----------
+        tex : str
+            The complete LaTeX document.
+        preamble : str, optional
+            The document's preamble, to compile from a precompiled format.
+        timeout : float, optional
+            Job timeout in seconds. Default is the service timeout.
+
+        Returns
+        -------
+        Future
+            Resolves to the PDF bytes, or raises CompileError.
+        """
+        job = _Job(tex, preamble, timeout or self.timeout)
+        self.jobs.put(job)
+        return job.future
+
+    def compile(self, tex, preamble=None, timeout=None):
+        """
+        Compile a LaTeX document and wait for the PDF.
+
+        Parameters
+        ----------
+        tex : str
+            The complete LaTeX document.
+        preamble : str, optional
+            The document's preamble, to compile from a precompiled format.
+        timeout : float, optional
+            Job timeout in seconds. Default is the service timeout.
+
+        Returns
+        -------
+        bytes
+            The compiled PDF.
+
+        Raises
+        ------
+        CompileError
+            If compilation fails or times out.
+        """
+        return self.submit(tex, preamble, timeout).result()
+
+    @property
+    def restarts(self):
+        """Total number of times a worker has been restarted."""
+        return sum(worker.restarts for worker in self.workers)
+
+    def close(self):
+        """
+        Stop the workers once queued jobs are done and remove scratch directories.
+
+        Returns
+        -------
+        None
+        """
+        for _ in self.workers:
+            self.jobs.put(None)
+        for worker in self.workers:
+            worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
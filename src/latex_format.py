@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+LaTeX Format Cache - precompiles the fixed preamble into a format file.
+"""
+import hashlib
+import os
+import subprocess
+from pathlib import Path
+
+from atomic_io import atomic_copy, build_directory
+from build_cache import latex_engine_version
+
+
+# Appended to the preamble before dumping. Once the format is loaded, the
+# preamble in the document is skipped: \documentclass swallows everything up
+# to the first \begin, which is \begin{document}.
+DUMP_SUFFIX = (
+    r"\long\def\documentclass#1\begin{\begin}" + "\n"
+    r"\dump" + "\n"
+)
+
+
+class FormatCache:
+    """
+    Cache of LaTeX format files dumped from document preambles.
+
+    Loading packages is a large fixed cost of every compile. Dumping the
+    preamble into a format file once lets later compiles start with the
+    packages already loaded. Formats are keyed by a hash of the preamble
+    text and the engine version, so they are rebuilt automatically when
+    either changes.
+    """
+
+    # Number of format files kept before the least recently used are removed
+    MAX_ENTRIES = 4
+
+    def __init__(self, cache_dir):
+        """
+        Initialize the format cache.
+
+        Parameters
+        ----------
+        cache_dir : str or Path
+            Directory format files are stored in.
+        """
+        self.cache_dir = Path(cache_dir)
+
+    def key(self, preamble, engine='pdflatex'):
+        """
+        Compute the format name for a preamble.
+
+        Parameters
+        ----------
+        preamble : str
+            The LaTeX preamble.
+        engine : str, optional
+            The LaTeX engine. Default is 'pdflatex'.
+
+        Returns
+        -------
+        str
+            Format name identifying the preamble, engine and engine version.
+        """
+        digest = hashlib.sha256()
+        digest.update(engine.encode('utf-8') + b'\0')
+        digest.update(latex_engine_version(engine).encode('utf-8') + b'\0')
+        digest.update(preamble.encode('utf-8'))
+        return f'cv-preamble-{digest.hexdigest()[:16]}'
+
+    def ensure(self, preamble, engine='pdflatex'):
+        """
+        Get the format for a preamble, dumping it if it is not cached.
+
+        Parameters
+        ----------
+        preamble : str
+            The LaTeX preamble.
+        engine : str, optional
+            The LaTeX engine. Default is 'pdflatex'.
+
+        Returns
+        -------
+        str or None
+            The format name, or None if the format could not be dumped.
+        """
+        name = self.key(preamble, engine)
+        fmt_path = self.cache_dir / f'{name}.fmt'
+        try:
+            # Mark as recently used; touch() would recreate a pruned format empty
+            os.utime(fmt_path)
+            return name
+        except FileNotFoundError:
+            pass
+
+        # Dump in a private directory so concurrent builds never see a
+        # partly written format
+        print("Precompiling LaTeX preamble...")
+        with build_directory(prefix='cv-format-') as build_dir:
+            build_dir = Path(build_dir)
+            source_path = build_dir / f'{name}.tex'
+            source_path.write_text(preamble + DUMP_SUFFIX, encoding='utf-8')
+            result = subprocess.run(
+                [engine, '-ini', '-interaction=nonstopmode', f'-jobname={name}',
+                 f'&{engine}', source_path.name],
+                cwd=build_dir,
+                capture_output=True,
+                text=True
+            )
+            dumped_path = build_dir / f'{name}.fmt'
+            if result.returncode != 0 or not dumped_path.exists():
+                print("Preamble precompilation failed, compiling without a format file")
+                return None
+            atomic_copy(dumped_path, fmt_path)
+        self.prune()
+        return name
+
+    def environment(self):
+        """
+        Get the process environment that lets the engine find cached formats.
+
+        Returns
+        -------
+        dict
+            A copy of os.environ with the cache directory on TEXFORMATS.
+        """
+        env = dict(os.environ)
+        # The trailing separator keeps the engine's default search path
+        env['TEXFORMATS'] = str(self.cache_dir.resolve()) + os.pathsep + env.get('TEXFORMATS', '')
+        return env
+
+    def prune(self):
+        """
+        Remove the least recently used formats beyond MAX_ENTRIES.
+
+        Returns
+        -------
+        None
+        """
+        entries = []
+        for path in self.cache_dir.glob('*.fmt'):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                # Pruned by another process meanwhile
+                continue
+        entries.sort(reverse=True)
+        for _, path in entries[self.MAX_ENTRIES:]:
+            for stale in self.cache_dir.glob(f'{path.stem}.*'):
+                stale.unlink(missing_ok=True)
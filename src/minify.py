@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Minify - shrinks generated HTML, CSS and JavaScript and precompresses it.
+"""
+import gzip
+import re
+from pathlib import Path
+
+from output_store import output_store
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Elements around which whitespace never renders, so it can be dropped
+# entirely; between other (inline) elements it is collapsed to one space
+BLOCK_TAGS = frozenset((
+    'html', 'head', 'body', 'meta', 'link', 'title', 'script', 'style',
+    'header', 'footer', 'main', 'aside', 'article', 'section', 'nav',
+    'div', 'p', 'ul', 'ol', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'br', 'hr', 'table', 'thead', 'tbody', 'tr', 'td', 'th', '!doctype',
+))
+
+# Comments, then elements whose contents are not HTML or are kept as
+# written, then any other tag
+_HTML_TOKEN = re.compile(
+    r'<!--.*?-->'
+    r'|<(?P<raw>script|style|pre|textarea)\b[^>]*>.*?</(?P=raw)\s*>'
+    r'|<[^>]+>',
+    re.DOTALL | re.IGNORECASE
+)
+_TAG_NAME = re.compile(r'</?\s*([!\w-]+)')
+_WHITESPACE = re.compile(r'\s+')
+
+_CSS_TOKEN = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|/\*.*?\*/|\s+|[^"\'/\s]+|/', re.DOTALL)
+_CSS_TIGHT = re.compile(r'\s*([{};,])\s*')
+
+# Characters after which a '/' starts a regular expression literal rather
+# than a division
+_JS_REGEX_PREFIX = '(,=:[!&|?{};+-*%<>~^'
+
+
+def minify_css(text):
+    """
+    Minify a stylesheet.
+
+    Removes comments, collapses whitespace and drops it around braces,
+    semicolons and commas, and drops the last semicolon of each block.
+    Strings are left untouched. Whitespace around ':' is kept where it
+    separates selectors, e.g. 'div :first-child'.
+
+    Parameters
+    ----------
+    text : str
+        The CSS.
+
+    Returns
+    -------
+    str
+        The minified CSS.
+    """
+    parts = []
+    for token in _CSS_TOKEN.findall(text):
+        if token.startswith('/*'):
+            # A comment separates tokens like whitespace
+            parts.append(' ')
+        elif token.isspace():
+            parts.append(' ')
+        elif token[0] in '"\'':
+            # Protect strings from the whitespace rules below
+            parts.append(token.replace(' ', '\0'))
+        else:
+            parts.append(token)
+    css = _WHITESPACE.sub(' ', ''.join(parts))
+    css = _CSS_TIGHT.sub(r'\1', css)
+    css = re.sub(r'([^\s]):\s+', r'\1:', css)
+    css = css.replace(';}', '}')
+    return css.replace('\0', ' ').strip()
+
+
+def minify_js(text):
+    """
+    Minify inline JavaScript conservatively.
+
+    Removes comments, indentation and blank lines. Line breaks are kept,
+    so statements relying on automatic semicolon insertion still work.
+    Strings, template literals and regular expression literals are left
+    untouched.
+
+    Parameters
+    ----------
+    text : str
+        The JavaScript.
+
+    Returns
+    -------
+    str
+        The minified JavaScript.
+    """
+    # Code is collected in runs between literals, whose text is kept as is
+    parts = []
+    code = []
+    i = 0
+    length = len(text)
+    previous = ''
+
+    def literal(end):
+        parts.append(_squeeze_js(''.join(code)))
+        code.clear()
+        parts.append(text[i:end])
+
+    while i < length:
+        char = text[i]
+        if char in '"\'`':
+            # String or template literal
+            end = i + 1
+            while end < length and text[end] != char:
+                end += 2 if text[end] == '\\' else 1
+            literal(end + 1)
+            i = end + 1
+            previous = char
+        elif text.startswith('//', i):
+            end = text.find('\n', i)
+            i = length if end == -1 else end
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = length if end == -1 else end + 2
+            code.append(' ')
+        elif char == '/' and (not previous or previous in _JS_REGEX_PREFIX):
+            # Regular expression literal, which may contain '/' in a class
+            end = i + 1
+            in_class = False
+            while end < length and (in_class or text[end] != '/') and text[end] != '\n':
+                if text[end] == '\\':
+                    end += 1
+                elif text[end] == '[':
+                    in_class = True
+                elif text[end] == ']':
+                    in_class = False
+                end += 1
+            literal(end + 1)
+            i = end + 1
+            previous = '/'
+        else:
+            code.append(char)
+            if not char.isspace():
+                previous = char
+            i += 1
+    parts.append(_squeeze_js(''.join(code)))
+    return ''.join(parts).strip()
+
+
+def _squeeze_js(code):
+    """Drop indentation and blank lines from JavaScript code between literals."""
+    code = re.sub(r'[ \t]*\n\s*', '\n', code)
+    return re.sub(r'[ \t]+', ' ', code)
+
+
+def _tag_name(tag):
+    """Get the lower-cased element name of a tag, or '' for a comment."""
+    match = _TAG_NAME.match(tag)
+    return match.group(1).lower() if match else ''
+
+
+def _append_text(tokens, text):
+    """Add text to a token list, joining it to text left by a removed comment."""
+    if not text:
+        return
+    if tokens and tokens[-1][0] == 'text':
+        tokens[-1] = ('text', tokens[-1][1] + text)
+    else:
+        tokens.append(('text', text))
+
+
+def minify_html(text):
+    """
+    Minify an HTML document.
+
+    Removes comments and collapses whitespace between tags: whitespace next
+    to a block element is dropped, other runs become one space, so inline
+    content renders the same. Inline scripts and styles are minified, and
+    the contents of pre and textarea elements are kept as they are.
+
+    Parameters
+    ----------
+    text : str
+        The HTML.
+
+    Returns
+    -------
+    str
+        The minified HTML.
+    """
+    tokens = []
+    position = 0
+    for match in _HTML_TOKEN.finditer(text):
+        _append_text(tokens, text[position:match.start()])
+        position = match.end()
+        token = match.group(0)
+        raw = (match.group('raw') or '').lower()
+        if token.startswith('<!--'):
+            continue
+        if raw in ('script', 'style'):
+            open_end = token.index('>') + 1
+            close_start = token.lower().rindex('</')
+            body = token[open_end:close_start]
+            body = minify_js(body) if raw == 'script' else minify_css(body)
+            token = token[:open_end] + body + token[close_start:]
+        tokens.append(('tag', token))
+    _append_text(tokens, text[position:])
+
+    out = []
+    for i, (kind, token) in enumerate(tokens):
+        if kind == 'tag':
+            out.append(token)
+            continue
+        collapsed = _WHITESPACE.sub(' ', token)
+        if collapsed == ' ':
+            neighbours = [tokens[j][1] for j in (i - 1, i + 1) if 0 <= j < len(tokens)]
+            if len(neighbours) < 2 or any(_tag_name(tag) in BLOCK_TAGS for tag in neighbours):
+                continue
+        else:
+            # Text next to a block element needs no padding on that side
+            if i == 0 or _tag_name(tokens[i - 1][1]) in BLOCK_TAGS:
+                collapsed = collapsed.lstrip()
+            if i == len(tokens) - 1 or _tag_name(tokens[i + 1][1]) in BLOCK_TAGS:
+                collapsed = collapsed.rstrip()
+        out.append(collapsed)
+    return ''.join(out)
+
+
+def _format_bytes(size, original):
+    """Format a size with its saving relative to the original size."""
+    saving = 100 * (1 - size / original) if original else 0.0
+    return f"{size:,} B (-{saving:.0f}%)"
+
+
+def publish(path, text, minifier):
+    """
+    Write a minified file with gzip and brotli compressed siblings.
+
+    The .gz and .br files are compressed at the highest level once here,
+    so a static host can serve them directly to clients that accept
+    them instead of compressing on every request. The .br file is only
+    written if the brotli package is installed. The gzip header carries
+    no timestamp, so unchanged content gives identical files, which the
+    output store leaves untouched.
+
+    Parameters
+    ----------
+    path : str or Path
+        The file to write, e.g. 'index.html'.
+    text : str
+        The unminified contents.
+    minifier : callable
+        Function minifying the text, e.g. minify_html.
+
+    Returns
+    -------
+    str
+        A line reporting the byte size of each artifact and its saving
+        over the unminified text.
+    """
+    path = Path(path)
+    store = output_store(path.parent)
+    original = len(text.encode('utf-8'))
+    data = minifier(text).encode('utf-8')
+    store.publish(path, data)
+    sizes = [f"{original:,} B -> {_format_bytes(len(data), original)} minified"]
+
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    store.publish(path.with_name(path.name + '.gz'), compressed)
+    sizes.append(f"{_format_bytes(len(compressed), original)} .gz")
+
+    if brotli is not None:
+        compressed = brotli.compress(data, quality=11)
+        store.publish(path.with_name(path.name + '.br'), compressed)
+        sizes.append(f"{_format_bytes(len(compressed), original)} .br")
+    else:
+        # A .br file from a build with brotli would no longer match
+        store.remove(path.with_name(path.name + '.br'))
+        sizes.append("no .br (brotli not installed)")
+    return f"  {path.name}: {', '.join(sizes)}"
+
+
+def unpublish(path, keep_file=False):
+    """
+    Remove a file written by publish and its compressed siblings.
+
+    A static host serves the .gz or .br file in place of the file itself
+    when they exist, so they must not outlive a change to the file.
+
+    Parameters
+    ----------
+    path : str or Path
+        The file, e.g. 'index.html'.
+    keep_file : bool, optional
+        If True, only remove the .gz and .br siblings, e.g. of a file that
+        is now published unminified. Default is False.
+
+    Returns
+    -------
+    None
+    """
+    path = Path(path)
+    store = output_store(path.parent)
+    for suffix in ('.gz', '.br'):
+        store.remove(path.with_name(path.name + suffix))
+    if not keep_file:
+        store.remove(path)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Output Builder - collects generated document chunks.
+"""
+
+
+class OutputBuilder:
+    """
+    Collect generated output as a sequence of chunks.
+
+    Generators emit each piece of markup as a separate chunk rather than
+    growing one string, so building a document is linear in its size. The
+    chunks are kept until the document is written out, and can be written
+    one at a time without joining them first.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty output builder.
+        """
+        self.chunks = []
+        self.length = 0
+
+    def write(self, chunk):
+        """
+        Emit a chunk of output.
+
+        Parameters
+        ----------
+        chunk : str
+            The text to emit.
+
+        Returns
+        -------
+        None
+        """
+        self.length += len(chunk)
+        self.chunks.append(chunk)
+
+    def writelines(self, chunks):
+        """
+        Emit several chunks of output.
+
+        Parameters
+        ----------
+        chunks : iterable of str
+            The texts to emit, in order.
+
+        Returns
+        -------
+        None
+        """
+        for chunk in chunks:
+            self.write(chunk)
+
+    def write_to(self, stream):
+        """
+        Write buffered chunks to a stream without joining them first.
+
+        Parameters
+        ----------
+        stream : file-like
+            Text stream to write to.
+
+        Returns
+        -------
+        None
+        """
+        stream.writelines(self.chunks)
+
+    def getvalue(self):
+        """
+        Get the buffered output as a single string.
+
+        Returns
+        -------
+        str
+            All buffered chunks joined together.
+        """
+        return ''.join(self.chunks)
+
+    def __len__(self):
+        """
+        Get the number of characters emitted so far.
+
+        Returns
+        -------
+        int
+            Total length of all chunks emitted.
+        """
+        return self.length
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Output Store - content-addressed storage for published CV artifacts.
+"""
+import hashlib
+import json
+import os
+import secrets
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+from atomic_io import atomic_copy, atomic_write_bytes
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+# Store directory, relative to the output directory it holds the files of
+STORE_DIR = '.store'
+
+
+def _file_digest(path):
+    """Compute the SHA-256 hex digest of a file, reading it in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _same_contents(path, blob, digest, size):
+    """Check whether a published file already holds the data with a digest, as a link to blob or a copy."""
+    try:
+        if path.stat().st_size != size:
+            return False
+    except FileNotFoundError:
+        return False
+    try:
+        if os.path.samefile(path, blob):
+            return True
+    except FileNotFoundError:
+        pass
+    return _file_digest(path) == digest
+
+
+class OutputStore:
+    """
+    Stores each published artifact once, under the hash of its contents.
+
+    Each output directory has its own store, '<directory>/.store'.
+    Artifacts are written to '.store/<sha256>', and their public names
+    (e.g. 'CV - Name.pdf' or 'index.html') are hard links to the
+    stored file, moved into place atomically, so a reader such as a web
+    server always sees a complete file. Where hard links are not possible
+    (another filesystem, or no support), the public file is an atomic
+    copy instead. Identical artifacts of different variants or runs share
+    one stored file, and publishing unchanged contents leaves the public
+    file alone, keeping its modification time for downstream caches.
+
+    A manifest records which hash each public name, relative to the
+    output directory, was last published with; stored files no name
+    refers to any more are removed. Each publish links the file and
+    re-reads and updates the manifest under a file lock, so processes
+    publishing to the same directory at once (e.g. batch workers) see
+    each other's entries. Without fcntl
+    (Windows) there is no lock; removing a stored file never affects a
+    public one, which is a separate link to the same data, so a lost
+    update can only leave an extra stored file behind.
+    """
+
+    def __init__(self, directory):
+        """
+        Initialize the output store.
+
+        Parameters
+        ----------
+        directory : str or Path
+            The output directory whose files are published, e.g. 'output'.
+        """
+        self.directory = Path(directory).resolve()
+        self.root = self.directory / STORE_DIR
+        self.manifest_path = self.root / 'manifest.json'
+        self.lock_path = self.root / '.lock'
+
+    def read_manifest(self):
+        """
+        Read the manifest.
+
+        Returns
+        -------
+        dict
+            The hash each public name was last published with.
+        """
+        try:
+            return json.loads(self.manifest_path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    @contextmanager
+    def _locked(self):
+        """Hold the store's lock file, where file locking is available."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def publish(self, path, data):
+        """
+        Publish an artifact under a public name.
+
+        Contents given as chunks are hashed and written to a temporary file
+        in the store as they are produced, so a large document is never
+        held in memory whole.
+
+        Parameters
+        ----------
+        path : str or Path
+            The public file, in the store's output directory or below it.
+        data : bytes or iterable of bytes
+            The artifact contents, whole or in chunks.
+
+        Returns
+        -------
+        bool
+            True if the public file was written, False if it already had
+            these contents and was left unchanged.
+        """
+        path = Path(path)
+        staged = None
+        if isinstance(data, (bytes, bytearray)):
+            digest = hashlib.sha256(data).hexdigest()
+            size = len(data)
+        else:
+            staged, digest, size = self._stage(data)
+        blob = self.root / digest
+        try:
+            with self._locked():
+                if _same_contents(path, blob, digest, size):
+                    if not blob.exists():
+                        self._store(blob, path)
+                    self._record(path, digest)
+                    return False
+
+                if not blob.exists():
+                    if staged is not None:
+                        os.replace(staged, blob)
+                        staged = None
+                    else:
+                        atomic_write_bytes(blob, data)
+                self._link(blob, path)
+                self._record(path, digest)
+        finally:
+            if staged is not None:
+                staged.unlink(missing_ok=True)
+        return True
+
+    def remove(self, path):
+        """
+        Remove a published artifact.
+
+        Parameters
+        ----------
+        path : str or Path
+            The public file.
+
+        Returns
+        -------
+        None
+        """
+        path = Path(path)
+        if not self.root.exists():
+            # Nothing was published through this store, so there is no record
+            path.unlink(missing_ok=True)
+            return
+        with self._locked():
+            path.unlink(missing_ok=True)
+            self._record(path, None)
+
+    def _stage(self, chunks):
+        """Write chunks to a temporary file in the store, returning it with their digest and size."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        staged = self.root / f'.{secrets.token_hex(8)}.tmp'
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(staged, 'wb') as f:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+        except BaseException:
+            staged.unlink(missing_ok=True)
+            raise
+        return staged, digest.hexdigest(), size
+
+    def _store(self, blob, path):
+        """Add the contents already published at path to the store, linking to it if possible."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, blob)
+        except FileExistsError:
+            pass
+        except OSError:
+            atomic_copy(path, blob)
+
+    def _link(self, blob, path):
+        """Move a hard link to a stored file into place at path, or a copy if linking fails."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f'.{path.name}.{secrets.token_hex(8)}.tmp')
+        try:
+            os.link(blob, temporary)
+        except OSError:
+            atomic_copy(blob, path)
+            return
+        os.replace(temporary, path)
+        # Renaming onto another link to the same file leaves both in place
+        temporary.unlink(missing_ok=True)
+
+    def _record(self, path, digest):
+        """Record the hash a public name has (None once removed), removing a stored file no longer used."""
+        # Called with the lock held, so the manifest read is current
+        name = path.resolve().relative_to(self.directory).as_posix()
+        manifest = self.read_manifest()
+        previous = manifest.get(name)
+        if previous == digest:
+            return
+        if digest is None:
+            del manifest[name]
+        else:
+            manifest[name] = digest
+        atomic_write_bytes(
+            self.manifest_path,
+            json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8')
+        )
+        if previous is not None and previous not in manifest.values():
+            (self.root / previous).unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=None)
+def _store_for(directory):
+    """Get the store of a resolved output directory."""
+    return OutputStore(directory)
+
+
+def output_store(directory):
+    """
+    Get the store of an output directory, shared within this process.
+
+    Parameters
+    ----------
+    directory : str or Path
+        The output directory, e.g. 'output', or '.' for index.html.
+
+    Returns
+    -------
+    OutputStore
+        The store in '<directory>/.store'.
+    """
+    return _store_for(Path(directory).resolve())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Page Fit - searches layout settings for a target PDF page count.
+"""
+import json
+import re
+from pathlib import Path
+
+from atomic_io import atomic_write_bytes
+
+
+# Layout at the loosest, default and tightest tightness (0, 0.5 and 1):
+# page margin in inches, vertical spacing as a multiple of the template
+# values, and font size as a multiple of the document's 11pt sizes
+LOOSE_LAYOUT = {'margin': 0.75, 'spacing': 1.5, 'font_scale': 1.05}
+DEFAULT_LAYOUT = {'margin': 0.5, 'spacing': 1.0, 'font_scale': 1.0}
+TIGHT_LAYOUT = {'margin': 0.3, 'spacing': 0.5, 'font_scale': 0.9}
+
+# Tightness of the default layout
+DEFAULT_TIGHTNESS = 0.5
+
+# Most layouts tried while fitting; each untried one costs a compile
+MAX_ATTEMPTS = 6
+
+_PAGE_COUNT = re.compile(r'Output written on .*?\((\d+) pages?')
+
+
+def layout_for(tightness):
+    """
+    Get the layout for a tightness.
+
+    Each setting is interpolated linearly between its loose and default
+    values for tightness below 0.5, and between its default and tight
+    values above, so pages hold more the higher the tightness.
+
+    Parameters
+    ----------
+    tightness : float
+        From 0 (loosest) to 1 (tightest).
+
+    Returns
+    -------
+    dict
+        Layout settings, rounded so equal tightness gives identical LaTeX.
+    """
+    if tightness <= DEFAULT_TIGHTNESS:
+        start, end = LOOSE_LAYOUT, DEFAULT_LAYOUT
+        fraction = tightness / DEFAULT_TIGHTNESS
+    else:
+        start, end = DEFAULT_LAYOUT, TIGHT_LAYOUT
+        fraction = (tightness - DEFAULT_TIGHTNESS) / (1 - DEFAULT_TIGHTNESS)
+    return {
+        name: round(start[name] + (end[name] - start[name]) * fraction, 3)
+        for name in DEFAULT_LAYOUT
+    }
+
+
+def read_page_count(log_text):
+    """
+    Read the number of pages from a pdflatex log.
+
+    Parameters
+    ----------
+    log_text : str
+        The .log file contents.
+
+    Returns
+    -------
+    int or None
+        The page count, 0 if no pages were output, or None if the log
+        does not say.
+    """
+    match = _PAGE_COUNT.search(log_text)
+    if match:
+        return int(match.group(1))
+    if 'No pages of output' in log_text:
+        return 0
+    return None
+
+
+def fit_tightness(count_pages, target, max_attempts=MAX_ATTEMPTS):
+    """
+    Find the loosest tightness that fits a document on a number of pages.
+
+    The page count only grows as the layout loosens, so the search starts
+    from the default layout, checks that the target is reachable in the
+    direction it needs to go, and then bisects between a tightness that
+    gives too many pages and one that does not.
+
+    Parameters
+    ----------
+    count_pages : callable
+        Function taking a tightness and returning the page count.
+    target : int
+        The page count to reach.
+    max_attempts : int, optional
+        Most tightness values to try. Default is MAX_ATTEMPTS.
+
+    Returns
+    -------
+    tuple
+        (tightness, page count). If the target cannot be reached, the
+        tightest layout when the document is too long, or the default
+        layout when it is too short.
+    """
+    pages = count_pages(DEFAULT_TIGHTNESS)
+    attempts = 1
+    if pages == target:
+        return DEFAULT_TIGHTNESS, pages
+
+    if pages > target:
+        # Too long: tighten, if the tightest layout is short enough
+        tightest = count_pages(1.0)
+        attempts += 1
+        if tightest > target:
+            return 1.0, tightest
+        low, high, high_pages = DEFAULT_TIGHTNESS, 1.0, tightest
+    else:
+        # Too short: loosen, if the loosest layout reaches the target
+        loosest = count_pages(0.0)
+        attempts += 1
+        if loosest < target:
+            return DEFAULT_TIGHTNESS, pages
+        if loosest == target:
+            return 0.0, loosest
+        low, high, high_pages = 0.0, DEFAULT_TIGHTNESS, pages
+
+    # low gives more pages than the target, high no more
+    while attempts < max_attempts:
+        middle = round((low + high) / 2, 4)
+        middle_pages = count_pages(middle)
+        attempts += 1
+        if middle_pages > target:
+            low = middle
+        else:
+            high, high_pages = middle, middle_pages
+    return high, high_pages
+
+
+class PageCountCache:
+    """
+    JSON file recording the page count of each compiled document.
+
+    Keyed by the build cache key of the LaTeX source, so a layout is only
+    compiled once for a given document and engine, across runs.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the page count cache.
+
+        Parameters
+        ----------
+        path : str or Path
+            The JSON file, e.g. 'output/.fit-cache.json'.
+        """
+        self.path = Path(path)
+        try:
+            self.counts = json.loads(self.path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            self.counts = {}
+
+    def get(self, key):
+        """
+        Look up the page count of a document.
+
+        Parameters
+        ----------
+        key : str
+            The build cache key of the document.
+
+        Returns
+        -------
+        int or None
+            The page count, or None if the document has not been compiled.
+        """
+        return self.counts.get(key)
+
+    def put(self, key, pages):
+        """
+        Record the page count of a document.
+
+        Parameters
+        ----------
+        key : str
+            The build cache key of the document.
+        pages : int
+            Its page count.
+
+        Returns
+        -------
+        None
+        """
+        self.counts[key] = pages
+        atomic_write_bytes(self.path, json.dumps(self.counts, indent=2, sort_keys=True).encode('utf-8'))
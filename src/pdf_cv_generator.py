@@ -2,11 +2,18 @@
 """
 PDF CV Generator - generates CV as PDF via LaTeX.
 """
-import re
 import subprocess
 import sys
 from pathlib import Path
 from abstract_cv_generator import AbstractCvGenerator
+from atomic_io import atomic_copy, build_directory
+from build_cache import BuildCache
+from escaping import escape_latex
+from inline_markup import markup_latex
+from latex_compile_service import CompileError
+from latex_format import FormatCache
+from output_store import output_store
+from page_fit import DEFAULT_LAYOUT, PageCountCache, fit_tightness, layout_for, read_page_count
 
 
 class PdfCvGenerator(AbstractCvGenerator):
@@ -18,7 +25,43 @@ class PdfCvGenerator(AbstractCvGenerator):
     with appropriate LaTeX formatting.
     """
     
-    def __init__(self, anonymous=False):
+    TEMPLATE_SYNTAX = 'latex'
+    
+    SECTION_DATA = {
+        'header': ('personal',),
+        'summary': ('personal',),
+        'experience': ('experience',),
+        'education': ('education',),
+        'skills': ('skills',),
+        'publications': ('publications',),
+        'awards': ('awards',),
+        'hobbies': ('hobbies',),
+        'footer': (),
+    }
+    
+    # Layout settings: margin in inches, vertical spacing and font size
+    # multiples. Other sections' spacing scales with the \cvunit length
+    # the header sets, so they do not depend on the layout.
+    DEFAULT_LAYOUT = DEFAULT_LAYOUT
+    
+    # Only the name and layout in the header and the hidden jobs vary
+    # between variants
+    SECTION_FLAGS = {
+        'header': ('anonymous', 'layout'),
+        'summary': (),
+        'experience': ('include_hidden',),
+        'education': (),
+        'skills': (),
+        'publications': (),
+        'awards': (),
+        'hobbies': (),
+        'footer': (),
+    }
+    
+    def __init__(self, anonymous=False, data_path=None, output_dir=None,
+                 cv_data=None, fragment_cache=None, force=False, build_cache=None,
+                 use_format=False, compile_service=None, tracer=None,
+                 include_hidden=False, section_store=None, layout=None, fit_pages=None):
         """
         Initialize the PDF CV generator.
         
@@ -26,16 +69,95 @@ class PdfCvGenerator(AbstractCvGenerator):
         ----------
         anonymous : bool, optional
             If True, generates an anonymized CV without personal name. Default is False.
+        data_path : str or Path, optional
+            Path to the CV data JSON file. Default is 'data/cv-data.json'.
+        output_dir : str or Path, optional
+            Directory for the LaTeX source and PDF. Default is 'output'.
+        cv_data : CvData or dict, optional
+            Already loaded CV data. If given, data_path is not read.
+        fragment_cache : FragmentCache, optional
+            Cache of rendered sections. Default is None (no caching).
+        force : bool, optional
+            If True, always run pdflatex even if the build cache has a PDF
+            for identical LaTeX. Default is False.
+        build_cache : BuildCache, optional
+            Cache of compiled PDFs, shared between generators. Default is a
+            cache in '.build-cache' inside the output directory.
+        use_format : bool, optional
+            If True, compile from a precompiled format file of the preamble,
+            cached in '.format-cache' inside the output directory. Default is False.
+        compile_service : LatexCompileService, optional
+            Pool of warm LaTeX workers to compile on, instead of starting
+            pdflatex directly. Default is None.
+        tracer : Tracer, optional
+            Records the time and memory each build step takes, including
+            the pdflatex run. Default is None.
+        include_hidden : bool, optional
+            If True, include jobs marked hideOnPdf, and add ' (complete)' to
+            the file name. Default is False.
+        section_store : SectionStore, optional
+            Sections already rendered by other variants of the same CV.
+            Default is None.
+        layout : dict, optional
+            Layout settings overriding DEFAULT_LAYOUT. Default is None.
+        fit_pages : int, optional
+            If given, search for the loosest layout that fits the CV on this
+            many pages before writing it (see fit_to_pages). Default is None.
+        
+        Raises
+        ------
+        ValueError
+            If fit_pages is less than 1.
         """
-        super().__init__(anonymous)
+        if fit_pages is not None and fit_pages < 1:
+            raise ValueError(f"fit_pages must be at least 1, got {fit_pages}")
+        super().__init__(anonymous, data_path, output_dir, cv_data, fragment_cache, tracer,
+                         section_store)
+        self.include_hidden = include_hidden
+        self.layout = {**self.DEFAULT_LAYOUT, **(layout or {})}
+        self.fit_pages = fit_pages
+        self.force = force
+        self.build_cache = build_cache or BuildCache(self.output_dir / '.build-cache')
+        self.format_cache = FormatCache(self.output_dir / '.format-cache') if use_format else None
+        self.compile_service = compile_service
+    
+    def default_output_dir(self):
+        """
+        Get the default output directory for PDF output.
+        
+        Returns
+        -------
+        Path
+            The 'output' directory.
+        """
+        return Path('output')
+    
+    def cache_flags(self):
+        """
+        Get the generator options that change how sections are rendered.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        dict
+            Option names and values, included in fragment cache keys.
+        """
+        return {
+            **super().cache_flags(),
+            'include_hidden': self.include_hidden,
+            'layout': tuple(sorted(self.layout.items())),
+        }
     
     def escape_text(self, text):
         """
         Escape special LaTeX characters.
         
         Escapes characters that have special meaning in LaTeX to ensure they
-        are rendered correctly in the output. The backslash is escaped first
-        to avoid double-escaping.
+        are rendered correctly in the output. Escaping is done in a single
+        pass, so replacement text is never escaped again, and is memoized.
         
         Parameters
         ----------
@@ -49,57 +171,169 @@ class PdfCvGenerator(AbstractCvGenerator):
         """
         if not isinstance(text, str):
             text = str(text)
-        
-        # Must escape backslash first to avoid double-escaping
-        replacements = [
-            ('\\', r'\textbackslash{}'),
-            ('&', r'\&'),
-            ('%', r'\%'),
-            ('$', r'\$'),
-            ('#', r'\#'),
-            ('_', r'\_'),
-            ('{', r'\{'),
-            ('}', r'\}'),
-            ('~', r'\textasciitilde{}'),
-            ('^', r'\textasciicircum{}'),
-        ]
-        
-        result = text
-        for char, replacement in replacements:
-            result = result.replace(char, replacement)
-        return result
+        return escape_latex(text)
     
     def format_links(self, text):
         """
-        Format markdown-style links for LaTeX/PDF.
+        Format markdown-style inline markup for LaTeX/PDF.
         
-        Converts [link text](url) to \href{url}{link text}.
-        After escaping for LaTeX safety.
+        Converts [link text](url) to \href{url}{link text} and **bold**,
+        *italic* and `code` to the matching font commands, escaping the
+        rest. The text must not be escaped already, so each part is
+        escaped once: link URLs keep their underscores.
         
         Parameters
         ----------
         text : str
-            The text containing markdown-style links [text](url).
+            The unescaped text, which may contain markup such as [text](url).
         
         Returns
         -------
         str
-            The text with links converted to LaTeX \href commands.
+            The escaped text with markup converted to LaTeX commands.
         """
         if not isinstance(text, str):
             text = str(text)
+        return markup_latex(text)
+    
+    def preamble(self):
+        """
+        Get the LaTeX document preamble.
+        
+        The preamble is the same for every document, so it can be dumped
+        once into a precompiled format file (see FormatCache). It is read
+        from templates/latex/preamble.tex.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        str
+            Everything before \begin{document}.
+        """
+        return self.render_template('preamble')
+    
+    def font_size(self, size):
+        """
+        Scale a font size or line spacing by the layout's font scale.
+        
+        Parameters
+        ----------
+        size : float
+            The size in points at the document's 11pt base size.
         
-        # Pattern: [text](url)
-        # Group 1: link text, Group 2: URL
-        def replace_link(match):
-            link_text = match.group(1)
-            url = match.group(2)
-            # Escape the link text and URL for LaTeX
-            escaped_text = self.escape_text(link_text)
-            escaped_url = self.escape_text(url)
-            return rf'\href{{{escaped_url}}}{{{escaped_text}}}'
-        
-        return re.sub(r'\[([^\]]+)\]\(([^\)]+)\)', replace_link, text)
+        Returns
+        -------
+        str
+            The scaled size, e.g. '10.5pt'.
+        """
+        return f"{round(size * self.layout['font_scale'], 2)}pt"
+    
+    def render(self):
+        """
+        Render all sections, first fitting the layout if fit_pages is set.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        OutputBuilder
+            The builder the document was rendered into.
+        """
+        if self.fit_pages is not None:
+            with self.tracer.span('fit_to_pages', target=self.fit_pages):
+                self.fit_to_pages(self.fit_pages)
+            self.fit_pages = None
+        return super().render()
+    
+    def fit_to_pages(self, target):
+        """
+        Set the loosest layout that fits the CV on a number of pages.
+        
+        Margins, spacing and font size are searched together as one
+        tightness (see page_fit.fit_tightness), compiling each layout tried
+        and reading its page count from the pdflatex log. Page counts are
+        recorded in '.fit-cache.json' in the output directory and compiled
+        PDFs in the build cache, so repeated fits, and writing the chosen
+        layout, do not compile again.
+        
+        Parameters
+        ----------
+        target : int
+            The page count to reach.
+        
+        Returns
+        -------
+        None
+        """
+        page_counts = PageCountCache(self.output_dir / '.fit-cache.json')
+        compiles = 0
+        
+        def count_pages(tightness):
+            nonlocal compiles
+            self.layout = layout_for(tightness)
+            output = super(PdfCvGenerator, self).render()
+            key = self.build_cache.key(output.chunks)
+            pages = page_counts.get(key)
+            if pages is None:
+                pages = self.compile_page_count(key)
+                page_counts.put(key, pages)
+                compiles += 1
+            print(f"  tightness {tightness:.3f}: {pages} page(s)")
+            return pages
+        
+        print(f"Fitting layout to {target} page(s)...")
+        tightness, pages = fit_tightness(count_pages, target)
+        self.layout = layout_for(tightness)
+        settings = (f"margin {self.layout['margin']}in, spacing x{self.layout['spacing']}, "
+                    f"font x{self.layout['font_scale']}")
+        if pages == target:
+            print(f"✓ Fits {pages} page(s) with {settings} ({compiles} compile(s))")
+        else:
+            print(f"Warning: cannot fit {target} page(s); {pages} page(s) with {settings} "
+                  f"({compiles} compile(s))")
+    
+    def compile_page_count(self, cache_key):
+        """
+        Compile the rendered LaTeX and count the pages of the PDF.
+        
+        The PDF is kept in the build cache.
+        
+        Parameters
+        ----------
+        cache_key : str
+            Build cache key of the rendered LaTeX.
+        
+        Returns
+        -------
+        int
+            The page count from the pdflatex log.
+        
+        Raises
+        ------
+        SystemExit
+            If LaTeX compilation fails or the log has no page count.
+        """
+        with build_directory() as build_dir:
+            build_dir = Path(build_dir)
+            with open(build_dir / 'cv.tex', 'w', encoding='utf-8') as f:
+                self.output.write_to(f)
+            result = self._run_pdflatex(build_dir)
+            log_path = build_dir / 'cv.log'
+            log = log_path.read_text(encoding='utf-8', errors='replace') if log_path.exists() else ''
+            pages = read_page_count(log)
+            if result.returncode != 0 or pages is None:
+                print("LaTeX compilation failed while fitting the layout:")
+                print(result.stdout)
+                print(result.stderr)
+                sys.exit(1)
+            if (build_dir / 'cv.pdf').exists():
+                self.build_cache.store(cache_key, build_dir / 'cv.pdf')
+        return pages
     
     def generate_header(self):
         """
@@ -116,47 +350,7 @@ class PdfCvGenerator(AbstractCvGenerator):
         -------
         None
         """
-        personal = self.cv_data['personal']
-        
-        self.content = (
-            r"\documentclass[11pt,a4paper]{article}" + "\n"
-            r"\usepackage[margin=0.5in]{geometry}" + "\n"
-            r"\usepackage{hyperref}" + "\n"
-            r"\usepackage{xcolor}" + "\n"
-            r"\usepackage{array}" + "\n"
-            r"\usepackage{enumitem}" + "\n"
-            "\n"
-            r"% Define colors" + "\n"
-            r"\definecolor{primary}{RGB}{79,70,229}" + "\n"
-            r"\definecolor{darkgray}{RGB}{75,75,75}" + "\n"
-            "\n"
-            r"% Header styling" + "\n"
-            r"\pagestyle{empty}" + "\n"
-            "\n"
-            r"\begin{document}" + "\n"
-            "\n"
-            r"% Header" + "\n"
-            r"\begin{center}" + "\n"
-        )
-        
-        # Only include name and contact info if not anonymous
-        if not self.anonymous:
-            self.content += (
-                r"{\Large \textbf{Curriculum Vitae --- " + self.escape_text(personal['name']) + r"}}\\" + "\n"
-                r"\vspace{0.2cm}" + "\n"
-                r"{\small " + self.escape_text(personal['email']) + r" $|$ " +
-                self.escape_text(personal['phone']) + r" $|$ " +
-                self.escape_text(personal['location']) + r"}\\" + "\n"
-                r"\vspace{0.15cm}" + "\n"
-            )
-        else:
-            self.content += r"{\Large \textbf{Curriculum Vitae}}\\" + "\n" + r"\vspace{0.2cm}" + "\n"
-        
-        self.content += (
-            r"\hrule" + "\n"
-            r"\end{center}" + "\n"
-            "\n"
-        )
+        self.output.write(self.render_template('header'))
     
     def generate_summary(self):
         """
@@ -172,14 +366,7 @@ class PdfCvGenerator(AbstractCvGenerator):
         -------
         None
         """
-        personal = self.cv_data['personal']
-        
-        self.content += (
-            r"% Professional Summary" + "\n"
-            r"\vspace{0.2cm}" + "\n"
-            r"{\small " + self.escape_text(personal['summary']) + r"}" + "\n"
-            "\n"
-        )
+        self.output.write(self.render_template('summary'))
     
     def generate_experience(self):
         """
@@ -196,36 +383,7 @@ class PdfCvGenerator(AbstractCvGenerator):
         -------
         None
         """
-        self.content += (
-            "\n"
-            r"\section*{EXPERIENCE}" + "\n"
-            r"\vspace{-0.3cm}" + "\n"
-            r"\hrule" + "\n"
-            r"\vspace{0.2cm}" + "\n"
-            "\n"
-        )
-        
-        for job in self.cv_data['experience']:
-            if job.get('hideOnPdf', False):
-                continue
-            self.content += (
-                r"\noindent" + "\n"
-                r"\textbf{" + self.escape_text(job['title']) + r"} \hfill {\small " +
-                self.escape_text(job['startDate']) + r" -- " +
-                self.escape_text(job['endDate']) + r"}\\" + "\n"
-                r"{\small \textit{" + self.escape_text(job['company']) + r", " +
-                self.escape_text(job['location']) + r"}}" + "\n"
-                r"\vspace{0.15cm}" + "\n"
-            )
-            
-            for highlight in job['highlights']:
-                self.content += (
-                    r"\begin{itemize}[leftmargin=0.25in,topsep=-0.1cm,partopsep=0pt]" + "\n"
-                    r"\item {\small " + self.format_links(self.escape_text(highlight)) + r"}" + "\n"
-                    r"\end{itemize}" + "\n"
-                )
-            
-            self.content += r"\vspace{0.25cm}" + "\n"
+        self.output.write(self.render_template('experience'))
     
     def generate_education(self):
         """
@@ -243,48 +401,7 @@ class PdfCvGenerator(AbstractCvGenerator):
         -------
         None
         """
-        self.content += (
-            "\n"
-            r"\section*{EDUCATION}" + "\n"
-            r"\vspace{-0.3cm}" + "\n"
-            r"\hrule" + "\n"
-            r"\vspace{0.2cm}" + "\n"
-            "\n"
-        )
-        
-        for edu in self.cv_data['education']:
-            self.content += (
-                r"\noindent" + "\n"
-                r"\textbf{" + self.escape_text(edu['degree']) + r"} \hfill {\small " +
-                self.escape_text(edu['years']) + r"}\\" + "\n"
-                r"{\small " + self.escape_text(edu['institution']) + r"}" + "\n"
-                r"\vspace{0.15cm}" + "\n"
-            )
-            
-            if 'details' in edu and edu['details']:
-                num_cols = len(edu['details'])
-                self.content += (
-                    r"\\" + "\n"
-                    r"\vspace{0.05cm}" + "\n"
-                    r"\begin{tabular}{*{" + str(num_cols) + r"}{c}}" + "\n"
-                )
-                
-                # Top row: subjects
-                subjects = [
-                    self.escape_text(detail['subject'])
-                    for detail in edu['details']
-                ]
-                self.content += " & ".join(subjects) + r" \\" + "\n"
-                
-                # Bottom row: grades
-                grades = [
-                    self.escape_text(detail['grade'])
-                    for detail in edu['details']
-                ]
-                self.content += " & ".join(grades) + "\n"
-                self.content += r"\end{tabular}" + "\n"
-            
-            self.content += "\n" + r"\vspace{0.1cm}" + "\n"
+        self.output.write(self.render_template('education'))
     
     def generate_skills(self):
         """
@@ -301,21 +418,7 @@ class PdfCvGenerator(AbstractCvGenerator):
         -------
         None
         """
-        self.content += (
-            "\n"
-            r"\section*{SKILLS}" + "\n"
-            r"\vspace{-0.3cm}" + "\n"
-            r"\hrule" + "\n"
-            r"\vspace{0.2cm}" + "\n"
-            "\n"
-            r"\noindent" + "\n"
-        )
-        
-        skills_text = ", ".join([
-            self.escape_text(skill) for skill in self.cv_data['skills']
-        ])
-        
-        self.content += r"{\small " + skills_text + r"}" + "\n" + "\n"
+        self.output.write(self.render_template('skills'))
     
     def generate_publications(self):
         """
@@ -332,28 +435,7 @@ class PdfCvGenerator(AbstractCvGenerator):
         -------
         None
         """
-        if not self.cv_data['publications']:
-            return
-        
-        self.content += (
-            "\n"
-            r"\section*{PUBLICATIONS}" + "\n"
-            r"\vspace{-0.3cm}" + "\n"
-            r"\hrule" + "\n"
-            r"\vspace{0.2cm}" + "\n"
-            "\n"
-        )
-        
-        for pub in self.cv_data['publications']:
-            self.content += (
-                r"\noindent" + "\n"
-                r"{\small \textbf{" + self.escape_text(pub['authors']) +
-                r"} (" + str(pub['year']) + r"). " +
-                self.escape_text(pub['title']) + r". \textit{" +
-                self.escape_text(pub['venue']) + r"}\vspace{0.05cm}\\" + "\n"
-            )
-        
-        self.content += "\n"
+        self.output.write(self.render_template('publications'))
     
     def generate_awards(self):
         """
@@ -370,24 +452,7 @@ class PdfCvGenerator(AbstractCvGenerator):
         -------
         None
         """
-        if not self.cv_data['awards']:
-            return
-        
-        self.content += (
-            "\n"
-            r"\section*{AWARDS AND ACCREDITATIONS}" + "\n"
-            r"\vspace{-0.3cm}" + "\n"
-            r"\hrule" + "\n"
-            r"\vspace{0.2cm}" + "\n"
-            "\n"
-        )
-        
-        for award in self.cv_data['awards']:
-            self.content += (
-                r"\noindent" + "\n"
-                r"{\small \textbf{" + self.escape_text(award['title']) +
-                r"} -- " + self.escape_text(award['description']) + r"}\\" + "\n"
-            )
+        self.output.write(self.render_template('awards'))
     
     def generate_hobbies(self):
         """
@@ -404,32 +469,34 @@ class PdfCvGenerator(AbstractCvGenerator):
         -------
         None
         """
-        if not self.cv_data['hobbies']:
-            return
-        
-        self.content += (
-            "\n"
-            r"\section*{INTERESTS}" + "\n"
-            r"\vspace{-0.3cm}" + "\n"
-            r"\hrule" + "\n"
-            r"\vspace{0.2cm}" + "\n"
-            "\n"
-            r"\begin{itemize}[leftmargin=0.25in,topsep=0pt,partopsep=0pt]" + "\n"
-        )
-        
-        for hobby in self.cv_data['hobbies']:
-            self.content += (
-                r"\item {\small " + self.escape_text(hobby['name']) + r"}" + "\n"
-            )
+        self.output.write(self.render_template('hobbies'))
+    
+    def generate_footer(self):
+        """
+        Close the LaTeX document.
         
-        self.content += r"\end{itemize}" + "\n" + "\n"
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        self.output.write(self.render_template('footer'))
     
     def write_output(self):
         """
         Write LaTeX to file and compile to PDF.
         
-        Closes the LaTeX document, writes it to cv.tex, and compiles it to PDF
-        using pdflatex. The output PDF is named "CV - Tom Bower.pdf".
+        Compiles the generated LaTeX with pdflatex, optionally from a
+        precompiled preamble format, in a private temporary build directory
+        (on tmpfs where available). The PDF and its LaTeX source are then
+        moved into the output directory atomically, so any number of
+        variants can compile at the same time. The output PDF is named
+        "CV - Tom Bower.pdf". If the build cache already holds a PDF compiled
+        from identical LaTeX by the same engine, it is reused and pdflatex is
+        not run.
         
         Parameters
         ----------
@@ -446,41 +513,111 @@ class PdfCvGenerator(AbstractCvGenerator):
         SystemExit
             If LaTeX compilation fails.
         """
-        # Close LaTeX document
-        self.content += "\n" + r"\end{document}" + "\n"
-        
-        # Write LaTeX file
-        output_path = Path('output') / 'cv.tex'
-        output_path.parent.mkdir(exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(self.content)
-        print(f"LaTeX file written to {output_path}")
-        
-        # Compile to PDF
-        print("Compiling to PDF...")
-        result = subprocess.run(
-            ['pdflatex', '-interaction=nonstopmode', '-output-directory=output',
-             str(output_path)],
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode == 0:
-            # Rename PDF with name or anonymize
-            source_pdf = Path('output') / 'cv.pdf'
-            if self.anonymous:
-                target_pdf = Path('output') / 'CV - Anonymous.pdf'
-            else:
-                personal_name = self.cv_data['personal']['name']
-                target_pdf = Path('output') / f'CV - {personal_name}.pdf'
-            if source_pdf.exists():
-                # Remove old file if it exists to ensure overwrite
-                if target_pdf.exists():
-                    target_pdf.unlink()
-                source_pdf.replace(target_pdf)
-            print(f"✓ PDF generated successfully: {target_pdf}")
+        # Name PDF with name or anonymize
+        if self.anonymous:
+            stem = 'CV - Anonymous'
         else:
-            print("LaTeX compilation failed:")
-            print(result.stdout)
-            print(result.stderr)
+            stem = f'CV - {self.cv_data.personal.name}'
+        if self.include_hidden:
+            stem += ' (complete)'
+        target_pdf = self.output_dir / f'{stem}.pdf'
+        target_tex = target_pdf.with_suffix('.tex')
+        
+        with build_directory() as build_dir:
+            build_dir = Path(build_dir)
+            
+            # Write LaTeX file
+            tex_path = build_dir / 'cv.tex'
+            with open(tex_path, 'w', encoding='utf-8') as f:
+                self.output.write_to(f)
+            atomic_copy(tex_path, target_tex)
+            print(f"LaTeX file written to {target_tex}")
+            
+            # Reuse the PDF from a previous compile of identical LaTeX
+            with self.tracer.span('build_cache') as span:
+                cache_key = self.build_cache.key(self.output.chunks)
+                span['hit'] = not self.force and self.build_cache.fetch(cache_key, target_pdf)
+            if span['hit']:
+                print(f"✓ PDF unchanged, reused from build cache: {target_pdf}")
+                print(self.build_cache.stats_line())
+                return
+            
+            if self.compile_service is not None:
+                self._compile_on_service(cache_key, target_pdf)
+                return
+            
+            # Compile to PDF
+            print("Compiling to PDF...")
+            result = self._run_pdflatex(build_dir)
+            
+            source_pdf = build_dir / 'cv.pdf'
+            if result.returncode == 0 and source_pdf.exists():
+                self.build_cache.store(cache_key, source_pdf)
+                output_store(self.output_dir).publish(target_pdf, source_pdf.read_bytes())
+                print(f"✓ PDF generated successfully: {target_pdf}")
+                print(self.build_cache.stats_line())
+            else:
+                print("LaTeX compilation failed:")
+                print(result.stdout)
+                print(result.stderr)
+                log_path = build_dir / 'cv.log'
+                if log_path.exists():
+                    target_log = target_pdf.with_suffix('.log')
+                    atomic_copy(log_path, target_log)
+                    print(f"LaTeX log written to {target_log}")
+                sys.exit(1)
+    
+    def _run_pdflatex(self, build_dir):
+        """Run pdflatex on cv.tex in a build directory, from the precompiled preamble if requested."""
+        command = ['pdflatex', '-interaction=nonstopmode']
+        env = None
+        if self.format_cache is not None:
+            with self.tracer.span('latex_format'):
+                format_name = self.format_cache.ensure(self.preamble())
+            if format_name:
+                command.append(f'-fmt={format_name}')
+                env = self.format_cache.environment()
+        with self.tracer.span('pdflatex', category='subprocess') as span:
+            result = subprocess.run(
+                command + ['cv.tex'],
+                cwd=build_dir,
+                capture_output=True,
+                text=True,
+                env=env
+            )
+            span['returncode'] = result.returncode
+        return result
+    
+    def _compile_on_service(self, cache_key, target_pdf):
+        """
+        Compile the generated LaTeX on the compile service.
+        
+        Parameters
+        ----------
+        cache_key : str
+            Build cache key of the generated LaTeX.
+        target_pdf : Path
+            Where to write the PDF.
+        
+        Returns
+        -------
+        None
+        
+        Raises
+        ------
+        SystemExit
+            If LaTeX compilation fails.
+        """
+        print("Compiling to PDF on compile service...")
+        preamble = self.preamble() if self.format_cache is not None else None
+        try:
+            with self.tracer.span('compile_service', category='subprocess'):
+                pdf = self.compile_service.compile(self.content, preamble)
+        except CompileError as e:
+            print(f"{e}:")
+            print(e.log)
             sys.exit(1)
+        output_store(self.output_dir).publish(target_pdf, pdf)
+        self.build_cache.store(cache_key, target_pdf)
+        print(f"✓ PDF generated successfully: {target_pdf}")
+        print(self.build_cache.stats_line())
@@ -0,0 +1,651 @@
+#!/usr/bin/env python3
+"""
+PDF Writer - lays out text and writes PDF files without external tools.
+"""
+import re
+import zlib
+from functools import lru_cache
+from urllib.parse import quote
+
+
+# A4 page size in points
+PAGE_WIDTH = 595.28
+PAGE_HEIGHT = 841.89
+
+# Core fonts for each text style, and the resource names pages use for them.
+# Core fonts need no embedding: every PDF viewer provides them.
+FONTS = {
+    'regular': ('F1', 'Helvetica'),
+    'bold': ('F2', 'Helvetica-Bold'),
+    'italic': ('F3', 'Helvetica-Oblique'),
+    'bold-italic': ('F4', 'Helvetica-BoldOblique'),
+}
+
+# Advance widths in thousandths of the font size of the WinAnsi (cp1252)
+# characters 32 to 255, from the Adobe font metrics. The oblique fonts have
+# the same widths as their upright forms.
+_CORE_WIDTHS = {
+    'Helvetica': (
+        278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+        556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+        1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+        667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+        333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+        556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584, 350,
+        556, 350, 222, 556, 333, 1000, 556, 556, 333, 1000, 667, 333, 1000, 350, 611, 350,
+        350, 222, 222, 333, 333, 350, 556, 1000, 333, 1000, 500, 333, 944, 350, 500, 667,
+        278, 333, 556, 556, 556, 556, 260, 556, 333, 737, 370, 556, 584, 333, 737, 333,
+        400, 584, 333, 333, 333, 556, 537, 278, 333, 333, 365, 556, 834, 834, 834, 611,
+        667, 667, 667, 667, 667, 667, 1000, 722, 667, 667, 667, 667, 278, 278, 278, 278,
+        722, 722, 778, 778, 778, 778, 778, 584, 778, 722, 722, 722, 722, 667, 667, 611,
+        556, 556, 556, 556, 556, 556, 889, 500, 556, 556, 556, 556, 278, 278, 278, 278,
+        556, 556, 556, 556, 556, 556, 556, 584, 611, 556, 556, 556, 556, 500, 556, 500,
+    ),
+    'Helvetica-Bold': (
+        278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+        556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+        975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+        667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+        333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+        611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584, 350,
+        556, 350, 278, 556, 500, 1000, 556, 556, 333, 1000, 667, 333, 1000, 350, 611, 350,
+        350, 278, 278, 500, 500, 350, 556, 1000, 333, 1000, 556, 333, 944, 350, 500, 667,
+        278, 333, 556, 556, 556, 556, 280, 556, 333, 737, 370, 556, 584, 333, 737, 333,
+        400, 584, 333, 333, 333, 611, 556, 278, 333, 333, 365, 556, 834, 834, 834, 611,
+        722, 722, 722, 722, 722, 722, 1000, 722, 667, 667, 667, 667, 278, 278, 278, 278,
+        722, 722, 778, 778, 778, 778, 778, 584, 778, 722, 722, 722, 722, 667, 667, 611,
+        556, 556, 556, 556, 556, 556, 889, 556, 556, 556, 556, 556, 278, 278, 278, 278,
+        611, 611, 611, 611, 611, 611, 611, 584, 611, 611, 611, 611, 611, 556, 611, 556,
+    ),
+}
+
+# Widths indexed by every byte value, for each style
+WIDTHS = {
+    style: (0,) * 32 + _CORE_WIDTHS['Helvetica-Bold' if style.startswith('bold') else 'Helvetica']
+    for style in FONTS
+}
+
+# Inline markup in layout text: BOLD and ITALIC switch a style on and off,
+# and LINK_START url LINK_TEXT text LINK_END marks a link
+BOLD = '\x02'
+ITALIC = '\x03'
+LINK_START = '\x04'
+LINK_TEXT = '\x05'
+LINK_END = '\x06'
+
+# Colour of link text, as RGB fractions
+LINK_COLOR = (79 / 255, 70 / 255, 229 / 255)
+
+_MARKUP = re.compile(
+    f'([{BOLD}{ITALIC}])|{LINK_START}([^{LINK_TEXT}]*){LINK_TEXT}([^{LINK_END}]*){LINK_END}'
+)
+_WORDS = re.compile(r'\S+|\s+')
+
+# Characters with special meaning in PDF strings
+_STRING_SPECIAL = re.compile(rb'([\\()])')
+
+
+@lru_cache(maxsize=4096)
+def encode_text(text):
+    """
+    Encode text in the WinAnsi encoding of the core fonts.
+
+    Parameters
+    ----------
+    text : str
+        The text.
+
+    Returns
+    -------
+    bytes
+        The cp1252 bytes, with '?' for characters the fonts do not have.
+    """
+    return text.encode('cp1252', errors='replace')
+
+
+def text_width(data, style, size):
+    """
+    Measure encoded text.
+
+    Parameters
+    ----------
+    data : bytes
+        Text from encode_text.
+    style : str
+        A key of FONTS.
+    size : float
+        Font size in points.
+
+    Returns
+    -------
+    float
+        The width in points.
+    """
+    return sum(map(WIDTHS[style].__getitem__, data)) * size / 1000
+
+
+def pdf_string(data):
+    """Quote bytes as a PDF literal string."""
+    return b'(' + _STRING_SPECIAL.sub(rb'\\\1', data) + b')'
+
+
+def pdf_text_string(text):
+    """Quote text for the document information, as UTF-16 if it is not ASCII."""
+    if text.isascii():
+        return pdf_string(text.encode('ascii'))
+    return b'<FEFF' + text.encode('utf-16-be').hex().upper().encode('ascii') + b'>'
+
+
+def _number(value):
+    """Format a coordinate compactly."""
+    return f'{value:.2f}'.rstrip('0').rstrip('.')
+
+
+def parse_markup(text, style='regular'):
+    """
+    Split text with inline markup into runs of one style.
+
+    Parameters
+    ----------
+    text : str
+        Text that may contain BOLD, ITALIC and link markup.
+    style : str, optional
+        Style of unmarked text, 'regular' or 'italic'. Default is 'regular'.
+
+    Returns
+    -------
+    list of tuple
+        (text, style, link URL or None) runs, in order.
+    """
+    bold = False
+    italic = style == 'italic'
+    runs = []
+    position = 0
+
+    def current():
+        if bold:
+            return 'bold-italic' if italic else 'bold'
+        return 'italic' if italic else 'regular'
+
+    for match in _MARKUP.finditer(text):
+        if match.start() > position:
+            runs.append((text[position:match.start()], current(), None))
+        position = match.end()
+        if match.group(1) == BOLD:
+            bold = not bold
+        elif match.group(1) == ITALIC:
+            italic = not italic
+        else:
+            runs.append((match.group(3), current(), match.group(2)))
+    if position < len(text):
+        runs.append((text[position:], current(), None))
+    return runs
+
+
+def wrap(runs, size, width):
+    """
+    Break runs of text into lines no wider than a width.
+
+    Lines break at spaces, greedily; runs of spaces collapse to one. A
+    piece with no space before it, such as a word joined to a styled run,
+    starts a new line if it does not fit on the current one, and a word
+    wider than a whole line is broken between characters.
+
+    Parameters
+    ----------
+    runs : list of tuple
+        (text, style, link URL) runs from parse_markup.
+    size : float
+        Font size in points.
+    width : float
+        Line width in points.
+
+    Returns
+    -------
+    list of list
+        Lines, each a list of (x offset, encoded text, style, link URL,
+        width) pieces.
+    """
+    space = WIDTHS['regular'][32] * size / 1000
+    lines = []
+    line = []
+    x = 0.0
+    # Whether the next piece follows a space, and so may start a new line
+    after_space = False
+    for text, style, uri in runs:
+        for token in _WORDS.findall(text):
+            if token.isspace():
+                after_space = bool(line)
+                continue
+            data = encode_text(token)
+            piece_width = text_width(data, style, size)
+            gap = space if after_space else 0.0
+            if line and x + gap + piece_width > width:
+                lines.append(line)
+                line, x, gap = [], 0.0, 0.0
+            while piece_width > width:
+                # Too wide for any line: break it where it fills this one
+                cut = 1
+                while (cut < len(data)
+                       and text_width(data[:cut + 1], style, size) <= width):
+                    cut += 1
+                lines.append([(0.0, data[:cut], style, uri, text_width(data[:cut], style, size))])
+                data = data[cut:]
+                piece_width = text_width(data, style, size)
+            if gap and uri is not None and line and line[-1][3] == uri:
+                # Keep a space inside a link as part of the link
+                offset, previous, previous_style, _, previous_width = line[-1]
+                line[-1] = (offset, previous + b' ', previous_style, uri, previous_width + gap)
+                x += gap
+                gap = 0.0
+            line.append((x + gap, data, style, uri, piece_width))
+            x += gap + piece_width
+            after_space = False
+    if line:
+        lines.append(line)
+    return lines
+
+
+class Page:
+    """
+    One page being drawn: its content stream operators and link areas.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty page.
+        """
+        self.operators = []
+        self.links = []
+
+    def text(self, x, y, data, style, size, color=None):
+        """
+        Draw encoded text with its baseline starting at a point.
+
+        Parameters
+        ----------
+        x, y : float
+            Start of the baseline, in points from the bottom left corner.
+        data : bytes
+            Text from encode_text.
+        style : str
+            A key of FONTS.
+        size : float
+            Font size in points.
+        color : tuple of float, optional
+            RGB fractions. Default is None (black).
+
+        Returns
+        -------
+        None
+        """
+        fill = b''
+        if color is not None:
+            fill = (' '.join(_number(c) for c in color) + ' rg ').encode('ascii')
+        self.operators.append(
+            fill
+            + f'BT /{FONTS[style][0]} {_number(size)} Tf {_number(x)} {_number(y)} Td '.encode('ascii')
+            + pdf_string(data) + b' Tj ET'
+            + (b' 0 g' if color is not None else b'')
+        )
+
+    def line(self, x0, y0, x1, y1, width=0.4):
+        """
+        Draw a straight black line.
+
+        Parameters
+        ----------
+        x0, y0, x1, y1 : float
+            End points in points.
+        width : float, optional
+            Line width in points. Default is 0.4.
+
+        Returns
+        -------
+        None
+        """
+        self.operators.append(
+            f'{_number(width)} w {_number(x0)} {_number(y0)} m {_number(x1)} {_number(y1)} l S'
+            .encode('ascii')
+        )
+
+    def link(self, rect, uri):
+        """
+        Make an area of the page open a URL when clicked.
+
+        Parameters
+        ----------
+        rect : tuple of float
+            (left, bottom, right, top) in points.
+        uri : str
+            The URL.
+
+        Returns
+        -------
+        None
+        """
+        self.links.append((rect, uri))
+
+
+class PdfDocument:
+    """
+    A PDF file built from pages drawn with the core fonts.
+
+    The output has no timestamps or random identifiers, so the same pages
+    always give the same bytes.
+    """
+
+    def __init__(self, title=None):
+        """
+        Initialize an empty document.
+
+        Parameters
+        ----------
+        title : str, optional
+            Document title shown by viewers. Default is None.
+        """
+        self.title = title
+        self.pages = []
+
+    def add_page(self):
+        """
+        Start a new page at the end of the document.
+
+        Returns
+        -------
+        Page
+            The page to draw on.
+        """
+        page = Page()
+        self.pages.append(page)
+        return page
+
+    def to_bytes(self, compress=True):
+        """
+        Write the document.
+
+        Parameters
+        ----------
+        compress : bool, optional
+            If True, compress page contents. Default is True.
+
+        Returns
+        -------
+        bytes
+            The PDF file.
+        """
+        objects = [None, None]
+        font_refs = []
+        for resource, base_font in FONTS.values():
+            objects.append(
+                f'<< /Type /Font /Subtype /Type1 /BaseFont /{base_font} '
+                '/Encoding /WinAnsiEncoding >>'.encode('ascii')
+            )
+            font_refs.append(f'/{resource} {len(objects)} 0 R')
+        resources = f"<< /Font << {' '.join(font_refs)} >> >>"
+
+        page_refs = []
+        for page in self.pages:
+            content = b'\n'.join(page.operators)
+            if compress:
+                content = zlib.compress(content, 6)
+                header = f'<< /Length {len(content)} /Filter /FlateDecode >>'
+            else:
+                header = f'<< /Length {len(content)} >>'
+            objects.append(header.encode('ascii') + b'\nstream\n' + content + b'\nendstream')
+            content_ref = len(objects)
+
+            annotation_refs = []
+            for (left, bottom, right, top), uri in page.links:
+                target = quote(uri, safe="-_.~:/?#[]@!$&'()*+,;=%")
+                objects.append(
+                    f'<< /Type /Annot /Subtype /Link /Rect [{_number(left)} {_number(bottom)} '
+                    f'{_number(right)} {_number(top)}] /Border [0 0 0] /A << /S /URI /URI '.encode('ascii')
+                    + pdf_string(target.encode('ascii')) + b' >> >>'
+                )
+                annotation_refs.append(f'{len(objects)} 0 R')
+            annotations = f" /Annots [{' '.join(annotation_refs)}]" if annotation_refs else ''
+            objects.append(
+                f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_number(PAGE_WIDTH)} '
+                f'{_number(PAGE_HEIGHT)}] /Resources {resources} /Contents {content_ref} 0 R'
+                f'{annotations} >>'.encode('ascii')
+            )
+            page_refs.append(f'{len(objects)} 0 R')
+
+        objects[0] = b'<< /Type /Catalog /Pages 2 0 R >>'
+        objects[1] = f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {len(page_refs)} >>".encode('ascii')
+        info = b'<< /Producer (cv direct PDF writer)'
+        if self.title:
+            info += b' /Title ' + pdf_text_string(self.title)
+        objects.append(info + b' >>')
+
+        output = [b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n']
+        offsets = []
+        position = len(output[0])
+        for number, body in enumerate(objects, 1):
+            offsets.append(position)
+            chunk = f'{number} 0 obj\n'.encode('ascii') + body + b'\nendobj\n'
+            output.append(chunk)
+            position += len(chunk)
+        xref = [f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('ascii')]
+        xref.extend(f'{offset:010d} 00000 n \n'.encode('ascii') for offset in offsets)
+        output.extend(xref)
+        output.append(
+            f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R /Info {len(objects)} 0 R >>\n'
+            f'startxref\n{position}\n%%EOF\n'.encode('ascii')
+        )
+        return b''.join(output)
+
+
+class TextFlow:
+    """
+    Flows lines of text down the pages of a document.
+
+    Keeps a cursor below the last line drawn and starts a new page when
+    the next line would cross the bottom margin.
+    """
+
+    def __init__(self, document, margin=36.0):
+        """
+        Initialize a flow starting at the top of a new page.
+
+        Parameters
+        ----------
+        document : PdfDocument
+            The document to add pages to.
+        margin : float, optional
+            Page margin on every side, in points. Default is 36 (0.5in).
+        """
+        self.document = document
+        self.left = margin
+        self.right = PAGE_WIDTH - margin
+        self.top = PAGE_HEIGHT - margin
+        self.bottom = margin
+        self.page = document.add_page()
+        self.y = self.top
+        # Baseline, size and right edge of the last line drawn, for aside()
+        self.last_line = None
+
+    @property
+    def width(self):
+        """Width of the text area in points."""
+        return self.right - self.left
+
+    def new_page(self):
+        """
+        Continue on a new page.
+
+        Returns
+        -------
+        None
+        """
+        self.page = self.document.add_page()
+        self.y = self.top
+        self.last_line = None
+
+    def ensure(self, height):
+        """
+        Start a new page unless a height fits above the bottom margin.
+
+        Parameters
+        ----------
+        height : float
+            Height in points needed below the cursor.
+
+        Returns
+        -------
+        None
+        """
+        if self.y - height < self.bottom and self.y < self.top:
+            self.new_page()
+
+    def space(self, height):
+        """
+        Move the cursor down, or up for a negative height.
+
+        Vertical space at the top of a page is dropped.
+
+        Parameters
+        ----------
+        height : float
+            Height in points.
+
+        Returns
+        -------
+        None
+        """
+        if self.y < self.top:
+            self.y = max(self.y - height, self.bottom)
+
+    def rule(self, width=0.4):
+        """
+        Draw a line across the text area at the cursor.
+
+        Parameters
+        ----------
+        width : float, optional
+            Line width in points. Default is 0.4.
+
+        Returns
+        -------
+        None
+        """
+        self.page.line(self.left, self.y, self.right, self.y, width)
+        self.y -= width
+
+    def paragraph(self, runs, size, indent=0.0, align='left', bullet=None, leading=1.2):
+        """
+        Draw text wrapped to the text area.
+
+        Parameters
+        ----------
+        runs : list of tuple
+            (text, style, link URL) runs from parse_markup.
+        size : float
+            Font size in points.
+        indent : float, optional
+            Left indent of every line, in points. Default is 0.
+        align : str, optional
+            'left' or 'centre'. Default is 'left'.
+        bullet : str, optional
+            Marker drawn before the first line, in the indent. Default is None.
+        leading : float, optional
+            Line height as a multiple of the font size. Default is 1.2.
+
+        Returns
+        -------
+        None
+        """
+        line_height = size * leading
+        left = self.left + indent
+        for number, line in enumerate(wrap(runs, size, self.right - left)):
+            self.ensure(line_height)
+            baseline = self.y - size
+            line_width = line[-1][0] + line[-1][4]
+            start = left + (self.right - left - line_width) / 2 if align == 'centre' else left
+            if bullet and number == 0:
+                marker = encode_text(bullet)
+                self.page.text(left - text_width(marker, 'regular', size) - size * 0.5,
+                               baseline, marker, 'regular', size)
+            link_start = None
+            for i, (offset, data, style, uri, width) in enumerate(line):
+                self.page.text(start + offset, baseline, data, style, size,
+                               LINK_COLOR if uri else None)
+                if uri is not None:
+                    if link_start is None:
+                        link_start = start + offset
+                    if i + 1 == len(line) or line[i + 1][3] != uri:
+                        self.page.link(
+                            (link_start, baseline - size * 0.25, start + offset + width, baseline + size * 0.85),
+                            uri
+                        )
+                        link_start = None
+            self.y -= line_height
+            self.last_line = (baseline, size, start + line_width)
+
+    def aside(self, runs, size):
+        """
+        Draw short text right-aligned on the baseline of the last line.
+
+        Used for dates beside a title. If it would overlap the line, it is
+        drawn as a right-aligned line of its own instead.
+
+        Parameters
+        ----------
+        runs : list of tuple
+            (text, style, link URL) runs from parse_markup.
+        size : float
+            Font size in points.
+
+        Returns
+        -------
+        None
+        """
+        pieces = [(encode_text(text), style) for text, style, _ in runs]
+        width = sum(text_width(data, style, size) for data, style in pieces)
+        if self.last_line is not None and self.last_line[2] + size < self.right - width:
+            baseline = self.last_line[0]
+        else:
+            self.ensure(size * 1.2)
+            baseline = self.y - size
+            self.y -= size * 1.2
+        x = self.right - width
+        for data, style in pieces:
+            self.page.text(x, baseline, data, style, size)
+            x += text_width(data, style, size)
+
+    def table(self, rows, size, padding=6.0):
+        """
+        Draw a table with centred cells in columns sized to fit them.
+
+        Parameters
+        ----------
+        rows : list of list of str
+            Cell texts, row by row.
+        size : float
+            Font size in points.
+        padding : float, optional
+            Space either side of each cell, in points. Default is 6.
+
+        Returns
+        -------
+        None
+        """
+        encoded = [[encode_text(cell) for cell in row] for row in rows]
+        columns = max(len(row) for row in encoded)
+        widths = [
+            max((text_width(row[i], 'regular', size) for row in encoded if i < len(row)), default=0.0)
+            + 2 * padding
+            for i in range(columns)
+        ]
+        line_height = size * 1.2
+        self.ensure(line_height * len(rows))
+        for row in encoded:
+            baseline = self.y - size
+            x = self.left
+            for data, column_width in zip(row, widths):
+                cell_width = text_width(data, 'regular', size)
+                self.page.text(x + (column_width - cell_width) / 2, baseline, data, 'regular', size)
+                x += column_width
+            self.y -= line_height
+        self.last_line = None
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Template Engine - compiles section templates into Python functions.
+"""
+import hashlib
+import importlib.util
+import marshal
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from atomic_io import atomic_write_bytes
+
+
+# Project root, which the template and cache directories are in
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Section templates, one directory per syntax
+TEMPLATE_ROOT = PROJECT_ROOT / 'templates'
+
+# Default directory for compiled templates
+DEFAULT_CACHE_DIR = PROJECT_ROOT / 'output' / '.template-cache'
+
+# Tag syntax for each template directory. 'line' matches a statement alone on
+# its line, which is removed along with its indentation and line break, so
+# control flow can be laid out readably without adding whitespace.
+SYNTAXES = {
+    'latex': {
+        'suffix': '.tex',
+        'line': re.compile(r'^[ \t]*\\BLOCK\{(?P<line>[^{}]*)\}[ \t]*(?:\n|\Z)', re.MULTILINE),
+        'statement': re.compile(r'\\BLOCK\{(?P<statement>[^{}]*)\}'),
+        'expression': re.compile(r'\\VAR\{(?P<expression>[^{}]*(?:\{[^{}]*\}[^{}]*)*)\}'),
+    },
+    'html': {
+        'suffix': '.html',
+        'line': re.compile(r'^[ \t]*\{%(?P<line>(?:(?!%\}).)*)%\}[ \t]*(?:\n|\Z)', re.MULTILINE),
+        'statement': re.compile(r'\{%(?P<statement>.*?)%\}'),
+        'expression': re.compile(r'\{\{(?P<expression>.*?)\}\}'),
+    },
+    # Layout commands for the direct PDF writer, one per line
+    'direct': {
+        'suffix': '.txt',
+        'line': re.compile(r'^[ \t]*\{%(?P<line>(?:(?!%\}).)*)%\}[ \t]*(?:\n|\Z)', re.MULTILINE),
+        'statement': re.compile(r'\{%(?P<statement>.*?)%\}'),
+        'expression': re.compile(r'\{\{(?P<expression>.*?)\}\}'),
+    },
+}
+
+# Arguments every compiled template takes: the generator, the CV data, and
+# the generator's escape_text and format_links methods
+TEMPLATE_ARGUMENTS = ('self', 'cv', 'e', 'links')
+
+
+class TemplateSyntaxError(Exception):
+    """Raised when a template has unbalanced or unknown statements."""
+
+
+def _tag_pattern(syntax):
+    """Combine a syntax's tag patterns into one, line statements first."""
+    rules = SYNTAXES[syntax]
+    return re.compile(
+        '|'.join(rules[kind].pattern for kind in ('line', 'statement', 'expression')),
+        re.MULTILINE
+    )
+
+
+def _format_string(run, values):
+    """
+    Build the Python expression joining a run of text and expressions.
+
+    An f-string is fastest, but before Python 3.12 its expressions cannot
+    contain backslashes or its own quote character, so such runs fall back
+    to %-formatting.
+    """
+    # Expressions are marked with a control character, which repr() escapes
+    literal = repr(''.join(
+        text.replace('{', '{{').replace('}', '}}') if kind == 'text' else '\x01'
+        for kind, text in run
+    ))
+    pieces = literal.split('\\x01')
+    if len(pieces) == len(values) + 1 and not any(
+            literal[0] in value or '\\' in value or '{' in value for value in values):
+        return 'f' + ''.join(
+            piece + '{' + value + '}' for piece, value in zip(pieces, values)
+        ) + pieces[-1]
+    template = ''.join(text.replace('%', '%%') if kind == 'text' else '%s' for kind, text in run)
+    return f"{template!r} % ({', '.join(values)},)"
+
+
+def compile_source(source, syntax, name='<template>'):
+    """
+    Translate a template into the Python source of a render function.
+
+    Text between tags is emitted as constant strings; each run of text and
+    expressions becomes a single string formatting operation, so static
+    markup is never rebuilt at render time. Statements are 'for ... in ...',
+    'if ...', 'elif ...', 'else', 'endfor' and 'endif'.
+
+    Parameters
+    ----------
+    source : str
+        The template text.
+    syntax : str
+        The tag syntax, a key of SYNTAXES.
+    name : str, optional
+        Template name for error messages. Default is '<template>'.
+
+    Returns
+    -------
+    str
+        Python source defining render(self, cv, e, links), which returns
+        the rendered text.
+
+    Raises
+    ------
+    TemplateSyntaxError
+        If a statement is unknown or blocks are not balanced.
+    """
+    lines = [f"def render({', '.join(TEMPLATE_ARGUMENTS)}):", "    _parts = []", "    _append = _parts.append"]
+    depth = 1
+    blocks = []
+    run = []
+
+    def flush():
+        # Emit pending text and expressions as one formatting operation
+        if not run:
+            return
+        values = [text for kind, text in run if kind == 'expression']
+        if values:
+            lines.append('    ' * depth + f"_append({_format_string(run, values)})")
+        else:
+            lines.append('    ' * depth + f"_append({''.join(text for _, text in run)!r})")
+        run.clear()
+
+    position = 0
+    for match in _tag_pattern(syntax).finditer(source):
+        if match.start() > position:
+            run.append(('text', source[position:match.start()]))
+        position = match.end()
+
+        expression = match.group('expression')
+        if expression is not None:
+            run.append(('expression', f'({expression.strip()})'))
+            continue
+
+        flush()
+        statement = (match.group('line') if match.group('line') is not None
+                     else match.group('statement')).strip()
+        keyword = statement.split(None, 1)[0] if statement else ''
+        if keyword in ('for', 'if'):
+            lines.append('    ' * depth + f'{statement}:')
+            blocks.append(keyword)
+            depth += 1
+        elif keyword in ('elif', 'else'):
+            if not blocks or blocks[-1] != 'if':
+                raise TemplateSyntaxError(f"{name}: '{keyword}' outside an if block")
+            lines.append('    ' * (depth - 1) + f'{statement}:')
+        elif keyword in ('endfor', 'endif'):
+            if not blocks or blocks[-1] != keyword[3:]:
+                raise TemplateSyntaxError(f"{name}: unexpected '{keyword}'")
+            blocks.pop()
+            depth -= 1
+        else:
+            raise TemplateSyntaxError(f"{name}: unknown statement '{statement}'")
+        # Blocks may be empty, so every block gets a no-op body
+        if keyword not in ('endfor', 'endif'):
+            lines.append('    ' * depth + 'pass')
+
+    if position < len(source):
+        run.append(('text', source[position:]))
+    flush()
+    if blocks:
+        raise TemplateSyntaxError(f"{name}: unclosed '{blocks[-1]}' block")
+    lines.append("    return ''.join(_parts)")
+    return '\n'.join(lines) + '\n'
+
+
+class TemplateLoader:
+    """
+    Loads section templates and compiles each into a render function once.
+
+    Compiled code objects are cached on disk under a hash of the template
+    source, this module's source and the Python bytecode version, so later
+    processes load the bytecode directly. If the cache cannot be written
+    (e.g. a read-only checkout), templates are compiled in memory only.
+    Writing a template's code removes the versions compiled from its
+    earlier sources, so the cache holds one entry per template. Compiled
+    functions are also kept in memory until clear() is called.
+    """
+
+    def __init__(self, syntax, template_dir=None, cache_dir=None):
+        """
+        Initialize the template loader.
+
+        Parameters
+        ----------
+        syntax : str
+            The tag syntax, a key of SYNTAXES.
+        template_dir : str or Path, optional
+            Directory of templates. Default is 'templates/<syntax>'.
+        cache_dir : str or Path, optional
+            Directory for compiled templates. Default is 'output/.template-cache'
+            in the project root.
+        """
+        self.syntax = syntax
+        self.suffix = SYNTAXES[syntax]['suffix']
+        self.template_dir = Path(template_dir) if template_dir else TEMPLATE_ROOT / syntax
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self._compiled = {}
+        self._version = None
+
+    def path(self, name):
+        """
+        Get the file a template is read from.
+
+        Parameters
+        ----------
+        name : str
+            The template name, e.g. 'experience'.
+
+        Returns
+        -------
+        Path
+            The template file.
+        """
+        return self.template_dir / f'{name}{self.suffix}'
+
+    def get(self, name):
+        """
+        Get the compiled render function for a template.
+
+        Parameters
+        ----------
+        name : str
+            The template name, e.g. 'experience'.
+
+        Returns
+        -------
+        callable
+            render(self, cv, e, links) returning the rendered text.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the template does not exist.
+        TemplateSyntaxError
+            If the template is malformed.
+        """
+        render = self._compiled.get(name)
+        if render is None:
+            source = self.path(name).read_text(encoding='utf-8')
+            namespace = {}
+            exec(self._load_code(name, source), namespace)
+            render = self._compiled[name] = namespace['render']
+        return render
+
+    def clear(self):
+        """
+        Forget compiled templates, so edited templates are read again.
+
+        Returns
+        -------
+        None
+        """
+        self._compiled.clear()
+        self._version = None
+
+    def _load_code(self, name, source):
+        """Get a template's module code object, from the disk cache if possible."""
+        digest = hashlib.sha256()
+        digest.update(importlib.util.MAGIC_NUMBER)
+        digest.update(_engine_source_hash().encode('utf-8'))
+        digest.update(self.syntax.encode('utf-8') + b'\0')
+        digest.update(source.encode('utf-8'))
+        cache_path = self.cache_dir / f'{self.syntax}-{name}-{digest.hexdigest()[:16]}.bin'
+        try:
+            return marshal.loads(cache_path.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        python_source = compile_source(source, self.syntax, f'{self.syntax}/{name}')
+        code = compile(python_source, str(self.path(name)), 'exec')
+        try:
+            atomic_write_bytes(cache_path, marshal.dumps(code))
+            self._remove_stale(name, cache_path)
+        except OSError:
+            # The cache only saves compiling again in later processes
+            pass
+        return code
+
+    def _remove_stale(self, name, current):
+        """Remove a template's cached code other than the current version."""
+        pattern = re.compile(rf'{re.escape(self.syntax)}-{re.escape(name)}-[0-9a-f]{{16}}\.bin')
+        for path in self.cache_dir.glob(f'{self.syntax}-{name}-*.bin'):
+            if path != current and pattern.fullmatch(path.name):
+                path.unlink(missing_ok=True)
+
+    def version(self):
+        """
+        Hash every template in the directory.
+
+        Included in cache keys of rendered output, so editing a template
+        invalidates what it rendered.
+
+        Returns
+        -------
+        str
+            Hex digest of the template names and contents.
+        """
+        if self._version is None:
+            digest = hashlib.sha256()
+            for path in sorted(self.template_dir.glob(f'*{self.suffix}')):
+                digest.update(path.name.encode('utf-8') + b'\0')
+                digest.update(path.read_bytes())
+            self._version = digest.hexdigest()
+        return self._version
+
+
+@lru_cache(maxsize=None)
+def _engine_source_hash():
+    """Hash this module's source, so compiled templates are invalidated when it changes."""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def template_loader(syntax):
+    """
+    Get the shared loader for a template syntax.
+
+    Parameters
+    ----------
+    syntax : str
+        The tag syntax, a key of SYNTAXES.
+
+    Returns
+    -------
+    TemplateLoader
+        The loader for 'templates/<syntax>'.
+    """
+    return TemplateLoader(syntax)
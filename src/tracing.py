@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tracing - records timed spans of a build as Chrome trace events.
+"""
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+
+class Tracer:
+    """
+    Records how long each step of a build takes and how much memory it allocates.
+
+    Steps are wrapped in span() blocks, which may nest. Each span records its
+    wall time and, if memory tracing is on, the change in memory allocated
+    by Python (from tracemalloc) between its start and end. The spans are
+    exported in the Chrome trace-event format, which chrome://tracing and
+    https://ui.perfetto.dev open directly.
+    """
+
+    def __init__(self, memory=True):
+        """
+        Initialize the tracer.
+
+        Parameters
+        ----------
+        memory : bool, optional
+            If True, record memory allocation deltas with tracemalloc. This
+            slows Python code down noticeably. Default is True.
+        """
+        self.memory = memory
+        self.events = []
+        self.pid = os.getpid()
+        self._origin = time.perf_counter()
+        self._started_tracemalloc = False
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def _timestamp(self):
+        """Microseconds since the tracer was created."""
+        return (time.perf_counter() - self._origin) * 1e6
+
+    @contextmanager
+    def span(self, name, category='cv', **args):
+        """
+        Record a span around a block of code.
+
+        Parameters
+        ----------
+        name : str
+            Name shown for the span, e.g. 'section:experience'.
+        category : str, optional
+            Trace category, for filtering in the viewer. Default is 'cv'.
+        **args
+            Extra values shown with the span.
+
+        Yields
+        ------
+        dict
+            The span's args, which the block may add to.
+        """
+        memory_before = tracemalloc.get_traced_memory()[0] if self.memory else 0
+        start = self._timestamp()
+        try:
+            yield args
+        finally:
+            end = self._timestamp()
+            event = {
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': start,
+                'dur': end - start,
+                'pid': self.pid,
+                'tid': threading.get_ident(),
+                'args': args,
+            }
+            if self.memory:
+                memory_after = tracemalloc.get_traced_memory()[0]
+                args['alloc_delta_bytes'] = memory_after - memory_before
+                self.events.append({
+                    'name': 'python memory',
+                    'ph': 'C',
+                    'ts': end,
+                    'pid': self.pid,
+                    'args': {'allocated_bytes': memory_after},
+                })
+            self.events.append(event)
+
+    def summary_lines(self):
+        """
+        Describe the recorded spans, totalled by name, slowest first.
+
+        Returns
+        -------
+        list of str
+            One line per span name with its call count, total duration and
+            total allocation delta.
+        """
+        totals = {}
+        for event in self.events:
+            if event['ph'] != 'X':
+                continue
+            count, duration, allocated = totals.get(event['name'], (0, 0.0, 0))
+            totals[event['name']] = (
+                count + 1,
+                duration + event['dur'],
+                allocated + event['args'].get('alloc_delta_bytes', 0),
+            )
+        lines = []
+        for name, (count, duration, allocated) in sorted(
+                totals.items(), key=lambda item: item[1][1], reverse=True):
+            line = f"  {name:<32}{count:>4}x{duration / 1e3:>10.2f}ms"
+            if self.memory:
+                line += f"{allocated / 1024:>+12.1f}KiB"
+            lines.append(line)
+        return lines
+
+    def export(self, path):
+        """
+        Write the recorded spans as a Chrome trace-event JSON file.
+
+        Parameters
+        ----------
+        path : str or Path
+            The file to write.
+
+        Returns
+        -------
+        None
+        """
+        trace = {'traceEvents': self.events, 'displayTimeUnit': 'ms'}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(trace, f)
+
+    def close(self):
+        """
+        Stop memory tracing if this tracer started it.
+
+        Returns
+        -------
+        None
+        """
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+
+class NullTracer:
+    """
+    Tracer that records nothing, used when tracing is switched off.
+    """
+
+    def span(self, name, category='cv', **args):
+        """Return a context manager that does nothing."""
+        return nullcontext(args)
+
+
+# Shared tracer for generators created without one
+NULL_TRACER = NullTracer()
+
+
+def write_trace(tracer, path):
+    """
+    Export a trace, print a summary of its spans and stop tracing.
+
+    Parameters
+    ----------
+    tracer : Tracer
+        The tracer to export.
+    path : str or Path
+        The trace file to write.
+
+    Returns
+    -------
+    None
+    """
+    tracer.close()
+    tracer.export(path)
+    print("Trace summary (slowest first):")
+    for line in tracer.summary_lines():
+        print(line)
+    print(f"✓ Trace written to {path} (open in chrome://tracing or ui.perfetto.dev)")
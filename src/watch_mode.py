@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Watch Mode - rebuilds CV outputs when their inputs change.
+"""
+import importlib
+import sys
+import time
+from pathlib import Path
+
+import abstract_cv_generator
+import cv_builder
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = PROJECT_ROOT / 'src'
+TEMPLATE_DIR = PROJECT_ROOT / 'templates'
+CSS_PATH = PROJECT_ROOT / 'css' / 'static-style.css'
+
+# Generator modules and the formats they affect. Modules not listed are
+# shared by every format.
+MODULE_FORMATS = {
+    'pdf_cv_generator': {'pdf'},
+    'page_fit': {'pdf'},
+    'pdf_writer': {'pdf-direct'},
+    'direct_pdf_cv_generator': {'pdf-direct'},
+    'html_cv_generator': {'html'},
+}
+
+# Template directories and the formats they affect
+TEMPLATE_FORMATS = {
+    'latex': 'pdf',
+    'html': 'html',
+    'direct': 'pdf-direct',
+}
+
+# Source modules in dependency order: reloading one means reloading every
+# module after it, so that they pick up the new definitions
+RELOAD_ORDER = [
+    'output_builder',
+    'escaping',
+    'atomic_io',
+    'output_store',
+    'pdf_writer',
+    'inline_markup',
+    'template_engine',
+    'minify',
+    'image_pipeline',
+    'icon_font',
+    'cv_model',
+    'build_cache',
+    'latex_format',
+    'latex_compile_service',
+    'page_fit',
+    'fragment_cache',
+    'tracing',
+    'abstract_cv_generator',
+    'pdf_cv_generator',
+    'direct_pdf_cv_generator',
+    'html_cv_generator',
+    'cv_builder',
+]
+
+# Modules the parsed CV data depends on: the model classes, everything
+# reloaded with them, and the loader. The data is loaded again when one of
+# them changes, so it is an instance of the new classes.
+DATA_MODULES = set(RELOAD_ORDER[:RELOAD_ORDER.index('cv_model') + 1]) | {'abstract_cv_generator'}
+
+
+def snapshot(paths):
+    """
+    Record the modification time of each watched file.
+
+    Parameters
+    ----------
+    paths : iterable of Path
+        The files to check.
+
+    Returns
+    -------
+    dict
+        Mapping of path to mtime, or None for files that do not exist.
+    """
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtimes[path] = None
+    return mtimes
+
+
+def wait_for_changes(paths, interval=0.2, debounce=0.5):
+    """
+    Block until watched files change, then until they settle.
+
+    A burst of saves (e.g. an editor writing several files) is reported as
+    one change set once no file has changed for the debounce period.
+
+    Parameters
+    ----------
+    paths : callable
+        Returns the files to watch; called on every poll so new files are seen.
+    interval : float, optional
+        Seconds between polls. Default is 0.2.
+    debounce : float, optional
+        Seconds without further changes before returning. Default is 0.5.
+
+    Returns
+    -------
+    set of Path
+        The files that changed.
+    """
+    previous = snapshot(paths())
+    changed = set()
+    last_change = None
+    while True:
+        time.sleep(interval)
+        current = snapshot(paths())
+        modified = {
+            path for path in previous.keys() | current.keys()
+            if previous.get(path) != current.get(path)
+        }
+        previous = current
+        if modified:
+            changed |= modified
+            last_change = time.monotonic()
+        elif changed and time.monotonic() - last_change >= debounce:
+            return changed
+
+
+def reload_modules(changed_modules):
+    """
+    Reload changed source modules and every module that depends on them.
+
+    Parameters
+    ----------
+    changed_modules : set of str
+        Names of the modules whose source changed.
+
+    Returns
+    -------
+    None
+    """
+    positions = [RELOAD_ORDER.index(name) for name in changed_modules if name in RELOAD_ORDER]
+    if not positions:
+        return
+    for name in RELOAD_ORDER[min(positions):]:
+        if name in sys.modules:
+            importlib.reload(sys.modules[name])
+    print(f"Reloaded {', '.join(sorted(changed_modules))}")
+
+
+def affected_formats(changed, data_path):
+    """
+    Work out which output formats a set of changed files affects.
+
+    Parameters
+    ----------
+    changed : set of Path
+        The files that changed.
+    data_path : Path
+        The CV data file.
+
+    Returns
+    -------
+    set of str
+        Formats that need rebuilding.
+    """
+    all_formats = set(cv_builder.GENERATORS)
+    formats = set()
+    for path in changed:
+        if path == data_path:
+            formats |= all_formats
+        elif path == CSS_PATH:
+            formats.add('html')
+        elif path.parent.parent == TEMPLATE_DIR and path.parent.name in TEMPLATE_FORMATS:
+            formats.add(TEMPLATE_FORMATS[path.parent.name])
+        elif path.suffix == '.py':
+            formats |= MODULE_FORMATS.get(path.stem, all_formats)
+    return formats
+
+
+def watch(data_path=None, formats=('pdf', 'html'), variants=('full',), debounce=0.5,
+          **build_options):
+    """
+    Build the CV, then rebuild the affected outputs whenever inputs change.
+
+    Watches the data file, the generator sources in src/, the section
+    templates in templates/ and the HTML stylesheet. The parsed data and loaded modules stay in memory between
+    rebuilds; only what changed is re-read or reloaded, and the data is
+    re-read when the modules it depends on are reloaded. Runs until
+    interrupted.
+
+    Parameters
+    ----------
+    data_path : str or Path, optional
+        Path to the CV data JSON file. Default is 'data/cv-data.json'.
+    formats : sequence of str, optional
+        Output formats to build. Default is ('pdf', 'html').
+    variants : sequence of str, optional
+        Variants to build. Default is ('full',).
+    debounce : float, optional
+        Seconds to wait for a burst of saves to finish. Default is 0.5.
+    **build_options
+        Further keyword arguments for cv_builder.build.
+
+    Returns
+    -------
+    None
+    """
+    data_path = Path(data_path or abstract_cv_generator.DEFAULT_DATA_PATH).resolve()
+    watched = lambda: ([data_path, CSS_PATH] + sorted(SRC_DIR.glob('*.py'))
+                       + sorted(TEMPLATE_DIR.glob('*/*.*')))
+
+    print("Loading CV data...")
+    cv_data = abstract_cv_generator.load_cv_data(data_path)
+    rebuild(cv_data, formats, variants, build_options)
+
+    while True:
+        print(f"Watching {data_path.name}, src/, templates/ and {CSS_PATH.name} "
+              "for changes (Ctrl+C to stop)...")
+        changed = wait_for_changes(watched, debounce=debounce)
+        print(f"Changed: {', '.join(sorted(path.name for path in changed))}")
+
+        changed_modules = {path.stem for path in changed if path.suffix == '.py'}
+        if changed_modules:
+            try:
+                reload_modules(changed_modules)
+            except Exception as e:
+                print(f"Error reloading modules: {e}")
+                continue
+
+        # Edited templates are recompiled on next use
+        for syntax in {path.parent.name for path in changed if path.parent.parent == TEMPLATE_DIR}:
+            sys.modules['template_engine'].template_loader(syntax).clear()
+
+        if data_path in changed or changed_modules & DATA_MODULES:
+            try:
+                cv_data = sys.modules['abstract_cv_generator'].load_cv_data(data_path)
+            except Exception as e:
+                print(f"Error loading CV data, keeping previous data: {e}")
+                continue
+
+        targets = [fmt for fmt in formats if fmt in affected_formats(changed, data_path)]
+        if targets:
+            rebuild(cv_data, targets, variants, build_options)
+
+
+def rebuild(cv_data, formats, variants, build_options):
+    """
+    Build outputs, reporting failures instead of stopping the watch.
+
+    Parameters
+    ----------
+    cv_data : CvData
+        Parsed CV data.
+    formats : sequence of str
+        Output formats to build.
+    variants : sequence of str
+        Variants to build.
+    build_options : dict
+        Further keyword arguments for cv_builder.build.
+
+    Returns
+    -------
+    None
+    """
+    start = time.perf_counter()
+    try:
+        sys.modules['cv_builder'].build(cv_data, formats, variants, **build_options)
+    except (Exception, SystemExit) as e:
+        print(f"Build failed: {e}")
+        return
+    print(f"Rebuilt {', '.join(formats)} in {time.perf_counter() - start:.2f}s")